@@ -0,0 +1,623 @@
+import random
+import numpy as np
+
+from config import NUM_TIMESTEPS, MACHINE_CAPACITY, PENALTY, OUTSOURCE_FRACTION, CLAIM_PROCESSING_COST, \
+    CLAIM_PROB_PER_MODEL
+from data_generation import generate_orders, generate_orders_fast, model_info, initial_orders_data, \
+    MODEL_PROCESSING_TIME, MODEL_REVENUE
+from claim_engine import CLAIM_PROB_UP, CLAIM_PROB_DOWN
+from reward import baseline_average_revenue
+from thompson_sampling import ACTIONS
+
+# ACTIONS 인덱스 (thompson_sampling.ACTIONS 순서와 동일)
+ACCEPT, REJECT, POSTPONE, OUTSOURCE = (ACTIONS.index(a) for a in ["Accept", "Reject", "Postpone", "Outsource"])
+
+# 결정 마감 이후 선택 가능한 액션 ["Accept", "Reject", "Outsource"]
+OVERDUE_ACTIONS = np.array([ACCEPT, REJECT, OUTSOURCE])
+
+# 주문별 code = (결정 시점 << ACTION_BITS) | 액션 (나눗셈 대신 shift / mask로 시점과 액션을 꺼냄)
+ACTION_BITS = (len(ACTIONS) - 1).bit_length()
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+MODEL_NAMES = list(model_info.keys())
+
+# simulate_batch가 한 번에 처리하는 최대 replication 수 (replication별 상태 배열이 CPU cache에 들어가는 크기)
+CHUNK_REPLICATIONS = 16384
+
+
+def generate_order_books(num_replications, seed=42, generator="legacy", num_timesteps=NUM_TIMESTEPS):
+    """
+    replication마다 seed + k로 주문 목록을 생성합니다.
+    generator: "legacy" = random.seed 후 generate_orders(), "numpy" = generate_orders_fast(seed=seed + k)
+    """
+    if generator not in ["legacy", "numpy"]:
+        raise ValueError("Unknown order generator: " + generator)
+    books = []
+    for k in range(num_replications):
+        if generator == "numpy":
+            books.append(generate_orders_fast(seed=seed + k, num_timesteps=num_timesteps))
+        else:
+            random.seed(seed + k)
+            books.append(generate_orders())
+    return books
+
+
+def _empty_order_arrays(num_reps, width, num_timesteps, int_dtype=np.int64, float_dtype=np.float64):
+    """
+    도착하지 않는 dummy 주문(valid=False, 결정 마감 0)으로 채운 (replication x order) 배열 dict
+    """
+    shape = (num_reps, width)
+    return {
+        "order_date": np.full(shape, num_timesteps + 1, dtype=int_dtype),
+        "decision_due_date": np.zeros(shape, dtype=int_dtype),
+        "model": np.zeros(shape, dtype=int_dtype),
+        "processing_time": np.ones(shape, dtype=int_dtype),
+        "due_date": np.zeros(shape, dtype=int_dtype),
+        "revenue": np.zeros(shape, dtype=float_dtype),
+        "valid": np.zeros(shape, dtype=bool),
+    }
+
+
+def orders_to_arrays(order_books, num_timesteps=NUM_TIMESTEPS):
+    """
+    K개의 주문 목록(generate_orders 형식의 row 리스트)을 (replication x order) 배열로 변환합니다.
+    주문 수가 다른 replication은 도착하지 않는 dummy 주문(valid=False)으로 채우며,
+    마지막 열은 항상 dummy 주문입니다. (simulate_batch에서 끝난 replication이 처리)
+    """
+    num_reps = len(order_books)
+    width = max((len(book) for book in order_books), default=0) + 1
+    model_ids = {name: i for i, name in enumerate(MODEL_NAMES)}
+
+    arrays = _empty_order_arrays(num_reps, width, num_timesteps)
+    for k, book in enumerate(order_books):
+        n = len(book)
+        if n == 0:
+            continue
+        arrays["order_date"][k, :n] = [row[1] for row in book]
+        arrays["decision_due_date"][k, :n] = [row[2] for row in book]
+        arrays["model"][k, :n] = [model_ids.setdefault(row[3], len(model_ids)) for row in book]
+        arrays["processing_time"][k, :n] = [row[4] for row in book]
+        arrays["due_date"][k, :n] = [row[5] for row in book]
+        arrays["revenue"][k, :n] = [row[6] for row in book]
+        arrays["valid"][k, :n] = True
+    arrays["model_names"] = sorted(model_ids, key=model_ids.get)
+    return arrays
+
+
+def generate_order_arrays(num_replications, seed=42, num_timesteps=NUM_TIMESTEPS, arrival_prob=0.2, max_batch=5):
+    """
+    K개 replication의 주문을 numpy Generator 하나로 한 번에 생성해 orders_to_arrays()와 같은 dict로 반환합니다.
+    분포는 generate_orders()와 같습니다. (initial 주문 + timestep마다 arrival_prob 확률로 1~max_batch개 도착,
+    모델 균등 선택, decision_due_date = t + U{3..10}, due_date = t + p_time + U{2..15}, 같은 날짜는 initial 주문이 먼저)
+    replication별 Python 루프가 없어 generate_order_books()보다 훨씬 빠르지만 주문 자체는 다릅니다.
+    메모리를 줄이기 위해 정수 필드는 int32, revenue는 float32로 만듭니다.
+    """
+    rng = np.random.default_rng(seed)
+    num_reps = num_replications
+    horizon = num_timesteps + 1
+    cells = horizon * num_reps
+    initial = sorted(initial_orders_data, key=lambda row: row[1])
+    initial_dates = np.array([row[1] for row in initial], dtype=np.int64)
+
+    # 주문이 도착하는 (replication x timestep) cell: Bernoulli(arrival_prob) 성공 위치를 기하분포 간격으로 뽑음
+    gaps = [rng.geometric(arrival_prob, size=int(cells * arrival_prob + 6 * np.sqrt(cells) + 16))]
+    while gaps[-1].size and sum(g.sum() for g in gaps) < cells:
+        gaps.append(rng.geometric(arrival_prob, size=int(cells * arrival_prob // 4 + 16)))
+    arrive = np.cumsum(np.concatenate(gaps)) - 1
+    arrive = arrive[:np.searchsorted(arrive, cells)]
+    batch = rng.integers(1, max_batch + 1, size=arrive.size)
+    arrive_rep, arrive_t = np.divmod(arrive, horizon)
+
+    # 생성 주문은 (replication, 도착 시점) 순서로 이어 붙인 목록으로 만들고, replication 안의 위치 =
+    # 같은 replication의 앞선 생성 주문 수 + 같은 날짜까지의 initial 주문 수 (마지막 열은 항상 dummy 주문)
+    generated = np.bincount(arrive_rep, weights=batch, minlength=num_reps).astype(np.int64)
+    first = np.cumsum(generated) - generated
+    width = int(generated.max(initial=0)) + len(initial) + 1
+    initial_upto = np.searchsorted(initial_dates, np.arange(horizon), side="right")
+    n = int(generated.sum())
+    pos = np.repeat(arrive_rep * width - first.take(arrive_rep) + initial_upto.take(arrive_t), batch) + np.arange(n)
+    t = np.repeat(arrive_t.astype(np.int32), batch)
+
+    arrays = _empty_order_arrays(num_reps, width, num_timesteps, int_dtype=np.int32, float_dtype=np.float32)
+    flat = {key: values.reshape(-1) for key, values in arrays.items()}
+    model = rng.integers(0, len(MODEL_NAMES), size=n, dtype=np.int32)
+    processing_time = MODEL_PROCESSING_TIME.astype(np.int32).take(model)
+    flat["order_date"][pos] = t
+    flat["decision_due_date"][pos] = t + rng.integers(3, 11, size=n, dtype=np.int32)
+    flat["model"][pos] = model
+    flat["processing_time"][pos] = processing_time
+    flat["due_date"][pos] = t + processing_time + rng.integers(2, 16, size=n, dtype=np.int32)
+    flat["revenue"][pos] = MODEL_REVENUE.astype(np.float32).take(model)
+    np.less(np.arange(width), (generated + len(initial))[:, None], out=arrays["valid"])
+
+    # initial 주문 위치 = initial 순서 + 그 날짜 전에 도착한 생성 주문 수
+    generated_before = np.concatenate([[0], np.cumsum(batch)])
+    rep = np.arange(num_reps)
+    model_ids = {name: i for i, name in enumerate(MODEL_NAMES)}
+    for i, row in enumerate(initial):
+        before = generated_before.take(np.searchsorted(arrive, rep * horizon + min(row[1], horizon))) - first
+        at = rep * width + i + before
+        for key, value in zip(["order_date", "decision_due_date", "model", "processing_time", "due_date", "revenue"],
+                              [row[1], row[2], model_ids[row[3]], row[4], row[5], row[6]]):
+            flat[key][at] = value
+    arrays["model_names"] = list(MODEL_NAMES)
+    return arrays
+
+
+def _grow_ring(ring, head, tail):
+    """
+    대기 ring buffer의 크기를 두 배로 늘립니다. (replication별 [head, tail) 구간의 순서 유지)
+    """
+    num_reps, size = ring.shape
+    grown = np.zeros((num_reps, 2 * size), dtype=ring.dtype)
+    rows = np.arange(num_reps)
+    for q in range(size):
+        pos = head + q
+        keep = pos < tail
+        grown[rows[keep], pos[keep] & (2 * size - 1)] = ring[rows[keep], pos[keep] & (size - 1)]
+    return grown
+
+
+def _uniform_float32(rng, shape):
+    """
+    [0, 1) 범위의 float32 균등 난수 (23bit 정밀도).
+    bit generator의 64bit 출력 하나를 float32 두 개의 가수부로 나눠 쓰므로 Generator.random보다 빠릅니다.
+    """
+    size = int(np.prod(shape))
+    bits = rng.bit_generator.random_raw((size + 1) // 2).view(np.uint32)[:size]
+    bits >>= 9
+    bits |= np.uint32(0x3F800000)                       # [1, 2) 범위 float32의 bit 표현
+    u = bits.view(np.float32)
+    u -= 1
+    return u.reshape(shape)
+
+
+def _standard_normal(rng, shape):
+    """
+    float32 표준정규 난수 (Box-Muller 변환). 같은 개수의 Generator.standard_normal보다 빠릅니다.
+    shape의 첫 축은 짝수여야 합니다.
+    """
+    half = (2, shape[0] // 2) + tuple(shape[1:])
+    u = _uniform_float32(rng, half)
+    radius = np.sqrt(np.log1p(-u[0]) * np.float32(-2))
+    angle = u[1] * np.float32(2 * np.pi)
+    z = np.empty(half, dtype=np.float32)
+    np.cos(angle, out=z[0])
+    np.sin(angle, out=z[1])
+    z *= radius
+    return z.reshape(shape)
+
+
+def _argmax_rows(values):
+    """
+    (A x n) 배열의 열별 argmax (같은 값이면 앞 index, np.argmax(values, axis=0)와 동일)
+    앞 행부터의 누적 최댓값 중 전체 최댓값보다 작은 것의 개수 = 처음으로 최댓값이 나오는 행이므로
+    행 단위 np.maximum / 비교만으로 계산합니다. (축 길이가 작은 np.argmax나 무작위 mask의 np.where보다 훨씬 빠름)
+    """
+    index = np.zeros(values.shape[1], dtype=np.int64)
+    if values.shape[0] == 1:
+        return index
+    prefix = np.empty_like(values[:-1])
+    prefix[0] = values[0]
+    for k in range(1, len(prefix)):
+        np.maximum(prefix[k - 1], values[k], out=prefix[k])
+    best = np.maximum(prefix[-1], values[-1])
+    for row in prefix:
+        index += row < best
+    return index
+
+
+def _empty_codes(size, num_timesteps):
+    """
+    주문별 마지막으로 처리된 ((시점 << ACTION_BITS) | 액션) code 배열.
+    미처리 주문은 Postpone된 주문과 같은 취급이므로 시점 -1의 Postpone code로 초기화합니다.
+    """
+    dtype = np.int16 if (num_timesteps + 2) << ACTION_BITS < np.iinfo(np.int16).max else np.int64
+    return np.full(size, (-1 << ACTION_BITS) | POSTPONE, dtype=dtype)
+
+
+def _random_decisions(rng, start, limit):
+    """
+    random 정책에서 start 시점부터 처음으로 Postpone이 아닌 액션이 나오는 시점과 그 액션.
+    결정 마감(limit) 전에는 매 시점 1/액션 수 확률로 Postpone하고 마감 시점에는 Postpone 없이 고르므로
+    결정 시점 = min(start + Postpone 횟수(기하분포), limit), 액션은 어느 쪽이든 Accept/Reject/Outsource 균등입니다.
+    """
+    u = rng.random(start.size) * len(OVERDUE_ACTIONS)
+    pick = u.astype(np.int64)
+    postpones = np.floor(np.log1p(pick - u) / np.log(1 / len(ACTIONS)))
+    return np.minimum(start + postpones, limit).astype(np.int64), OVERDUE_ACTIONS.take(pick)
+
+
+def _random_policy_codes(arrays, rng, num_timesteps):
+    """
+    random 정책의 주문별 code ((replication x order) flat index).
+    random 정책의 액션은 다른 주문과 무관하므로 주문마다 첫 결정 시점 / 액션을 한 번에 뽑고,
+    머신 용량에 걸리는 Accept 시도만 timestep 순서대로 처리합니다.
+    (timestep 안의 대기 주문은 simulate()처럼 주문 순서대로 처리되므로 같은 replication의 Accept 시도 중
+    남은 머신 수만큼 앞에서부터 수락하고, 나머지는 마감 이후면 Reject, 아니면 Postpone 후 다음 시점부터 다시 뽑음)
+    """
+    num_reps, width = arrays["order_date"].shape
+    order_date = arrays["order_date"].reshape(-1)
+    decision_due_date = arrays["decision_due_date"].reshape(-1)
+    duration = np.maximum(arrays["processing_time"].reshape(-1), 1)
+    code = _empty_codes(num_reps * width, num_timesteps)
+
+    # 도착하는 주문의 첫 결정 (Reject / Outsource는 바로 확정, Accept는 시도 시점 순서로 모음)
+    orders = np.flatnonzero(order_date <= num_timesteps)
+    arrival = order_date.take(orders).astype(np.int64)
+    at, action = _random_decisions(rng, arrival, np.maximum(arrival, decision_due_date.take(orders)))
+    decided = at <= num_timesteps
+    final = np.flatnonzero(decided & (action != ACCEPT))
+    code[orders.take(final)] = (at.take(final) << ACTION_BITS) | action.take(final)
+    attempt = np.flatnonzero(decided & (action == ACCEPT))
+    attempt = attempt.take(np.argsort(at.take(attempt), kind="stable"))
+    attempt_orders = orders.take(attempt)
+    bounds = np.searchsorted(at.take(attempt), np.arange(num_timesteps + 2)).tolist()
+
+    busy = np.zeros(num_reps, dtype=np.int64)                       # replication별 가동 중 머신 수
+    release = np.zeros((num_timesteps + 1) * num_reps, dtype=np.int64)
+    retry_orders = retry_at = np.zeros(0, dtype=np.int64)           # Postpone 후 다시 Accept를 시도할 주문
+    for t in range(num_timesteps + 1):
+        busy -= release[t * num_reps:(t + 1) * num_reps]
+        ids = attempt_orders[bounds[t]:bounds[t + 1]]
+        if retry_orders.size:
+            now = retry_at == t
+            if now.any():
+                ids = np.sort(np.concatenate([ids, retry_orders[now]]))
+                retry_orders, retry_at = retry_orders[~now], retry_at[~now]
+        if ids.size == 0:
+            continue
+
+        # 같은 replication의 시도는 주문 순서대로 남은 머신 수만큼 수락 (ids는 replication, 주문 순서로 정렬됨)
+        rep = ids // width
+        index = np.arange(ids.size)
+        first = np.maximum.accumulate(np.where(np.concatenate([[True], rep[1:] != rep[:-1]]), index, 0))
+        accepted = index - first < MACHINE_CAPACITY - busy.take(rep)
+        done, done_rep = ids[accepted], rep[accepted]
+        code[done] = (t << ACTION_BITS) | ACCEPT
+        np.add.at(busy, done_rep, 1)
+        finish = t + duration.take(done)
+        keep = finish <= num_timesteps
+        np.add.at(release, finish[keep] * num_reps + done_rep[keep], 1)
+
+        failed = ids[~accepted]
+        if failed.size:
+            due = decision_due_date.take(failed)
+            code[failed[t >= due]] = (t << ACTION_BITS) | REJECT
+            waiting = t < due
+            failed = failed[waiting]
+            at, action = _random_decisions(rng, np.full(failed.size, t + 1), np.maximum(t + 1, due[waiting]))
+            decided = at <= num_timesteps
+            final = decided & (action != ACCEPT)
+            code[failed[final]] = (at[final] << ACTION_BITS) | action[final]
+            again = decided & (action == ACCEPT)
+            retry_orders = np.concatenate([retry_orders, failed[again]])
+            retry_at = np.concatenate([retry_at, at[again]])
+    return code
+
+
+def _contextual_policy_codes(arrays, rng, num_timesteps):
+    """
+    contextual(Thompson sampling) 정책의 주문별 code ((replication x order) flat index).
+    액션 선택이 replication별 학습 상태에 따라 달라지므로 모든 replication이 한 iteration에 각자의 다음 결정
+    1건을 동시에 처리합니다. (replication마다 자기 timestep / 대기열을 따로 진행하므로 대기 주문 수가 달라도
+    iteration마다 같은 크기의 연속 배열만 다룹니다. 시뮬레이션이 끝난 replication은 주기적으로 제외)
+      - 대기열: 이전 timestep에서 Postpone된 주문 ring buffer(FIFO) 뒤에 이번 timestep 도착 주문이 이어짐
+                → simulate()처럼 timestep 안에서 주문 순서대로 처리
+      - 머신 점유: replication별 가공 종료 시점 MACHINE_CAPACITY개를 오름차순으로 유지 (ends[0] > t면 모두 가동 중)
+    """
+    num_reps, width = arrays["order_date"].shape
+    num_actions = len(ACTIONS)
+    order_date = arrays["order_date"].reshape(-1).astype(np.int64)
+    revenue = arrays["revenue"]
+    # 결정에 필요한 주문 정보를 한 번의 take로 읽도록 (decision_due_date, 처리시간, due_date, revenue)로 묶음
+    # (revenue가 int32 범위의 정수면 모두 int32로 묶어 읽는 메모리를 줄임)
+    integral = np.array_equal(revenue, np.round(revenue)) and np.abs(revenue).max(initial=0) < 2 ** 31
+    info = np.empty((num_reps * width, 4), dtype=np.int32 if integral else np.float64)
+    info[:, 0] = arrays["decision_due_date"].reshape(-1)
+    np.maximum(arrays["processing_time"].reshape(-1), 1, out=info[:, 1])
+    info[:, 2] = arrays["due_date"].reshape(-1)
+    info[:, 3] = revenue.reshape(-1)
+    code = _empty_codes(num_reps * width, num_timesteps)
+
+    # (replication x timestep): t 시점에 도착하는 주문들의 최대 revenue (없으면 NaN)
+    # 주문은 replication마다 도착 순서이므로 (replication, 도착 시점)이 같은 구간별 최댓값
+    # (dummy 주문과 범위 밖 날짜는 읽지 않는 마지막 칸(num_timesteps + 2)으로 모음)
+    horizon = num_timesteps + 3
+    dates = arrays["order_date"]
+    cell = np.where(arrays["valid"] & (dates >= 0) & (dates <= num_timesteps + 1), dates, horizon - 1)
+    cell = (cell + np.arange(0, num_reps * horizon, horizon)[:, None]).reshape(-1)
+    max_arrival_revenue = np.full(num_reps * horizon, np.nan)
+    if cell.size:
+        starts = np.concatenate([[0], np.flatnonzero(cell[1:] != cell[:-1]) + 1])
+        max_arrival_revenue[cell.take(starts)] = np.maximum.reduceat(
+            revenue.reshape(-1).astype(np.int64) if integral else revenue.reshape(-1), starts)
+
+    # replication별 상태 (진행 중인 replication만 남기도록 주기적으로 압축)
+    # 주문 위치는 (replication x order) 배열의 flat index(replication * width + order)로 다룸
+    rep = np.arange(num_reps)
+    next_rep = rep * horizon + 1                       # max_arrival_revenue에서 t + 1 시점 위치 = t + next_rep
+    dummy = rep * width + width - 1                    # 끝난 replication이 처리하는 dummy 주문 (마지막 열)
+    t = np.full(num_reps, -1, dtype=np.int64)
+    arrival = rep * width                              # 다음 도착 주문
+    ring = np.zeros((num_reps, 8), dtype=np.int64)     # Postpone된 주문 (FIFO)
+    head = np.zeros(num_reps, dtype=np.int64)
+    tail = np.zeros(num_reps, dtype=np.int64)
+    ring_left = np.zeros(num_reps, dtype=np.int64)     # 이번 timestep에 처리할 ring 주문 수
+    ends = np.full((MACHINE_CAPACITY, num_reps), -1, dtype=np.int64)
+    # reward.py의 revenue 기록(평균 revenue 계산용)을 replication별 합계/개수로 유지
+    rev_sum = np.zeros(num_reps)
+    rev_cnt = np.zeros(num_reps)
+    last_reject = np.full(num_reps, np.nan)
+    # thompson_sampling.action_params 초기값과 동일 (액션 x replication)
+    ts_mean = np.zeros((num_actions, num_reps))
+    ts_var = np.full((num_actions, num_reps), 1000.0)
+    ts_std = np.sqrt(ts_var)
+    ts_count = np.ones((num_actions, num_reps))
+
+    n = num_reps
+    rows = np.arange(n)
+    ring_base = rows * ring.shape[1]
+    live = None                                        # None = 모든 replication 진행 중
+    # iteration마다 replication별로 다른 값을 고르는 부분은 (무작위 mask의 np.where가 느리므로)
+    # 0/1 정수 곱셈이나 해당 replication index에만 대입하는 방식으로 계산
+    while n:
+        # 이번 timestep에 처리할 주문이 없으면 다음 timestep으로 (대기열이 비었으면 다음 도착 시점으로 건너뜀)
+        next_date = order_date.take(arrival, mode="clip")
+        idle = (ring_left == 0) & (next_date > t)
+        if idle.any():
+            waiting = tail - head
+            step = next_date - t
+            step -= np.minimum(waiting, 1) * (step - 1)      # 대기열이 있으면 한 timestep만 진행
+            idle = idle.astype(np.int64)
+            t += idle * step
+            ring_left += idle * waiting
+            live = t <= num_timesteps
+            n_live = int(np.count_nonzero(live))
+            if n_live < 0.85 * n:
+                if n_live == 0:
+                    break
+                keep = np.flatnonzero(live)
+                (rep, next_rep, dummy, t, arrival, ring, head, tail, ring_left, rev_sum, rev_cnt,
+                 last_reject) = (x[keep] for x in (rep, next_rep, dummy, t, arrival, ring, head, tail, ring_left,
+                                                   rev_sum, rev_cnt, last_reject))
+                # (x[:, keep]는 C-contiguous가 아니어서 reshape(-1)이 복사본이 되므로 take로 연속 배열을 만듦)
+                ends, ts_mean, ts_var, ts_std, ts_count = (
+                    x.take(keep, axis=1) for x in (ends, ts_mean, ts_var, ts_std, ts_count))
+                n = n_live
+                rows = np.arange(n)
+                ring_base = rows * ring.shape[1]
+                live = None
+            elif n_live == n:
+                live = None
+
+        # 처리할 주문: ring에 이번 timestep 주문이 남아 있으면 ring 앞, 아니면 다음 도착 주문
+        # 끝난 replication은 dummy 주문(결정 마감 0 → 항상 마감 이후라 Postpone되지 않음)만 처리하므로
+        # 나머지 상태가 바뀌어도 결과에 영향이 없음
+        from_ring = np.minimum(ring_left, 1)
+        ring_mask = ring.shape[1] - 1
+        flat = ring.reshape(-1).take(ring_base + (head & ring_mask))
+        flat -= arrival
+        flat *= from_ring
+        flat += arrival
+        if live is not None:
+            flat -= dummy
+            flat *= live
+            flat += dummy
+        picked = info.take(flat, axis=0)
+        ddd_j, dur_j, due_j = picked[:, :3].T.astype(np.int64, order="C")
+        rev = picked[:, 3].astype(np.float64)
+        overdue = t >= ddd_j
+
+        # Thompson sampling 액션 선택 (결정 마감 이후 Postpone이 나오면 Accept/Reject/Outsource 중 균등 선택)
+        sample = ts_std * _standard_normal(rng, (num_actions, n))
+        sample += ts_mean
+        act = _argmax_rows(sample)
+        redraw = np.flatnonzero(overdue & (act == POSTPONE))
+        if redraw.size:
+            act[redraw] = OVERDUE_ACTIONS.take((rng.random(redraw.size) * len(OVERDUE_ACTIONS)).astype(np.int64))
+
+        # 머신 용량 초과시 Accept 대신 다른 액션 선택 (결정 마감 이후면 Reject, 아니면 Postpone)
+        full = np.flatnonzero((act == ACCEPT) & (ends[0] > t))
+        act[full] = POSTPONE + overdue.take(full) * (REJECT - POSTPONE)
+
+        # estimate_reward와 동일한 reward 계산 (claim은 아직 발생 전, revenue 기록이 없으면 baseline)
+        avg = rev_sum / np.maximum(rev_cnt, 1)
+        avg += (1 - np.minimum(rev_cnt, 1)) * baseline_average_revenue
+        rewards = np.empty((num_actions, n))
+        np.subtract(rev, avg, out=rewards[ACCEPT])
+        np.negative(rewards[ACCEPT], out=rewards[POSTPONE])
+        np.maximum(rewards[ACCEPT], 0, out=rewards[ACCEPT])
+        np.maximum(rewards[POSTPONE], 0, out=rewards[POSTPONE])
+        lateness = t + dur_j
+        lateness -= due_j
+        np.maximum(lateness, 0, out=lateness)
+        rewards[POSTPONE] -= PENALTY * lateness
+        rewards[REJECT] = 0                                # Reject reward는 Reject한 replication만 아래에서 계산
+        np.multiply(rev, OUTSOURCE_FRACTION, out=rewards[OUTSOURCE])
+        rewards[OUTSOURCE] -= avg
+        np.maximum(rewards[OUTSOURCE], 0, out=rewards[OUTSOURCE])
+        param = act * n
+        param += rows
+        reward = rewards.reshape(-1).take(param)
+        rejected = np.flatnonzero(act == REJECT)
+        gain = max_arrival_revenue.take(t.take(rejected) + next_rep.take(rejected), mode="clip")
+        gain -= last_reject.take(rejected)
+        reward[rejected] = np.fmax(gain, 0) + np.fmin(gain, 0)                             # NaN → 0
+
+        # update_action_params와 동일한 평균 / 분산 갱신
+        c = ts_count.reshape(-1).take(param)
+        c_next = c + 1
+        old_mean = ts_mean.reshape(-1).take(param)
+        diff = reward - old_mean
+        new_mean = diff / c_next
+        new_mean += old_mean
+        reward -= new_mean
+        reward *= diff
+        new_var = ts_var.reshape(-1).take(param)
+        new_var *= c
+        new_var += reward
+        new_var /= c_next
+        np.maximum(new_var, 1e-9, out=new_var)
+        ts_mean.reshape(-1)[param] = new_mean
+        ts_var.reshape(-1)[param] = new_var
+        ts_std.reshape(-1)[param] = np.sqrt(new_var, out=new_var)
+        ts_count.reshape(-1)[param] = c_next
+
+        postponed = act == POSTPONE
+        decided = ~postponed
+        rev *= decided
+        rev_sum += rev
+        rev_cnt += decided
+        last_reject[rejected] = rev.take(rejected)
+
+        # 주문의 최종 결정 및 스케줄링
+        # Accept는 가장 먼저 끝나는 머신(ends[0], 용량 검사로 t 이전에 끝남) 자리에 종료 시점을 넣고 정렬 유지
+        final = np.flatnonzero(decided)                    # Postpone된 주문의 code는 settle에서 쓰지 않음
+        code[flat.take(final)] = (t.take(final) << ACTION_BITS) | act.take(final)
+        t_end = t + dur_j
+        t_end -= ends[0]
+        t_end *= act == ACCEPT
+        ends[0] += t_end
+        for k in range(1, MACHINE_CAPACITY):
+            earlier = np.minimum(ends[k - 1], ends[k])
+            np.maximum(ends[k - 1], ends[k], out=ends[k])
+            ends[k - 1] = earlier
+
+        # 대기열 갱신: Postpone된 주문은 ring 뒤에 다시 넣음
+        ring.reshape(-1)[ring_base + (tail & ring_mask)] = flat
+        tail += postponed
+        head += from_ring
+        ring_left -= from_ring
+        arrival += 1 - from_ring
+        if int((tail - head).max(initial=0)) > ring_mask:
+            ring = _grow_ring(ring, head, tail)
+            ring_base = rows * ring.shape[1]
+
+    # 끝난 replication이 처리한 dummy 주문은 미처리로 되돌림
+    code.reshape(num_reps, width)[:, -1] = (-1 << ACTION_BITS) | POSTPONE
+    return code
+
+
+def _claim_table(chain, rep, num_reps, empty):
+    """
+    claim 추첨 대상 주문의 (모델, replication) 확률 index를 (replication별 k번째 대상 x replication) 표로 배치합니다.
+    대상 주문은 replication마다 처리 순서대로 주어지며, 대상이 없는 자리는 empty index로 채웁니다.
+    """
+    count = np.bincount(rep, minlength=num_reps)
+    table = np.full((num_reps, int(count.max(initial=0))), empty, dtype=np.int32)
+    table[np.arange(table.shape[1]) < count[:, None]] = chain
+    return np.ascontiguousarray(table.T)
+
+
+def _settle_orders(arrays, code, rng, num_timesteps):
+    """
+    주문별 최종 code로 simulate()의 Accept 후처리 claim과 run_simulation_policy()의
+    Accept/Outsource claim, reward, revenue를 replication별로 합산합니다.
+    replication마다 주문 순서대로 나열한 결정된(Accept/Reject/Outsource) 주문 목록으로 계산하며,
+    끝까지 Postpone / 미처리인 주문은 결정되지 않은 주문입니다.
+    """
+    num_reps, width = arrays["order_date"].shape
+    decided = np.flatnonzero((code & ACTION_MASK) != POSTPONE)
+    decided_rep = decided // width
+    action = code.take(decided) & ACTION_MASK
+    rev = arrays["revenue"].reshape(-1).take(decided).astype(np.float64)
+    accepted = np.flatnonzero(action == ACCEPT)
+    sold = np.flatnonzero(action != REJECT)
+
+    # claim 추첨: simulate()의 Accept 후처리 claim → run_simulation_policy()의 Accept/Outsource claim 순서로
+    # (모델, replication)별 claim 확률을 갱신. 확률은 주문 순서대로 갱신되므로 replication마다 k번째 대상 주문끼리
+    # 한 번에 처리 (대상이 없는 자리는 claim 확률 0으로 고정된 빈 index)
+    chain = arrays["model"].reshape(-1).take(decided) * num_reps + decided_rep
+    empty = len(arrays["model_names"]) * num_reps
+    probs = np.append(np.repeat([CLAIM_PROB_PER_MODEL.get(name, 0.0) for name in arrays["model_names"]], num_reps),
+                      0.0)
+    tables = [_claim_table(chain.take(events), decided_rep.take(events), num_reps, empty)
+              for events in [accepted, sold]]
+    table = np.concatenate(tables)
+    u = _uniform_float32(rng, table.shape)
+    hits = np.empty(table.shape, dtype=bool)
+    for idx, u_row, hit in zip(table, u, hits):
+        p = probs.take(idx)
+        np.less(u_row, p, out=hit)
+        probs[idx] = np.where(hit, np.minimum(1.0, p + CLAIM_PROB_UP), np.maximum(0.0, p - CLAIM_PROB_DOWN))
+    claim_count = np.count_nonzero(hits[tables[0].shape[0]:], axis=0).astype(np.float64)
+
+    # run_simulation_policy()의 Accept/Outsource reward 및 최종 revenue:
+    # 평균 revenue = Accept 후처리까지 결정된 전체 주문 + 같은 replication 앞 주문들의 revenue 기록
+    # (판매 주문 자신도 결정된 주문이므로 개수는 항상 1 이상이라 baseline은 쓰이지 않음)
+    decided_cnt = np.bincount(decided_rep, minlength=num_reps)
+    prior_sum = np.cumsum(rev) - rev
+    first = np.cumsum(decided_cnt) - decided_cnt
+    sold_rep = decided_rep.take(sold)
+    count = (decided_cnt - first).take(sold_rep) + sold
+    # 같은 replication 앞 주문들의 합 = prior_sum - (앞 replication들의 합), 여기에 replication 전체 합을 더함
+    decided_sum = np.bincount(decided_rep, weights=rev, minlength=num_reps)
+    total = prior_sum.take(sold)
+    total += (2 * decided_sum - np.cumsum(decided_sum)).take(sold_rep)
+    sold_rev = rev.take(sold)
+    outsourced = (action.take(sold) == OUTSOURCE).view(np.int8)
+    value = sold_rev * np.array([1.0, OUTSOURCE_FRACTION]).take(outsourced)
+    value_gain = value - total / count
+    total_reward = np.bincount(sold_rep, weights=np.maximum(value_gain, 0, out=value_gain), minlength=num_reps)
+    sold_at = decided.take(sold)
+    finish = np.minimum((code.take(sold_at) >> ACTION_BITS)
+                        + np.maximum(arrays["processing_time"].reshape(-1).take(sold_at), 1), num_timesteps)
+    # 납기를 넘긴 Accept 주문만 PENALTY 차감 (Outsource는 value 그대로)
+    late = finish > arrays["due_date"].reshape(-1).take(sold_at)
+    late &= outsourced == 0
+    total_revenue = np.bincount(sold_rep, weights=value - late * PENALTY, minlength=num_reps)
+
+    total_claim_cost = claim_count * float(CLAIM_PROCESSING_COST)
+    return {
+        "total_reward": total_reward - total_claim_cost,
+        "total_revenue": total_revenue - total_claim_cost,
+        "total_claim_cost": total_claim_cost,
+    }
+
+
+def simulate_batch(order_books, policy="random", num_timesteps=NUM_TIMESTEPS, seed=None):
+    """
+    K개 replication을 한 번에 (CHUNK_REPLICATIONS개 이하씩 나눠) 시뮬레이션합니다. (random / contextual 정책)
+    주문은 (replication x order) 배열, 머신 점유는 replication별 카운터로 관리합니다.
+      - random: 주문별 결정 시점 / 액션을 한 번에 뽑고 머신 용량이 걸린 Accept 시도만 timestep 순서대로 처리
+      - contextual: 모든 replication이 iteration마다 각자의 다음 결정 1건을 동시에 처리
+    simulate() + main.run_simulation_policy()의 reward / revenue / claim 계산을 그대로 따르며,
+    replication마다 학습 상태(action_params, revenue 기록, claim 확률)는 초기값에서 시작합니다.
+    (난수는 replication 방향으로 한 번에 뽑으므로 같은 주문이어도 simulate()와 난수열이 다릅니다)
+    order_books: 주문 목록 list 또는 orders_to_arrays / generate_order_arrays 결과 dict
+    return: dict("total_reward", "total_revenue", "total_claim_cost") - 각 (K,) 배열
+    """
+    if policy not in ["random", "contextual"]:
+        raise ValueError("Batch simulation supports only random/contextual policies: " + policy)
+
+    rng = np.random.default_rng(seed)
+    arrays = order_books if isinstance(order_books, dict) else orders_to_arrays(order_books, num_timesteps)
+    policy_codes = _random_policy_codes if policy == "random" else _contextual_policy_codes
+    # replication이 많으면 CHUNK_REPLICATIONS개 이하의 같은 크기로 나눠 처리
+    # (replication끼리는 독립이므로 결과는 이어 붙이면 됨)
+    num_reps = arrays["order_date"].shape[0]
+    bounds = np.linspace(0, num_reps, -(-num_reps // CHUNK_REPLICATIONS) + 1).astype(np.int64).tolist()
+    results = []
+    for start, stop in zip(bounds[:-1], bounds[1:]) if num_reps else [(0, 0)]:
+        chunk = {key: value[start:stop] if isinstance(value, np.ndarray) else value for key, value in arrays.items()}
+        results.append(_settle_orders(chunk, policy_codes(chunk, rng, num_timesteps), rng, num_timesteps))
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+
+def run_batch_policy(policy, num_replications, seed=42, num_timesteps=NUM_TIMESTEPS, generator="batch"):
+    """
+    generator: "batch" = generate_order_arrays()로 모든 replication의 주문을 한 번에 생성 (기본),
+               "legacy" / "numpy" = generate_order_books()로 replication마다 생성
+    """
+    if generator == "batch":
+        order_books = generate_order_arrays(num_replications, seed=seed, num_timesteps=num_timesteps)
+    else:
+        order_books = generate_order_books(num_replications, seed=seed, generator=generator,
+                                           num_timesteps=num_timesteps)
+    results = simulate_batch(order_books, policy=policy, num_timesteps=num_timesteps, seed=seed)
+    for key in ["total_reward", "total_revenue"]:
+        values = results[key]
+        print(f"[{policy.capitalize()} Policy x {num_replications}] {key}: "
+              f"mean = {values.mean():.2f}, std = {values.std():.2f}")
+    return results
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+
+from config import CLAIM_PROCESSING_COST, CLAIM_PROB_PER_MODEL
+
+CLAIM_PROB_UP = 0.01
+CLAIM_PROB_DOWN = 0.005
+
+
+def draw_claims(model_names, claim_probs=CLAIM_PROB_PER_MODEL, rng=random, cost=CLAIM_PROCESSING_COST):
+    """
+    처리 완료(Accept/Outsource)된 주문들의 claim 발생 여부를 한 번에 추첨합니다.
+    주문마다 순서대로
+        u = rng.random(); p = claim_probs[model]
+        claim이면 p = min(1, p + 0.01), 아니면 p = max(0, p - 0.005)
+    를 반복하던 루프와 결과(claim 여부, 갱신된 claim_probs, 사용한 난수 순서)가 완전히 같습니다.
+      1) 주문 수만큼 난수를 주문 순서대로 한 번에 뽑음 (rng의 난수 흐름이 루프와 같음)
+      2) 모델별로 묶고 (stable 정렬이라 모델 안에서는 주문 순서 유지) 모델마다 확률 변화를 scan
+      3) claim 여부를 원래 주문 순서로 되돌림
+    확률 갱신은 모델 안에서 이전 결과에 의존하므로 scan은 모델별로 순차 계산하지만,
+    모델 간에는 독립이라 dict 조회/갱신 없이 모델 한 개당 한 번씩만 claim_probs를 읽고 씁니다.
+    claim_probs: 모델별 claim 확률 dict (제자리에서 갱신, 없는 모델은 0.0으로 추가 — 기존 루프와 동일)
+    return: (주문별 claim 여부 bool 배열, total_claim_cost)
+    """
+    n = len(model_names)
+    flags = np.zeros(n, dtype=bool)
+    if n == 0:
+        return flags, 0.0
+    draw = rng.random
+    u = np.fromiter((draw() for _ in range(n)), dtype=np.float64, count=n)
+
+    index = {}
+    codes = np.fromiter((index.setdefault(m, len(index)) for m in model_names), dtype=np.int64, count=n)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(index)).tolist()
+
+    grouped = u[order].tolist()
+    hits = []
+    start = 0
+    for model, count in zip(index, counts):
+        p = claim_probs.get(model, 0.0)
+        for x in grouped[start:start + count]:
+            if x < p:
+                p = p + CLAIM_PROB_UP
+                if p > 1.0:
+                    p = 1.0
+                hits.append(True)
+            else:
+                p = p - CLAIM_PROB_DOWN
+                if p < 0.0:
+                    p = 0.0
+                hits.append(False)
+        claim_probs[model] = p
+        start += count
+
+    flags[order] = hits
+    return flags, float(cost * int(flags.sum()))
+
+
+def draw_order_claims(orders, claim_probs=CLAIM_PROB_PER_MODEL, rng=random, cost=CLAIM_PROCESSING_COST):
+    """
+    주문 객체 목록으로 draw_claims를 호출합니다. (주문 객체는 변경하지 않음)
+    """
+    return draw_claims([o.model_name for o in orders], claim_probs, rng, cost)
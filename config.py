@@ -19,4 +19,7 @@ CLAIM_PROB_PER_MODEL = {
     "50-EX30": 0.40,
     "55-EB40": 0.42,
     "60-EX40": 0.45,
-}
\ No newline at end of file
+}
+
+# 실행마다 claim 확률을 되돌리기 위한 초기값 (CLAIM_PROB_PER_MODEL은 시뮬레이션 중 제자리에서 갱신됨)
+INITIAL_CLAIM_PROB_PER_MODEL = dict(CLAIM_PROB_PER_MODEL)
@@ -68,4 +68,140 @@ def generate_orders():
     for i, row in enumerate(all_orders_data, start=1):
         row[0] = i
 
-    return all_orders_data
\ No newline at end of file
+    return all_orders_data
+
+# ---------------------------------------------------------------------------
+# NumPy Generator 기반 주문 생성 (대량 주문 스트레스 시나리오용)
+# ---------------------------------------------------------------------------
+MODEL_NAMES = list(model_info.keys())
+MODEL_PROCESSING_TIME = np.array([model_info[m][0] for m in MODEL_NAMES], dtype=np.int64)
+MODEL_REVENUE = np.array([model_info[m][1] for m in MODEL_NAMES], dtype=np.int64)
+MODEL_RISK = np.array([model_info[m][2] for m in MODEL_NAMES], dtype=np.float64)
+
+ORDER_FIELDS = ["order_no", "order_date", "decision_due_date", "model", "processing_time", "due_date", "revenue",
+                "risk"]
+
+# 난수는 BLOCK_TIMESTEPS 단위 block마다 독립된 Generator로 뽑으므로 chunk 크기와 무관하게 같은 주문이 생성됨
+BLOCK_TIMESTEPS = 1024
+
+
+def _rows_to_arrays(rows):
+    model_ids = {name: i for i, name in enumerate(MODEL_NAMES)}
+    return {
+        "order_no": np.array([row[0] for row in rows], dtype=np.int64),
+        "order_date": np.array([row[1] for row in rows], dtype=np.int64),
+        "decision_due_date": np.array([row[2] for row in rows], dtype=np.int64),
+        "model": np.array([model_ids[row[3]] for row in rows], dtype=np.int64),
+        "processing_time": np.array([row[4] for row in rows], dtype=np.int64),
+        "due_date": np.array([row[5] for row in rows], dtype=np.int64),
+        "revenue": np.array([row[6] for row in rows], dtype=np.int64),
+        "risk": np.array([row[7] for row in rows], dtype=np.float64),
+    }
+
+
+def _draw_block(rng, start, end, arrival_prob, max_batch):
+    """
+    [start, end) 구간의 주문을 한 번에 뽑습니다. generate_orders()와 같은 분포:
+      - timestep마다 arrival_prob 확률로 1~max_batch개 도착
+      - 모델은 model_info에서 균등 선택
+      - decision_due_date = t + U{3..10}, due_date = t + p_time + U{2..15}
+    """
+    ts = np.arange(start, end, dtype=np.int64)
+    arrive = rng.random(ts.size) < arrival_prob
+    counts = np.where(arrive, rng.integers(1, max_batch + 1, size=ts.size), 0)
+    order_date = np.repeat(ts, counts)
+    n = order_date.size
+    model = rng.integers(0, len(MODEL_NAMES), size=n)
+    processing_time = MODEL_PROCESSING_TIME[model]
+    return {
+        "order_no": np.zeros(n, dtype=np.int64),
+        "order_date": order_date,
+        "decision_due_date": order_date + rng.integers(3, 11, size=n),
+        "model": model,
+        "processing_time": processing_time,
+        "due_date": order_date + processing_time + rng.integers(2, 16, size=n),
+        "revenue": MODEL_REVENUE[model],
+        "risk": MODEL_RISK[model],
+    }
+
+
+def _take(arrays, idx):
+    return {key: arrays[key][idx] for key in ORDER_FIELDS}
+
+
+def chunk_to_rows(chunk):
+    """
+    chunk(dict of arrays)를 generate_orders()와 같은 row 리스트로 변환합니다.
+    """
+    names = np.array(MODEL_NAMES, dtype=object)[chunk["model"]]
+    return [list(row) for row in zip(chunk["order_no"].tolist(), chunk["order_date"].tolist(),
+                                     chunk["decision_due_date"].tolist(), names.tolist(),
+                                     chunk["processing_time"].tolist(), chunk["due_date"].tolist(),
+                                     chunk["revenue"].tolist(), chunk["risk"].tolist())]
+
+
+def iter_order_chunks(seed=None, num_timesteps=NUM_TIMESTEPS, chunk_timesteps=BLOCK_TIMESTEPS, arrival_prob=0.2,
+                      max_batch=5, include_initial=True, as_rows=False):
+    """
+    주문을 OrderDate 순서의 chunk로 나누어 yield 합니다. (전체 주문 목록을 메모리에 올리지 않음)
+    chunk i는 OrderDate가 [i * chunk_timesteps, (i + 1) * chunk_timesteps) 인 주문이며,
+    마지막 chunk에는 horizon 이후 날짜의 initial 주문도 포함됩니다.
+    OrderNo는 chunk를 넘어 1부터 연속으로 부여됩니다.
+    같은 seed면 chunk_timesteps와 관계없이 같은 주문이 생성됩니다.
+
+    seed    : numpy SeedSequence seed (None이면 매번 다른 주문)
+    as_rows : True면 generate_orders()와 같은 row 리스트, False면 필드별 numpy 배열 dict
+              (dict에는 chunk 구간을 나타내는 "start", "end"도 포함; model은 MODEL_NAMES 인덱스)
+    """
+    if chunk_timesteps < 1:
+        raise ValueError("chunk_timesteps must be >= 1")
+    root = np.random.SeedSequence(seed)
+    horizon = num_timesteps + 1
+    buffer = _rows_to_arrays(initial_orders_data if include_initial else [])
+    generated = 0
+    next_no = 1
+    start = 0
+    while True:
+        end = start + chunk_timesteps
+        last = end >= horizon
+        # chunk 끝까지 필요한 block 생성
+        blocks = [buffer]
+        while generated < horizon and (last or generated < end):
+            block_end = min(generated + BLOCK_TIMESTEPS, horizon)
+            rng = np.random.default_rng(root.spawn(1)[0])
+            blocks.append(_draw_block(rng, generated, block_end, arrival_prob, max_batch))
+            generated = block_end
+        if len(blocks) > 1:
+            buffer = {key: np.concatenate([blk[key] for blk in blocks]) for key in ORDER_FIELDS}
+            # 같은 날짜에서는 initial 주문이 먼저 (generate_orders의 안정 정렬과 동일)
+            buffer = _take(buffer, np.argsort(buffer["order_date"], kind="stable"))
+
+        split = buffer["order_date"].size if last else int(np.searchsorted(buffer["order_date"], end, side="left"))
+        chunk = _take(buffer, slice(0, split))
+        buffer = _take(buffer, slice(split, None))
+        chunk["order_no"] = np.arange(next_no, next_no + split, dtype=np.int64)
+        next_no += split
+        if as_rows:
+            yield chunk_to_rows(chunk)
+        else:
+            chunk["start"], chunk["end"] = start, (None if last else end)
+            yield chunk
+        if last:
+            return
+        start = end
+
+
+def generate_orders_fast(seed=None, num_timesteps=NUM_TIMESTEPS, arrival_prob=0.2, max_batch=5,
+                         include_initial=True, as_rows=True):
+    """
+    generate_orders()와 같은 분포의 주문 목록을 numpy Generator로 한 번에 생성합니다.
+    (전역 random 상태를 사용하지 않으므로 generate_orders()와 주문 자체는 다릅니다)
+    as_rows=False면 필드별 numpy 배열 dict를 반환합니다.
+    """
+    chunk = next(iter_order_chunks(seed=seed, num_timesteps=num_timesteps, chunk_timesteps=num_timesteps + 1,
+                                   arrival_prob=arrival_prob, max_batch=max_batch,
+                                   include_initial=include_initial, as_rows=as_rows))
+    if not as_rows:
+        chunk.pop("start")
+        chunk.pop("end")
+    return chunk
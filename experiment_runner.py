@@ -0,0 +1,148 @@
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from config import CLAIM_PROB_PER_MODEL, INITIAL_CLAIM_PROB_PER_MODEL
+
+POLICIES = ["random", "contextual", "treebootstrap", "online_treebootstrap", "lints", "milp", "milp_rolling"]
+
+
+def reset_global_state():
+    """
+    모듈 전역으로 유지되는 학습/누적 상태를 초기값으로 되돌립니다.
+      - thompson_sampling.action_params, tree_data
+      - reward.order_revenue_stats 등 reward 통계
+      - config.CLAIM_PROB_PER_MODEL (실행 중 제자리에서 갱신됨)
+    """
+    from thompson_sampling import reset_thompson_state
+    from reward import reset_reward_state
+
+    reset_thompson_state()
+    reset_reward_state()
+    CLAIM_PROB_PER_MODEL.clear()
+    CLAIM_PROB_PER_MODEL.update(INITIAL_CLAIM_PROB_PER_MODEL)
+
+
+def run_job(policy, seed, use_gpt_claim=False, engine="scan", milp_options=None, reward_options=None):
+    """
+    (policy, seed) 조합 하나를 실행하고 결과 한 행(dict)을 반환합니다.
+    reward_options: reward.configure_reward_stats에 전달할 평균 revenue 설정 (예: {"mode": "ewma", "ewma_alpha": 0.1})
+    milp_options: milp 정책일 때 evaluate_milp에 그대로 전달할 옵션 (예: {"method": "heuristic", "time_limit": 30})
+                  milp_rolling 정책에는 solver 옵션(backend, time_limit, mip_gap, threads)만 전달됩니다.
+    같은 프로세스에서 여러 job이 실행되어도 서로 영향을 주지 않도록 실행 전 전역 상태를 초기화합니다.
+    """
+    from main import evaluate_simulation_policy
+    from milp_solver import evaluate_milp, evaluate_milp_rolling
+    from reward import reward_stats_snapshot, configure_reward_stats
+
+    reset_global_state()
+    configure_reward_stats(**(reward_options or {}))
+    random.seed(seed)
+    np.random.seed(seed)
+
+    solve_stats = []
+    if policy in ["milp", "milp_rolling"]:
+        milp_options = milp_options or {}
+        if policy == "milp":
+            result = evaluate_milp(use_gpt_claim=use_gpt_claim, **milp_options)
+        else:
+            solver_keys = ["backend", "time_limit", "mip_gap", "threads"]
+            result = evaluate_milp_rolling(use_gpt_claim=use_gpt_claim,
+                                           **{k: v for k, v in milp_options.items() if k in solver_keys})
+        solve_stats = result["solve_stats"]
+        total_reward = None
+        total_revenue = result["adjusted_revenue"]
+        total_claim_cost = result["total_claim_cost"]
+    elif policy in ["random", "contextual", "treebootstrap", "online_treebootstrap", "lints"]:
+        result = evaluate_simulation_policy(policy, use_gpt_claim=use_gpt_claim, engine=engine)
+        total_reward = result["total_reward"]
+        total_revenue = result["total_revenue"]
+        total_claim_cost = result["total_claim_cost"]
+    else:
+        raise ValueError("Unknown policy: " + policy)
+
+    reward_stats = reward_stats_snapshot()["reward"]
+    return {
+        "Policy": policy,
+        "Seed": seed,
+        "TotalReward": total_reward,
+        "TotalRevenue": total_revenue,
+        "TotalClaimCost": total_claim_cost,
+        "DecidedOrders": reward_stats["count"],
+        "RewardMean": reward_stats["mean"],
+        "RewardStd": reward_stats["std"],
+        "SolveTime": sum(st.build_time + st.solve_time for st in solve_stats) if solve_stats else None,
+        "MipGap": solve_stats[-1].gap if solve_stats else None,
+    }
+
+
+def _run_job_args(args):
+    return run_job(*args)
+
+
+def run_experiments(policies, seeds, workers=None, use_gpt_claim=False, engine="scan", milp_options=None,
+                    reward_options=None):
+    """
+    (policy, seed) 격자를 프로세스 풀로 나누어 실행하고 결과를 하나의 DataFrame으로 모읍니다.
+    workers: 프로세스 수 (None이면 CPU 코어 수)
+    """
+    import pandas as pd
+
+    jobs = [(policy, seed, use_gpt_claim, engine, milp_options, reward_options) for policy in policies
+            for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rows = [_run_job_args(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(_run_job_args, jobs))
+
+    return pd.DataFrame(rows, columns=["Policy", "Seed", "TotalReward", "TotalRevenue", "TotalClaimCost",
+                                       "DecidedOrders", "RewardMean", "RewardStd", "SolveTime", "MipGap"])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="정책 x seed 조합을 병렬로 실행하고 결과를 하나의 표로 저장합니다."
+    )
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=["random", "contextual"],
+                        help="실행할 정책 목록")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[42], help="실행할 seed 목록")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--engine", type=str, choices=["scan", "event"], default="scan",
+                        help="시뮬레이션 엔진 (main.py와 동일)")
+    parser.add_argument("--gpt-claim", dest="use_gpt_claim", action="store_true",
+                        help="Enable GPT-based claim generation and analysis.")
+    parser.add_argument("--milp-method", type=str, choices=["exact", "heuristic"], default="exact",
+                        help="milp 정책의 풀이 방식 (main.py와 동일)")
+    parser.add_argument("--milp-backend", type=str, choices=["cbc", "highs"], default="cbc",
+                        help="milp 정책의 solver (main.py와 동일)")
+    parser.add_argument("--time-limit", type=float, default=None, help="milp solve 1회당 시간 제한(초)")
+    parser.add_argument("--mip-gap", type=float, default=None, help="milp 상대 MIP gap 허용치")
+    parser.add_argument("--threads", type=int, default=None, help="milp solver thread 수 (cbc만 지원)")
+    parser.add_argument("--milp-cache", type=str, default=None,
+                        help="milp 풀이 결과 캐시 디렉터리 (반복 실험에서 같은 주문 데이터는 한 번만 풉니다)")
+    parser.add_argument("--average-revenue", type=str, choices=["cumulative", "ewma", "window"],
+                        default="cumulative", help="reward 계산의 평균 revenue 방식 (main.py와 동일)")
+    parser.add_argument("--revenue-ewma-alpha", type=float, default=0.1, help="--average-revenue ewma의 alpha")
+    parser.add_argument("--revenue-window", type=int, default=50, help="--average-revenue window의 최근 주문 수")
+    parser.add_argument("--output", type=str, default="experiment_results.csv", help="결과 CSV 경로")
+    args = parser.parse_args()
+
+    df = run_experiments(args.policies, args.seeds, workers=args.workers,
+                         use_gpt_claim=args.use_gpt_claim, engine=args.engine,
+                         milp_options={"method": args.milp_method, "backend": args.milp_backend,
+                                       "time_limit": args.time_limit, "mip_gap": args.mip_gap,
+                                       "threads": args.threads, "cache": args.milp_cache},
+                         reward_options={"mode": args.average_revenue, "ewma_alpha": args.revenue_ewma_alpha,
+                                         "window": args.revenue_window})
+    print(df.to_string(index=False))
+    df.to_csv(args.output, index=False)
+    print(f"{args.output} 파일이 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from gpt_model.claim_prompts import GENERATE_MODEL_ID, ANALYSIS_MODEL_ID, GENERATE_PARAMS, ANALYSIS_PARAMS, \
+    generate_messages, analysis_messages, attach_claim
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+# 재시도할 HTTP 상태 (rate limit / 서버 오류)
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    asyncio용 token bucket rate limiter: 초당 rate개 token이 채워지고 최대 capacity개까지 모입니다.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ClaimRequestError(RuntimeError):
+    pass
+
+
+class _RetryableError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _post_json(url, payload, headers, timeout):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        if e.code in RETRY_STATUS:
+            retry_after = e.headers.get("Retry-After") if e.headers else None
+            raise _RetryableError(f"HTTP {e.code}", float(retry_after) if retry_after else None) from e
+        raise ClaimRequestError(f"HTTP {e.code}: {e.read().decode('utf-8', 'replace')[:200]}") from e
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise _RetryableError(str(e)) from e
+
+
+class ClaimPipeline:
+    """
+    chat-completions 호환 endpoint로 claim 생성 → 분석 요청을 asyncio로 동시에 보내는 pipeline.
+      - concurrency : 동시에 진행 중인 HTTP 요청 수 상한 (asyncio.Semaphore + 같은 크기의 thread pool)
+      - rate, burst : token bucket rate limit (초당 요청 수 / 최대 burst, rate=None이면 제한 없음)
+      - max_retries : 429/5xx/연결 오류 시 재시도 횟수 (지수 backoff + jitter, Retry-After 헤더 우선)
+      - cache       : gpt_model.response_cache.ResponseCache (캐시에 있는 요청은 HTTP를 보내지 않음)
+    claims(n)은 요청이 끝난 순서와 관계없이 n개의 (claim_text, analysis_text)를 요청 순서대로 반환합니다.
+    HTTP는 표준 라이브러리(urllib)로 보내므로 openai 패키지가 필요 없고,
+    base_url을 gpt_model.mock_server 주소로 바꾸면 네트워크 없이 테스트할 수 있습니다.
+    """
+
+    def __init__(self, base_url=None, api_key=None, concurrency=8, rate=None, burst=None, max_retries=3,
+                 backoff=0.5, max_backoff=8.0, timeout=60.0, generate_model=GENERATE_MODEL_ID,
+                 analysis_model=ANALYSIS_MODEL_ID, cache=None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.generate_model = generate_model
+        self.analysis_model = analysis_model
+        self.cache = cache
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    async def chat(self, model, messages, **params):
+        """
+        chat-completions 요청 1회 (캐시 / rate limit / 동시성 제한 / 재시도 포함). return: 응답 message content
+        """
+        if self.cache is None:
+            return await self._request(model, messages, params)
+        # sample 번호가 요청 순서대로 매겨지도록 첫 await 전에 key를 정함
+        cache_key = self.cache.request_key(model, messages, params)
+        return await self.cache.acall(lambda: self._request(model, messages, params), cache_key, model, messages,
+                                      params)
+
+    async def _request(self, model, messages, params):
+        payload = {"model": model, "messages": messages, **params}
+        url = f"{self.base_url}/chat/completions"
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                try:
+                    response = await loop.run_in_executor(self._executor, _post_json, url, payload,
+                                                          self._headers(), self.timeout)
+                    return response["choices"][0]["message"]["content"]
+                except _RetryableError as e:
+                    if attempt == self.max_retries:
+                        self.stats["failures"] += 1
+                        raise ClaimRequestError(f"{model}: {e} (after {attempt + 1} attempts)") from e
+                    delay = e.retry_after
+            if delay is None:
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * (0.5 + random.random() / 2)
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def claim(self):
+        """
+        claim 1건: 생성 → 생성된 텍스트로 분석. return: (claim_text, analysis_text)
+        """
+        claim_text = await self.chat(self.generate_model, generate_messages(), **GENERATE_PARAMS)
+        analysis_text = await self.chat(self.analysis_model, analysis_messages(claim_text), **ANALYSIS_PARAMS)
+        return claim_text, analysis_text
+
+    async def claims(self, n):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._bucket = TokenBucket(self.rate, self.burst) if self.rate else None
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            try:
+                return await asyncio.gather(*(self.claim() for _ in range(n)))
+            finally:
+                self._executor = None
+
+    def run(self, n):
+        """
+        동기 코드에서 claims(n)을 실행합니다.
+        """
+        if n == 0:
+            return []
+        return asyncio.run(self.claims(n))
+
+
+def fill_claims(orders, pipeline):
+    """
+    claim이 발생한 주문들의 claim 텍스트를 pipeline으로 한 번에 생성/분석해 순서대로 붙입니다.
+    """
+    results = pipeline.run(len(orders))
+    for order, (claim_text, analysis_text) in zip(orders, results):
+        attach_claim(order, claim_text, analysis_text)
+        print(f"Order {order.order_no}: Claim generated and analyzed.")
+    return results
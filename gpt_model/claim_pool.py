@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import deque
+
+from gpt_model.claim_prompts import claim_models, generate_messages, analysis_messages
+
+
+def backend_producer(n):
+    """
+    현재 claim backend(claim_prompts.claim_models)로 n개의 (claim_text, analysis_text)를 순차 생성합니다.
+    """
+    models = claim_models()
+    claims = []
+    for _ in range(n):
+        claim_text = models.generate_claim(generate_messages())
+        claims.append((claim_text, models.analysis_claim(analysis_messages(claim_text))))
+    return claims
+
+
+def pipeline_producer(pipeline):
+    """
+    ClaimPipeline으로 한 번에 n개를 동시 요청하는 producer
+    """
+    return pipeline.run
+
+
+class ClaimPool:
+    """
+    생성/분석이 끝난 claim을 미리 만들어 두는 pool.
+    background thread가 pool에 남은 claim이 low_water개 이하가 되면 size개까지 다시 채우고,
+    consumer(take)는 pool에 claim이 있으면 기다리지 않고 바로 가져갑니다. (비어 있으면 채워질 때까지 대기)
+      - producer: n -> [(claim_text, analysis_text), ...] (기본: 현재 backend로 순차 생성)
+      - batch   : producer 한 번에 요청할 최대 claim 수 (pipeline_producer면 동시 요청 수 정도가 적당)
+    claim은 만든 순서대로(FIFO) 꺼내므로 producer가 결정적이면 claim 순서도 실행마다 같습니다.
+    stats: hits(바로 가져감) / misses(대기함) / wait_time, max_wait(초) / produced
+    """
+
+    def __init__(self, size=32, low_water=8, producer=None, batch=1):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        if not 0 <= low_water < size:
+            raise ValueError("low_water must be in [0, size)")
+        self.size = size
+        self.low_water = low_water
+        self.producer = producer or backend_producer
+        self.batch = max(1, batch)
+        self.stats = {"hits": 0, "misses": 0, "wait_time": 0.0, "max_wait": 0.0, "produced": 0}
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error = None
+        self._waiting = 0
+        # True면 size개가 찰 때까지 계속 채움 (처음 시작할 때 / low_water 이하로 내려갔을 때)
+        self._refill = True
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="claim-pool", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # 채울 차례가 아니고 기다리는 consumer도 없으면 대기
+                while not self._closed and not self._waiting and (
+                        len(self._items) >= self.size or not self._refill):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                n = min(self.batch, self.size - len(self._items))
+            try:
+                claims = self.producer(max(1, n))
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._items.extend(claims)
+                self.stats["produced"] += len(claims)
+                if len(self._items) >= self.size:
+                    self._refill = False
+                self._cond.notify_all()
+
+    def take(self, timeout=None):
+        """
+        claim 1건을 꺼냅니다. return: (claim_text, analysis_text)
+        """
+        with self._cond:
+            if self._items:
+                self.stats["hits"] += 1
+                item = self._items.popleft()
+                if len(self._items) <= self.low_water and not self._refill:
+                    self._refill = True
+                    self._cond.notify_all()
+                return item
+            if self._thread is None:
+                self.start()
+            self.stats["misses"] += 1
+            self._refill = True
+            self._waiting += 1
+            self._cond.notify_all()
+            start = time.perf_counter()
+            try:
+                while not self._items:
+                    if self._error is not None:
+                        raise RuntimeError("claim pool producer failed") from self._error
+                    remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("claim pool is empty")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+                waited = time.perf_counter() - start
+                self.stats["wait_time"] += waited
+                self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+            return self._items.popleft()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,77 @@
+# Claim 생성/분석 모델 호출에 공통으로 쓰는 모델 ID, 샘플링 파라미터, 프롬프트, 응답 파싱
+# (openai 패키지 없이 import 할 수 있도록 models.py와 분리)
+import importlib
+
+GENERATE_MODEL_ID = "ft:gpt-4o-2024-08-06:personal:generate-claim:AxWbiQRk"
+ANALYSIS_MODEL_ID = "ft:gpt-4o-2024-08-06:personal:analyis-claim:AxWjyNA9"
+
+GENERATE_PARAMS = {"temperature": 0.7, "max_tokens": 150}
+ANALYSIS_PARAMS = {"temperature": 0, "max_tokens": 150}
+
+# generate_claim / analysis_claim을 제공하는 backend 모듈
+CLAIM_BACKENDS = {"openai": "gpt_model.models", "local": "gpt_model.local_models"}
+claim_backend = "openai"
+# 미리 생성해 둔 claim을 꺼내 쓰는 pool (gpt_model.claim_pool.ClaimPool, set_claim_pool로 지정)
+claim_pool = None
+
+GENERATE_PROMPT = ("A claim Occurs. Generate a claim randomly. You must answer only about the claim. "
+                   "Exclude everything else from your response.")
+
+
+def set_claim_backend(name):
+    global claim_backend
+    if name not in CLAIM_BACKENDS:
+        raise ValueError("Unknown claim backend: " + name)
+    claim_backend = name
+
+
+def claim_models():
+    """
+    현재 backend 모듈 (generate_claim(message), analysis_claim(message) 제공)
+    """
+    return importlib.import_module(CLAIM_BACKENDS[claim_backend])
+
+
+def set_claim_pool(pool):
+    global claim_pool
+    claim_pool = pool
+
+
+def fetch_claim():
+    """
+    claim 1건 생성 + 분석. claim_pool이 지정되어 있으면 pool에서 꺼냅니다. return: (claim_text, analysis_text)
+    """
+    if claim_pool is not None:
+        return claim_pool.take()
+    models = claim_models()
+    claim_text = models.generate_claim(generate_messages())
+    return claim_text, models.analysis_claim(analysis_messages(claim_text))
+
+
+def generate_messages():
+    return [{"role": "user", "content": GENERATE_PROMPT}]
+
+
+def analysis_messages(claim_text):
+    return [{"role": "user",
+             "content": f'You must respond strictly in the following format. Exclude everything else from your response:{{"Position": "your answer about defect position", "Cause": "your answer about defect cause"}}\n"Claim: {claim_text}"'}]
+
+
+def parse_analysis(analysis_text):
+    """
+    분석 모델 응답을 (cause, position)으로 나눕니다. ("Cause: ...; Position: ..." 형식, 아니면 전체를 cause로)
+    """
+    if ";" in analysis_text:
+        parts = analysis_text.split(";")
+        cause = parts[0].replace("Cause:", "").strip() if "Cause:" in parts[0] else parts[0].strip()
+        position = parts[1].replace("Position:", "").strip() if len(parts) > 1 and "Position:" in parts[1] else parts[
+            1].strip()
+    else:
+        cause = analysis_text
+        position = ""
+    return cause, position
+
+
+def attach_claim(order, claim_text, analysis_text):
+    order.claim = claim_text
+    order.cause, order.position = parse_analysis(analysis_text)
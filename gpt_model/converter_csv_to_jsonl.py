@@ -1,57 +1,101 @@
-import pandas as pd
+import argparse
+import hashlib
 import json
-from sklearn.model_selection import train_test_split
-
-
-def run(job):
-    def convert_to_gpt35_format(dataset, job):
-        if job == 'analysis':
-            fine_tuning_data = []
-            for _, row in dataset.iterrows():
-                json_response = '{"Cause": "' + row['Cause'] + '", "Position": "' + row['Position'] + '"}'
-                fine_tuning_data.append({
-                    "messages": [
-                        {"role": "user", "content": f'You must respond strictly in the following format. Exclude everything else from your response:{{"Position": "your answer about defect position", "Cause": "your answer about defect cause"}}\n"Claim: {row["Claim"]}'},
-                        {"role": "assistant", "content": json_response}
-                    ]
-                })
-            return fine_tuning_data
-        elif job == 'generate':
-            fine_tuning_data = []
-            for _, row in dataset.iterrows():
-                fine_tuning_data.append({
-                    "messages": [
-                        {"role": "user", "content": row['Occur']},
-                        {"role": "assistant", "content": row['Claim']}
-                    ]
-                })
-            return fine_tuning_data
-
-    df = pd.read_csv(f'{job}_sample.csv')
-    convert_data=convert_to_gpt35_format(df, job)
 
-    if job == 'analysis':
-        train_data, test_data = train_test_split(
-            convert_data,
-            test_size=0.33,
-            random_state=1
-        )
-
-    def write_to_jsonl(data, file_path):
-        with open(file_path, 'w') as file:
-            for entry in data:
-                json.dump(entry, file)
-                file.write('\n')
+import pandas as pd
+
+ANALYSIS_PROMPT = ('You must respond strictly in the following format. Exclude everything else from your response:'
+                   '{{"Position": "your answer about defect position", "Cause": "your answer about defect cause"}}'
+                   '\n"Claim: {claim}')
+JOB_COLUMNS = {"analysis": ["Claim", "Cause", "Position"], "generate": ["Occur", "Claim"]}
+DEFAULT_CHUNK_SIZE = 10000
 
+# 재사용하는 JSON encoder (문자열 이어 붙이기 대신 escape 처리)
+_encoder = json.JSONEncoder()
+
+
+def convert_row(job, row):
+    """
+    CSV 한 행(dict) -> fine-tuning 형식 dict
+    """
     if job == 'analysis':
-        train_file_name = f"{job}_train.jsonl"
-        test_file_name = f"{job}_test.jsonl"
-        write_to_jsonl(train_data, train_file_name)
-        write_to_jsonl(test_data, test_file_name)
+        json_response = _encoder.encode({"Cause": row['Cause'], "Position": row['Position']})
+        return {
+            "messages": [
+                {"role": "user", "content": ANALYSIS_PROMPT.format(claim=row["Claim"])},
+                {"role": "assistant", "content": json_response}
+            ]
+        }
+    elif job == 'generate':
+        return {
+            "messages": [
+                {"role": "user", "content": row['Occur']},
+                {"role": "assistant", "content": row['Claim']}
+            ]
+        }
+    raise ValueError("Unknown job: " + job)
+
 
+def is_test_row(key, test_size, seed=1):
+    """
+    key(claim 텍스트)의 hash로 train/test를 정합니다. 같은 key는 항상 같은 쪽으로 가고, test 비율은 약 test_size.
+    """
+    digest = hashlib.blake2b(f"{seed}:{key}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64 < test_size
+
+
+def iter_rows(csv_path, job, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    CSV를 chunk_size행씩 읽어 한 행씩 dict로 돌려줍니다. (필요한 컬럼만 문자열로 읽음)
+    """
+    columns = JOB_COLUMNS[job]
+    for chunk in pd.read_csv(csv_path, usecols=columns, dtype=str, keep_default_na=False, encoding="utf-8-sig",
+                             chunksize=chunk_size):
+        for values in zip(*(chunk[c].tolist() for c in columns)):
+            yield dict(zip(columns, values))
+
+
+def run(job, csv_path=None, output_dir=".", chunk_size=DEFAULT_CHUNK_SIZE, test_size=0.33, seed=1):
+    """
+    {job}_sample.csv를 chunk 단위로 읽어 JSONL로 바로 씁니다. (전체 데이터를 메모리에 올리지 않음)
+      - analysis: hash 기반으로 {job}_train.jsonl / {job}_test.jsonl에 나누어 저장
+      - generate: {job}.jsonl에 저장
+    return: 파일별 저장한 행 수 dict
+    """
+    csv_path = csv_path or f'{job}_sample.csv'
+    if job == 'analysis':
+        paths = {"train": f"{output_dir}/{job}_train.jsonl", "test": f"{output_dir}/{job}_test.jsonl"}
     elif job == 'generate':
-        file_name = f"{job}.jsonl"
-        write_to_jsonl(convert_data, file_name)
+        paths = {"all": f"{output_dir}/{job}.jsonl"}
+    else:
+        raise ValueError("Unknown job: " + job)
+
+    files = {name: open(path, 'w', encoding='utf-8') for name, path in paths.items()}
+    counts = dict.fromkeys(paths, 0)
+    try:
+        for row in iter_rows(csv_path, job, chunk_size):
+            if job == 'analysis':
+                name = "test" if is_test_row(row["Claim"], test_size, seed) else "train"
+            else:
+                name = "all"
+            files[name].write(_encoder.encode(convert_row(job, row)))
+            files[name].write('\n')
+            counts[name] += 1
+    finally:
+        for f in files.values():
+            f.close()
+    return {paths[name]: count for name, count in counts.items()}
+
 
-job = 'analysis'
-run(job)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="claim CSV -> fine-tuning JSONL 변환")
+    parser.add_argument("job", choices=list(JOB_COLUMNS))
+    parser.add_argument("--input", default=None, help="입력 CSV (기본: {job}_sample.csv)")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--test-size", type=float, default=0.33)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    for path, count in run(args.job, args.input, args.output_dir, args.chunk_size, args.test_size,
+                           args.seed).items():
+        print(f"{path}: {count} rows")
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import random
+import re
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+# fine-tuning용 JSONL(converter_csv_to_jsonl 결과)로 학습하는 로컬 claim 모델
+#   - claim 생성: 단어 단위 Markov chain sampler (또는 학습 claim을 그대로 뽑는 sample 모드)
+#   - claim 분석: Cause / Position 각각 multinomial naive Bayes 분류기
+# gpt_model.models와 같은 generate_claim(message) / analysis_claim(message)를 제공하므로
+# 네트워크 / openai 패키지 없이 claim 처리를 실행할 수 있습니다.
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATE_FILES = ["generate.jsonl"]
+ANALYSIS_FILES = ["analysis_train.jsonl", "analysis_test.jsonl"]
+
+_TOKEN = re.compile(r"[A-Z0-9]+")
+_CLAIM_PREFIX = '"Claim: '
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.upper())
+
+
+def load_pairs(path):
+    """
+    JSONL 파일의 (user content, assistant content) 쌍 목록
+    """
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            messages = json.loads(line)["messages"]
+            user = next(m["content"] for m in messages if m["role"] == "user")
+            assistant = next(m["content"] for m in messages if m["role"] == "assistant")
+            pairs.append((user, assistant))
+    return pairs
+
+
+def claim_from_prompt(prompt):
+    """
+    분석 프롬프트에서 claim 본문만 꺼냅니다. (claim_prompts.analysis_messages 형식)
+    """
+    idx = prompt.find(_CLAIM_PREFIX)
+    if idx < 0:
+        return prompt
+    return prompt[idx + len(_CLAIM_PREFIX):].rstrip('"')
+
+
+class MarkovClaimSampler:
+    """
+    단어 단위 order차 Markov chain으로 claim 텍스트를 생성합니다.
+    상태(직전 order개 단어)별 다음 단어 후보를 빈도만큼 중복해 list로 저장하므로 샘플링은 random.choice 한 번입니다.
+    """
+
+    def __init__(self, texts, order=2, max_words=60):
+        self.order = order
+        self.max_words = max_words
+        self.texts = list(texts)
+        chain = defaultdict(list)
+        self.starts = []
+        for text in self.texts:
+            words = text.split()
+            if len(words) <= order:
+                continue
+            self.starts.append(tuple(words[:order]))
+            for i in range(len(words) - order):
+                chain[tuple(words[i:i + order])].append(words[i + order])
+            chain[tuple(words[-order:])].append(None)
+        self.chain = dict(chain)
+
+    def sample(self, rng):
+        if not self.starts:
+            return rng.choice(self.texts)
+        state = rng.choice(self.starts)
+        words = list(state)
+        chain = self.chain
+        while len(words) < self.max_words:
+            candidates = chain.get(state)
+            if not candidates:
+                break
+            word = rng.choice(candidates)
+            if word is None:
+                break
+            words.append(word)
+            state = state[1:] + (word,)
+        return " ".join(words)
+
+
+class NaiveBayesClassifier:
+    """
+    multinomial naive Bayes (Laplace smoothing alpha). predict는 토큰별 log 확률 합이 가장 큰 label.
+    log 확률은 (단어 수 + 1) x (label 수) 행렬로 저장하고 (마지막 행 = 학습에 없던 단어),
+    predict는 토큰 행을 모아 한 번에 더합니다.
+    """
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self.labels = []
+        self.vocab = {}
+        self.log_prior = None
+        self.log_prob = None
+
+    def fit(self, texts, labels):
+        counts = defaultdict(Counter)
+        label_counts = Counter(labels)
+        vocab = set()
+        for text, label in zip(texts, labels):
+            tokens = tokenize(text)
+            counts[label].update(tokens)
+            vocab.update(tokens)
+        total = sum(label_counts.values())
+        self.labels = sorted(label_counts)
+        self.vocab = {w: i for i, w in enumerate(sorted(vocab))}
+        table = np.zeros((len(self.vocab) + 1, len(self.labels)))
+        for j, label in enumerate(self.labels):
+            for w, c in counts[label].items():
+                table[self.vocab[w], j] = c
+            denom = sum(counts[label].values()) + self.alpha * (len(vocab) + 1)
+            table[:, j] = np.log((table[:, j] + self.alpha) / denom)
+        self.log_prob = table
+        self.log_prior = np.log(np.array([label_counts[label] for label in self.labels]) / total)
+        return self
+
+    def predict(self, text):
+        unknown = len(self.vocab)
+        rows = [self.vocab.get(w, unknown) for w in tokenize(text)]
+        scores = self.log_prior + self.log_prob[rows].sum(axis=0)
+        return self.labels[int(np.argmax(scores))]
+
+
+class LocalClaimModel:
+    """
+    generate.jsonl / analysis_*.jsonl로 학습한 로컬 claim 생성/분석 모델.
+      - mode="markov": Markov chain으로 새 claim 텍스트 생성
+      - mode="sample": 학습 claim 중 하나를 그대로 선택
+    난수는 자체 random.Random(seed)를 사용하므로 시뮬레이션의 claim 추첨(random 모듈)에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, data_dir=_DIR, mode="markov", order=2, seed=0, generate_files=GENERATE_FILES,
+                 analysis_files=ANALYSIS_FILES):
+        if mode not in ["markov", "sample"]:
+            raise ValueError("Unknown local claim mode: " + mode)
+        self.mode = mode
+        self.rng = random.Random(seed)
+
+        analysis = []
+        for name in analysis_files:
+            path = os.path.join(data_dir, name)
+            if os.path.exists(path):
+                analysis.extend(load_pairs(path))
+        claims = [answer for name in generate_files if os.path.exists(os.path.join(data_dir, name))
+                  for _, answer in load_pairs(os.path.join(data_dir, name))]
+        claims.extend(claim_from_prompt(prompt) for prompt, _ in analysis)
+        if not claims or not analysis:
+            raise FileNotFoundError(f"claim JSONL 데이터가 없습니다: {data_dir}")
+
+        self.sampler = MarkovClaimSampler(claims, order=order)
+        texts = [claim_from_prompt(prompt) for prompt, _ in analysis]
+        answers = [json.loads(answer) for _, answer in analysis]
+        self.cause_model = NaiveBayesClassifier().fit(texts, [a["Cause"] for a in answers])
+        self.position_model = NaiveBayesClassifier().fit(texts, [a["Position"] for a in answers])
+
+    def generate(self):
+        if self.mode == "sample":
+            return self.rng.choice(self.sampler.texts)
+        return self.sampler.sample(self.rng)
+
+    def analyse(self, claim_text):
+        """
+        return: (cause, position)
+        """
+        return self.cause_model.predict(claim_text), self.position_model.predict(claim_text)
+
+    def generate_claim(self, message):
+        return self.generate()
+
+    def analysis_claim(self, message):
+        cause, position = self.analyse(claim_from_prompt(message[-1]["content"]))
+        # 파인튜닝된 분석 모델과 같은 응답 형식
+        return json.dumps({"Cause": cause, "Position": position})
+
+
+_model = None
+
+
+def get_model():
+    global _model
+    if _model is None:
+        _model = LocalClaimModel()
+    return _model
+
+
+def set_model(model):
+    global _model
+    _model = model
+
+
+# gpt_model.models와 같은 인터페이스
+def generate_claim(message):
+    return get_model().generate_claim(message)
+
+
+def analysis_claim(message):
+    return get_model().analysis_claim(message)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 claim 모델 학습/평가")
+    parser.add_argument("--data-dir", default=_DIR)
+    parser.add_argument("--mode", choices=["markov", "sample"], default="markov")
+    parser.add_argument("--samples", type=int, default=3, help="생성해서 출력할 claim 수")
+    args = parser.parse_args()
+
+    # analysis_train으로 학습, analysis_test로 정확도 평가
+    model = LocalClaimModel(args.data_dir, mode=args.mode, analysis_files=["analysis_train.jsonl"])
+    test = load_pairs(os.path.join(args.data_dir, "analysis_test.jsonl"))
+    hits = Counter()
+    for prompt, answer in test:
+        expected = json.loads(answer)
+        cause, position = model.analyse(claim_from_prompt(prompt))
+        hits["Cause"] += cause == expected["Cause"]
+        hits["Position"] += position == expected["Position"]
+    for key in ["Cause", "Position"]:
+        print(f"{key} accuracy: {hits[key]}/{len(test)}")
+
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        model.analyse(model.generate())
+    print(f"generate + analyse: {(time.perf_counter() - start) / n * 1e6:.1f} us/claim")
+    for _ in range(args.samples):
+        print("-", model.generate())
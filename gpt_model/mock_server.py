@@ -0,0 +1,110 @@
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# chat-completions endpoint를 흉내 내는 로컬 HTTP 서버 (claim_pipeline 테스트용)
+#   python -m gpt_model.mock_server --port 8000 --latency 0.5 --fail-rate 0.1
+#   python main.py --policy contextual --gpt-claim --claim-base-url http://127.0.0.1:8000/v1
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _load_samples():
+    claims, analyses = [], []
+    try:
+        with open(os.path.join(_DIR, "generate_sample.csv"), encoding="utf-8-sig") as f:
+            claims = [row["Claim"] for row in csv.DictReader(f)]
+        with open(os.path.join(_DIR, "analysis_sample.csv"), encoding="utf-8-sig") as f:
+            analyses = [json.dumps({"Cause": row["Cause"], "Position": row["Position"]}) for row in csv.DictReader(f)]
+    except OSError:
+        pass
+    return (claims or ["UNIT LEAKING HYDRAULIC OIL. REPLACED LIFT CYLINDER SEAL AND TESTED."],
+            analyses or ['{"Cause": "DEFECTIVE SEAL", "Position": "HYDRAULIC/LIFT CYLINDER"}'])
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+        request = json.loads(body or b"{}")
+        time.sleep(server.latency)
+        with server.lock:
+            server.request_count += 1
+            fail = server.rng.random() < server.fail_rate
+        if fail:
+            self._send(429, {"error": {"message": "rate limited (mock)"}}, {"Retry-After": "0.05"})
+            return
+
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        samples = server.analyses if '"Cause"' in prompt else server.claims
+        with server.lock:
+            content = server.rng.choice(samples)
+        self._send(200, {
+            "id": "chatcmpl-" + uuid.uuid4().hex[:12],
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()),
+                      "total_tokens": len(prompt.split()) + len(content.split())},
+        })
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=0, latency=0.2, fail_rate=0.0, seed=None):
+    server = ThreadingHTTPServer((host, port), MockChatHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.claims, server.analyses = _load_samples()
+    return server
+
+
+def start_mock_server(latency=0.2, fail_rate=0.0, seed=None, port=0):
+    """
+    백그라운드 thread에서 mock 서버를 띄웁니다. return: (server, base_url) — 종료는 server.shutdown()
+    """
+    server = make_server(port=port, latency=latency, fail_rate=fail_rate, seed=seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="chat-completions 호환 mock 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 응답 지연(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    mock = make_server(args.host, args.port, args.latency, args.fail_rate, args.seed)
+    print(f"mock chat-completions server: http://{args.host}:{args.port}/v1")
+    mock.serve_forever()
@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_DIR = ".claim_cache"
+CACHE_MODES = ["readwrite", "replay"]
+
+
+class ResponseCacheMiss(LookupError):
+    pass
+
+
+def make_response_key(model, messages, params, sample=0):
+    """
+    모델 ID / messages / 샘플링 파라미터 / sample 번호로 sha256 key를 만듭니다.
+    sample: 같은 요청을 몇 번째로 보냈는지 (temperature > 0인 요청을 여러 번 보내도 서로 다른 응답을 저장)
+    """
+    payload = {"model": model, "messages": messages, "params": params or {}, "sample": sample}
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def is_deterministic(params):
+    return (params or {}).get("temperature", 1) == 0
+
+
+class ResponseCache:
+    """
+    chat-completions 응답 content를 요청 내용 기준(content-addressed)으로 저장하는 디스크 캐시.
+      - mode="readwrite": 캐시에 있으면 재사용, 없으면 호출 후 저장
+      - mode="replay"   : 캐시에서만 응답 (없으면 ResponseCacheMiss, 네트워크 호출 없음)
+      - max_entries / max_bytes: 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU, 파일 mtime 기준)
+    temperature=0 요청(analysis_claim)은 같은 요청이면 항상 같은 항목을 사용하고,
+    그 외 요청(generate_claim)은 이 캐시 객체에서 같은 요청을 보낸 순서(sample 번호)별로 따로 저장합니다.
+    그래서 이전 실행과 같은 순서로 요청하면 같은 claim 순서가 그대로 재생됩니다.
+    같은 key의 요청이 동시에 캐시를 놓치면 하나만 실제로 호출하고 나머지는 그 결과를 기다립니다.
+      - call  : thread 간 (key별 threading.Event)
+      - acall : 같은 event loop의 task 간 (key별 asyncio.Future)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, mode="readwrite", max_entries=100000, max_bytes=None):
+        if mode not in CACHE_MODES:
+            raise ValueError("Unknown cache mode: " + mode)
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self._samples = {}
+        self._lock = threading.Lock()
+        # 호출 중인 key -> threading.Event (call) / asyncio.Future (acall)
+        self._inflight = {}
+        self._pending = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        entries = self._entries()
+        self._count = len(entries)
+        self._bytes = sum(size for _, size, _ in entries)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def request_key(self, model, messages, params):
+        """
+        요청 1회에 해당하는 key (temperature > 0이면 호출할 때마다 sample 번호가 1씩 증가)
+        """
+        sample = 0
+        if not is_deterministic(params):
+            base = make_response_key(model, messages, params)
+            with self._lock:
+                sample = self._samples.get(base, 0)
+                self._samples[base] = sample + 1
+        return make_response_key(model, messages, params, sample)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)["content"]
+        except (OSError, ValueError, KeyError):
+            self.stats["misses"] += 1
+            if self.mode == "replay":
+                raise ResponseCacheMiss(f"response not cached (replay mode): {key}")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return content
+
+    def put(self, key, model, messages, params, content):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existed = os.path.exists(path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "messages": messages, "params": params, "content": content,
+                       "created": time.time()}, f, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        if not existed:
+            self._count += 1
+            self._bytes += size
+        if ((self.max_entries is not None and self._count > self.max_entries) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            self.evict()
+
+    def call(self, fn, model, messages, params):
+        """
+        캐시를 거쳐 fn()을 호출합니다. fn: 인자 없이 응답 content를 반환하는 함수
+        """
+        key = self.request_key(model, messages, params)
+        while True:
+            content = self.get(key)
+            if content is not None:
+                return content
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # 다른 thread가 같은 key를 호출 중: 끝나면 캐시에서 다시 읽음 (그 호출이 실패했으면 직접 호출)
+            event.wait()
+        try:
+            content = fn()
+            self.put(key, model, messages, params, content)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+        return content
+
+    async def acall(self, coro_fn, key, model, messages, params):
+        """
+        call의 asyncio 버전. coro_fn: 인자 없이 응답 content를 반환하는 coroutine 함수
+        key는 request_key로 미리 정해서 넘깁니다. (sample 번호가 요청 순서대로 매겨지도록 첫 await 전에)
+        """
+        while True:
+            content = self.get(key)
+            if content is not None:
+                return content
+            future = self._pending.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future)
+            except Exception:
+                # 먼저 보낸 요청이 실패하면 이 요청이 직접 다시 시도
+                continue
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            content = await coro_fn()
+            self.put(key, model, messages, params, content)
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("request cancelled"))
+            # 기다리는 task가 없어도 'exception was never retrieved' 경고가 나지 않도록
+            future.exception()
+            raise
+        else:
+            future.set_result(content)
+        finally:
+            del self._pending[key]
+        return content
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(shard_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """
+        항목 수/전체 크기 상한을 넘으면 오래 사용하지 않은 항목부터 삭제합니다.
+        한 번에 상한의 90%까지 줄여 put마다 디렉터리를 다시 훑지 않도록 합니다.
+        return: 삭제한 항목 수
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        max_entries = None if self.max_entries is None else int(self.max_entries * 0.9)
+        max_bytes = None if self.max_bytes is None else int(self.max_bytes * 0.9)
+        removed = 0
+        while entries and ((max_entries is not None and len(entries) > max_entries) or
+                           (max_bytes is not None and total > max_bytes)):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+        self._count = len(entries)
+        self._bytes = total
+        self.stats["evicted"] += removed
+        return removed
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
+        self._count = 0
+        self._bytes = 0
+
+    def __len__(self):
+        return self._count
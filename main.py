@@ -3,83 +3,96 @@ import random
 import numpy as np
 
 from milp_solver import run_milp
-from data_generation import generate_orders
+from data_generation import generate_orders, generate_orders_fast
 from order_class import Order
-from reward import estimate_reward
-from config import NUM_TIMESTEPS, PENALTY, OUTSOURCE_FRACTION, CLAIM_PROCESSING_COST, CLAIM_PROB_PER_MODEL
-from plot_result import plot_thompson_mean, plot_gantt
+from order_table import OrderTable
+from reward import estimate_reward, configure_reward_stats, AVERAGE_REVENUE_MODES
+from config import NUM_TIMESTEPS, PENALTY, OUTSOURCE_FRACTION
+from plot_result import plot_thompson_mean, plot_gantt, plot_path
 from simulation import simulate
+from thompson_sampling import configure_tree_data
+from result_export import export_orders, export_timestep_logs, result_path, EXPORT_FORMATS
+from claim_engine import draw_order_claims
+from gpt_model.claim_prompts import attach_claim, fetch_claim, set_claim_backend, set_claim_pool, CLAIM_BACKENDS
 
 
 # Claim 생성 및 분석 콜백 (실시간 처리)
 def claim_callback(order):
-    from gpt_model.models import generate_claim, analysis_claim
-    prompt_gen = [{"role": "user",
-                   "content": "A claim Occurs. Generate a claim randomly. You must answer only about the claim. Exclude everything else from your response."}]
-    claim_text = generate_claim(prompt_gen)
-    prompt_analysis = [{"role": "user",
-                        "content": f'You must respond strictly in the following format. Exclude everything else from your response:{{"Position": "your answer about defect position", "Cause": "your answer about defect cause"}}\n"Claim: {claim_text}"'}]
-    analysis_text = analysis_claim(prompt_analysis)
-    if ";" in analysis_text:
-        parts = analysis_text.split(";")
-        cause = parts[0].replace("Cause:", "").strip() if "Cause:" in parts[0] else parts[0].strip()
-        position = parts[1].replace("Position:", "").strip() if len(parts) > 1 and "Position:" in parts[1] else parts[
-            1].strip()
-    else:
-        cause = analysis_text
-        position = ""
-    order.claim = claim_text
-    order.cause = cause
-    order.position = position
+    claim_text, analysis_text = fetch_claim()
+    attach_claim(order, claim_text, analysis_text)
     print(f"Order {order.order_no}: Claim generated and analyzed in simulation.")
 
 
-def run_simulation_policy(policy, use_gpt_claim=True):
-    all_orders_data = generate_orders()
-    orders = [Order(*row) for row in all_orders_data]
+def deferred_claim_callback(pending):
+    """
+    claim 텍스트 생성을 미루는 callback: 주문을 pending에 모아 두었다가 claim_pipeline으로 한 번에 처리합니다.
+    (claim 필드를 먼저 채워 두어 후처리 루프에서 같은 주문을 다시 추첨하지 않도록 함)
+    """
+    def callback(order):
+        order.claim = ""
+        pending.append(order)
+    return callback
+
+
+def evaluate_simulation_policy(policy, use_gpt_claim=True, engine="scan", batch_select=False, order_seed=None,
+                               order_table=False, telemetry=None, claim_pipeline=None):
+    """
+    시뮬레이션 정책을 실행하고 결과를 계산합니다. (출력/그래프/파일 저장 없음)
+    order_seed: 지정하면 numpy Generator 기반 generate_orders_fast(seed=order_seed)로 주문을 생성합니다.
+    order_table: True면 주문을 Order 객체 대신 columnar OrderTable의 view로 다룹니다.
+    telemetry: TelemetryRecorder (지정하면 timestep 로그를 sample 간격 / ring buffer로 보관, simulate 참고)
+    claim_pipeline: gpt_model.claim_pipeline.ClaimPipeline (지정하면 GPT claim을 주문마다 순차 호출하지 않고
+                    마지막에 한 번에 동시 요청)
+    return: dict(orders, th_history, timestep_logs, total_reward, total_revenue, total_claim_cost)
+    """
+    if order_seed is None:
+        all_orders_data = generate_orders()
+    else:
+        all_orders_data = generate_orders_fast(seed=order_seed)
+    if order_table:
+        orders = OrderTable.from_rows(all_orders_data).orders()
+    else:
+        orders = [Order(*row) for row in all_orders_data]
 
     # simulation 함수에 use_gpt_claim 여부에 따라 claim_callback 전달
-    claim_cb = claim_callback if use_gpt_claim else None
-    timestep_data, th_history, _ = simulate(
-        orders, num_timesteps=NUM_TIMESTEPS, random_policy=(policy == "random"), policy=policy, claim_callback=claim_cb
+    pending_claims = []
+    if not use_gpt_claim:
+        claim_cb = None
+    elif claim_pipeline is not None:
+        claim_cb = deferred_claim_callback(pending_claims)
+    else:
+        claim_cb = claim_callback
+    timestep_logs, th_history, _ = simulate(
+        orders, num_timesteps=NUM_TIMESTEPS, random_policy=(policy == "random"), policy=policy, claim_callback=claim_cb,
+        engine=engine, batch_select=batch_select, telemetry=telemetry
     )
 
-    total_claim_cost = 0.0
-    total_claim_cost = 0.0
+    # simulation에서 claim 처리되지 않은 Accept/Outsource 주문의 claim 추첨
+    undrawn = []
     for o in orders:
         if o.final_action in ["Accept", "Outsource"]:
             if not hasattr(o, "claim"):
-                claim_prob = CLAIM_PROB_PER_MODEL.get(o.model_name, 0.0)
-                if use_gpt_claim:
-                    # GPT claim 기능 사용: 실제 GPT 호출하여 claim 내용 생성 및 분석
-                    if random.random() < claim_prob:
-                        total_claim_cost += CLAIM_PROCESSING_COST
-                        CLAIM_PROB_PER_MODEL[o.model_name] = min(1.0, claim_prob + 0.01)
-                        o.claim_occurred = True
-                        claim_callback(o)
-                    else:
-                        CLAIM_PROB_PER_MODEL[o.model_name] = max(0.0, claim_prob - 0.005)
-                        o.claim_occurred = False
-                        o.claim = "N/A"
-                        o.cause = "N/A"
-                        o.position = "N/A"
-                else:
-                    # GPT claim 기능 미사용: 단순히 claim 발생 여부와 비용 반영, claim 관련 필드는 "N/A"
-                    if random.random() < claim_prob:
-                        total_claim_cost += CLAIM_PROCESSING_COST
-                        CLAIM_PROB_PER_MODEL[o.model_name] = min(1.0, claim_prob + 0.01)
-                        o.claim_occurred = True
-                    else:
-                        CLAIM_PROB_PER_MODEL[o.model_name] = max(0.0, claim_prob - 0.005)
-                        o.claim_occurred = False
-                    o.claim = "N/A"
-                    o.cause = "N/A"
-                    o.position = "N/A"
+                undrawn.append(o)
         else:
             o.claim = "N/A"
             o.cause = "N/A"
             o.position = "N/A"
             o.claim_occurred = False
+    flags, total_claim_cost = draw_order_claims(undrawn)
+    for o, flag in zip(undrawn, flags):
+        o.claim_occurred = bool(flag)
+        if flag and use_gpt_claim:
+            # GPT claim 기능 사용: 실제 GPT 호출하여 claim 내용 생성 및 분석
+            claim_cb(o)
+        else:
+            # claim 미발생 또는 GPT claim 기능 미사용: claim 관련 필드는 "N/A"
+            o.claim = "N/A"
+            o.cause = "N/A"
+            o.position = "N/A"
+
+    if pending_claims:
+        from gpt_model.claim_pipeline import fill_claims
+        fill_claims(pending_claims, claim_pipeline)
 
     total_reward = 0.0
     for o in orders:
@@ -99,54 +112,82 @@ def run_simulation_policy(policy, use_gpt_claim=True):
             total_revenue += actual_revenue
     total_revenue -= total_claim_cost
 
-    print(f"[{policy.capitalize()} Policy] Total Reward = {total_reward}")
-    print(f"[{policy.capitalize()} Policy] Total Revenue (after claim cost) = {total_revenue}")
+    return {
+        "orders": orders,
+        "th_history": th_history,
+        "timestep_logs": timestep_logs,
+        "total_reward": total_reward,
+        "total_revenue": total_revenue,
+        "total_claim_cost": total_claim_cost,
+    }
+
+
+def run_simulation_policy(policy, use_gpt_claim=True, engine="scan", batch_select=False, order_seed=None,
+                          order_table=False, output_format="csv", timestep_log=False, telemetry=None,
+                          telemetry_dump=None, plot_dir=None, claim_pipeline=None):
+    """
+    plot_dir: 지정하면 그래프를 화면에 띄우지 않고 이 디렉터리에 PNG로 저장합니다.
+    """
+    result = evaluate_simulation_policy(policy, use_gpt_claim=use_gpt_claim, engine=engine, batch_select=batch_select,
+                                        order_seed=order_seed, order_table=order_table, telemetry=telemetry,
+                                        claim_pipeline=claim_pipeline)
+    orders = result["orders"]
+    th_history = result["th_history"]
+
+    print(f"[{policy.capitalize()} Policy] Total Reward = {result['total_reward']}")
+    print(f"[{policy.capitalize()} Policy] Total Revenue (after claim cost) = {result['total_revenue']}")
 
     try:
-        plot_thompson_mean(th_history)
+        plot_thompson_mean(th_history, output_path=plot_path(plot_dir, f"thompson_mean_{policy}"))
     except ValueError as e:
         print("plot_thompson_mean skipped due to error:", e)
 
-    plot_gantt(orders, NUM_TIMESTEPS, title=f"{policy.capitalize()} Policy - Gantt")
+    plot_gantt(orders, NUM_TIMESTEPS, title=f"{policy.capitalize()} Policy - Gantt",
+               output_path=plot_path(plot_dir, f"gantt_{policy}"))
 
-    order_records = []
-    for o in orders:
-        record = {
-            "OrderNo": o.order_no,
-            "OrderDate": o.order_date,
-            "DecisionDueDate": o.decision_due_date,
-            "ModelName": o.model_name,
-            "ProcessingTime": o.processing_time,
-            "DueDate": o.due_date,
-            "Revenue": o.revenue,
-            "FinalAction": o.final_action,
-            "StartTime": o.start_time,
-            "FinishTime": o.finish_time,
-            "CalculatedRevenue": o.revenue if o.final_action == "Accept" and (
-                        o.finish_time is not None and o.finish_time <= o.due_date)
-            else (o.revenue - PENALTY if o.final_action == "Accept"
-                  else (o.revenue * OUTSOURCE_FRACTION if o.final_action == "Outsource" else "N/A")),
-            "ClaimOccurred": "Yes" if (
-                        o.final_action in ["Accept", "Outsource"] and getattr(o, "claim_occurred", False))
-            else ("No" if o.final_action in ["Accept", "Outsource"] else "N/A"),
-            "Claim": o.claim if hasattr(o, "claim") else "N/A",
-            "Cause": o.cause if hasattr(o, "cause") else "N/A",
-            "Position": o.position if hasattr(o, "position") else "N/A"
-        }
-        order_records.append(record)
-
-    import pandas as pd
-    df = pd.DataFrame(order_records)
-    df.to_csv(f"order_data_{policy}.csv", index=False)
-    print(f"order_data_{policy}.csv 파일이 저장되었습니다.")
-
-
-def run_policy(policy, use_gpt_claim=True):
-    if policy == "milp":
+    path = result_path(f"order_data_{policy}", output_format)
+    export_orders(orders, path, fmt=output_format)
+    print(f"{path} 파일이 저장되었습니다.")
+
+    if timestep_log:
+        path = result_path(f"timestep_log_{policy}", output_format)
+        export_timestep_logs(result["timestep_logs"], path, fmt=output_format)
+        print(f"{path} 파일이 저장되었습니다.")
+
+    if telemetry is not None:
+        print("Telemetry:", telemetry.summary())
+        if telemetry_dump:
+            telemetry.dump(telemetry_dump)
+            print(f"{telemetry_dump} 파일이 저장되었습니다.")
+
+
+def run_policy(policy, use_gpt_claim=True, engine="scan", replications=1, batch_select=False, milp_backend="cbc",
+               epoch=10, lookahead=40, milp_bucket=None, milp_method="exact", time_limit=None, mip_gap=None,
+               threads=None, milp_cache=None, order_seed=None, order_table=False, output_format="csv",
+               timestep_log=False, telemetry=None, telemetry_dump=None, plot_dir=None, claim_pipeline=None):
+    if replications > 1:
+        if policy not in ["random", "contextual"]:
+            raise ValueError("Batch replications support only random/contextual policies: " + policy)
+        from batch_simulation import run_batch_policy
+        if order_seed is None:
+            run_batch_policy(policy, replications)
+        else:
+            run_batch_policy(policy, replications, seed=order_seed, generator="numpy")
+    elif policy == "milp":
         from milp_solver import run_milp
-        run_milp(use_gpt_claim=use_gpt_claim)
-    elif policy in ["random", "contextual", "treebootstrap"]:
-        run_simulation_policy(policy, use_gpt_claim=use_gpt_claim)
+        run_milp(use_gpt_claim=use_gpt_claim, backend=milp_backend, bucket=milp_bucket, method=milp_method,
+                 time_limit=time_limit, mip_gap=mip_gap, threads=threads, cache=milp_cache,
+                 output_format=output_format, plot_dir=plot_dir, claim_pipeline=claim_pipeline)
+    elif policy == "milp_rolling":
+        from milp_solver import run_milp_rolling
+        run_milp_rolling(use_gpt_claim=use_gpt_claim, epoch=epoch, lookahead=lookahead, backend=milp_backend,
+                         time_limit=time_limit, mip_gap=mip_gap, threads=threads, output_format=output_format,
+                         plot_dir=plot_dir, claim_pipeline=claim_pipeline)
+    elif policy in ["random", "contextual", "treebootstrap", "online_treebootstrap", "lints"]:
+        run_simulation_policy(policy, use_gpt_claim=use_gpt_claim, engine=engine, batch_select=batch_select,
+                              order_seed=order_seed, order_table=order_table, output_format=output_format,
+                              timestep_log=timestep_log, telemetry=telemetry, telemetry_dump=telemetry_dump,
+                              plot_dir=plot_dir, claim_pipeline=claim_pipeline)
     else:
         raise ValueError("Unknown policy: " + policy)
 
@@ -158,9 +199,9 @@ def main():
     parser.add_argument(
         "--policy",
         type=str,
-        choices=["random", "contextual", "treebootstrap", "milp"],
+        choices=["random", "contextual", "treebootstrap", "online_treebootstrap", "lints", "milp", "milp_rolling"],
         default="contextual",
-        help="실행할 정책: random, contextual, treebootstrap, milp 중 선택"
+        help="실행할 정책: random, contextual, treebootstrap, online_treebootstrap, lints(linear Thompson sampling), milp, milp_rolling(rolling-horizon MILP) 중 선택"
     )
     parser.add_argument(
         "--no-gpt-claim",
@@ -168,13 +209,309 @@ def main():
         action="store_false",
         help="Disable GPT-based claim generation and analysis during simulation."
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["scan", "event"],
+        default="scan",
+        help="시뮬레이션 엔진: scan(매 timestep 전체 주문 순회) 또는 event(이벤트 기반, idle 구간 건너뜀)"
+    )
+    parser.add_argument(
+        "--replications",
+        type=int,
+        default=1,
+        help="2 이상이면 random/contextual 정책을 벡터화된 batch 모드로 여러 번 반복 실행하고 통계를 출력합니다."
+    )
+    parser.add_argument(
+        "--batch-select",
+        action="store_true",
+        help="timestep마다 결정이 필요한 주문 전체의 액션을 한 번에 선택합니다. (정책 학습/샘플링을 액션당 1회로 줄임)"
+    )
+    parser.add_argument(
+        "--milp-backend",
+        type=str,
+        choices=["cbc", "highs"],
+        default="cbc",
+        help="MILP solver: cbc(PuLP 모델, reference) 또는 highs(sparse 행렬로 직접 생성, scipy.optimize.milp)"
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="milp/milp_rolling: solve 1회당 시간 제한(초)"
+    )
+    parser.add_argument(
+        "--mip-gap",
+        type=float,
+        default=None,
+        help="milp/milp_rolling: 상대 MIP gap 허용치 (예: 0.01)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="milp/milp_rolling: solver thread 수 (cbc만 지원)"
+    )
+    parser.add_argument(
+        "--milp-cache",
+        type=str,
+        default=None,
+        help="milp: 풀이 결과 캐시 디렉터리 (같은 주문 데이터/설정이면 저장된 결과를 재사용, 예: .milp_cache)"
+    )
+    parser.add_argument(
+        "--milp-cache-size",
+        type=int,
+        default=256,
+        help="milp 캐시 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 삭제)"
+    )
+    parser.add_argument(
+        "--milp-cache-max-age",
+        type=float,
+        default=None,
+        help="milp 캐시 항목 유효 기간(초)"
+    )
+    parser.add_argument(
+        "--milp-method",
+        type=str,
+        choices=["exact", "heuristic"],
+        default="exact",
+        help="milp: exact(MILP 풀이) 또는 heuristic(LP relaxation 상한 + greedy/local search 스케줄, gap 출력)"
+    )
+    parser.add_argument(
+        "--milp-bucket",
+        type=int,
+        default=None,
+        help="milp: 시작 시점을 이 간격(timestep)의 bucket으로 묶어 먼저 풀고 Accept된 구간만 세분화합니다. (예: 5, 10)"
+    )
+    parser.add_argument(
+        "--epoch",
+        type=int,
+        default=10,
+        help="milp_rolling: 재계획 간격 (timestep)"
+    )
+    parser.add_argument(
+        "--lookahead",
+        type=int,
+        default=40,
+        help="milp_rolling: 재계획 시 고려하는 시작 시점 범위 (timestep)"
+    )
+    parser.add_argument(
+        "--history-size",
+        type=int,
+        default=None,
+        help="treebootstrap 계열 정책이 액션별로 보관할 최대 관측치 수 (기본: 제한 없음)"
+    )
+    parser.add_argument(
+        "--history-eviction",
+        type=str,
+        choices=["window", "reservoir"],
+        default="window",
+        help="최대 관측치 수 도달 시 eviction 방식: window(최근 관측치 유지) 또는 reservoir(균등 표본 유지)"
+    )
+    parser.add_argument(
+        "--average-revenue",
+        type=str,
+        choices=AVERAGE_REVENUE_MODES,
+        default="cumulative",
+        help="reward 계산의 평균 revenue: cumulative(전체 평균), ewma(지수이동평균), window(최근 주문 평균)"
+    )
+    parser.add_argument(
+        "--revenue-ewma-alpha",
+        type=float,
+        default=0.1,
+        help="--average-revenue ewma의 alpha (0~1]"
+    )
+    parser.add_argument(
+        "--revenue-window",
+        type=int,
+        default=50,
+        help="--average-revenue window의 최근 주문 수"
+    )
+    parser.add_argument(
+        "--order-seed",
+        type=int,
+        default=None,
+        help="지정하면 numpy Generator 기반 주문 생성기(generate_orders_fast)를 이 seed로 사용합니다. (시뮬레이션 정책)"
+    )
+    parser.add_argument(
+        "--order-table",
+        action="store_true",
+        help="주문을 Order 객체 대신 columnar OrderTable(structured array)로 보관합니다. (시뮬레이션 정책)"
+    )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        choices=sorted(set(EXPORT_FORMATS.values())),
+        default="csv",
+        help="order_data_<policy> 결과 파일 형식 (parquet/arrow는 pyarrow 필요)"
+    )
+    parser.add_argument(
+        "--timestep-log",
+        action="store_true",
+        help="시뮬레이션 정책의 timestep별 로그를 timestep_log_<policy> 파일로 저장합니다."
+    )
+    parser.add_argument(
+        "--telemetry-interval",
+        type=int,
+        default=None,
+        help="timestep 로그 / Thompson mean을 이 간격(timestep)마다만 기록합니다. (시뮬레이션 정책)"
+    )
+    parser.add_argument(
+        "--telemetry-retention",
+        type=int,
+        default=None,
+        help="최근 N개 timestep 로그 sample만 보관 (ring buffer)"
+    )
+    parser.add_argument(
+        "--telemetry-dump",
+        type=str,
+        default=None,
+        help="telemetry sample을 압축 npz 파일로 저장할 경로 (예: telemetry.npz)"
+    )
+    parser.add_argument(
+        "--plot-dir",
+        type=str,
+        default=None,
+        help="그래프를 화면에 띄우지 않고 이 디렉터리에 PNG로 저장합니다. (디스플레이 없는 batch 실행용)"
+    )
+    parser.add_argument(
+        "--gpt-claim",
+        dest="use_gpt_claim",
+        action="store_true",
+        help="Enable GPT-based claim generation and analysis."
+    )
+    parser.add_argument(
+        "--claim-backend",
+        choices=list(CLAIM_BACKENDS),
+        default="openai",
+        help="claim 생성/분석 모델: openai (파인튜닝 모델 API) / local (JSONL로 학습한 로컬 모델, 네트워크 없음)"
+    )
+    parser.add_argument(
+        "--claim-concurrency",
+        type=int,
+        default=None,
+        help="GPT claim 요청을 asyncio pipeline으로 모아 이 개수만큼 동시에 보냅니다."
+    )
+    parser.add_argument(
+        "--claim-rate",
+        type=float,
+        default=None,
+        help="GPT claim 요청 rate limit (초당 요청 수, token bucket)"
+    )
+    parser.add_argument(
+        "--claim-base-url",
+        type=str,
+        default=None,
+        help="chat-completions 호환 endpoint 주소 (예: gpt_model.mock_server의 http://127.0.0.1:8000/v1)"
+    )
+    parser.add_argument(
+        "--claim-pool-size",
+        type=int,
+        default=0,
+        help="background thread로 미리 생성해 둘 claim 수 (0이면 사용 안 함)"
+    )
+    parser.add_argument(
+        "--claim-pool-low-water",
+        type=int,
+        default=None,
+        help="pool에 남은 claim이 이 개수 이하가 되면 다시 채움 (기본: pool 크기의 1/4)"
+    )
+    parser.add_argument(
+        "--claim-cache",
+        type=str,
+        default=None,
+        help="GPT claim 응답 디스크 캐시 디렉터리 (예: .claim_cache)"
+    )
+    parser.add_argument(
+        "--claim-cache-size",
+        type=int,
+        default=100000,
+        help="GPT claim 응답 캐시 최대 항목 수 (LRU)"
+    )
+    parser.add_argument(
+        "--claim-cache-max-bytes",
+        type=int,
+        default=None,
+        help="GPT claim 응답 캐시 최대 전체 크기 (byte, LRU, 기본: 제한 없음)"
+    )
+    parser.add_argument(
+        "--claim-replay",
+        action="store_true",
+        help="GPT claim 응답을 캐시에서만 재생 (캐시에 없으면 오류, 네트워크 호출 없음)"
+    )
+    parser.add_argument(
+        "--history-mmap-dir",
+        type=str,
+        default=None,
+        help="관측치 배열을 memory-mapped 파일로 둘 디렉터리"
+    )
     parser.set_defaults(use_gpt_claim=False)
     args = parser.parse_args()
 
+    configure_reward_stats(args.average_revenue, ewma_alpha=args.revenue_ewma_alpha, window=args.revenue_window)
+    if args.history_size is not None or args.history_mmap_dir is not None:
+        configure_tree_data(max_size=args.history_size, eviction=args.history_eviction,
+                            mmap_dir=args.history_mmap_dir)
+
+    telemetry = None
+    if args.telemetry_interval or args.telemetry_retention or args.telemetry_dump:
+        from telemetry import TelemetryRecorder
+        telemetry = TelemetryRecorder(sample_interval=args.telemetry_interval or 1,
+                                      max_samples=args.telemetry_retention)
+
+    set_claim_backend(args.claim_backend)
+    claim_cache = None
+    if args.use_gpt_claim and args.claim_backend == "openai" and (args.claim_cache or args.claim_replay):
+        from gpt_model.response_cache import ResponseCache, DEFAULT_CACHE_DIR
+        from gpt_model.models import set_response_cache
+        claim_cache = ResponseCache(args.claim_cache or DEFAULT_CACHE_DIR,
+                                    mode="replay" if args.claim_replay else "readwrite",
+                                    max_entries=args.claim_cache_size, max_bytes=args.claim_cache_max_bytes)
+        set_response_cache(claim_cache)
+
+    claim_pipeline = None
+    if args.use_gpt_claim and args.claim_backend == "openai" and (
+            args.claim_concurrency or args.claim_rate or args.claim_base_url):
+        from gpt_model.claim_pipeline import ClaimPipeline
+        claim_pipeline = ClaimPipeline(base_url=args.claim_base_url, concurrency=args.claim_concurrency or 8,
+                                       rate=args.claim_rate, cache=claim_cache)
+
+    claim_pool = None
+    if args.use_gpt_claim and args.claim_pool_size:
+        from gpt_model.claim_pool import ClaimPool, pipeline_producer
+        low_water = args.claim_pool_low_water
+        if low_water is None:
+            low_water = args.claim_pool_size // 4
+        if claim_pipeline is not None:
+            # pipeline은 pool을 채우는 데 사용 (simulation 쪽은 pool에서 바로 꺼냄)
+            claim_pool = ClaimPool(args.claim_pool_size, low_water, producer=pipeline_producer(claim_pipeline),
+                                   batch=claim_pipeline.concurrency)
+            claim_pipeline = None
+        else:
+            claim_pool = ClaimPool(args.claim_pool_size, low_water)
+        set_claim_pool(claim_pool.start())
+
+    milp_cache = None
+    if args.milp_cache:
+        from milp_cache import MilpSolutionCache
+        milp_cache = MilpSolutionCache(args.milp_cache, max_entries=args.milp_cache_size,
+                                       max_age=args.milp_cache_max_age)
+
     random.seed(42)
     np.random.seed(42)
 
-    run_policy(args.policy, use_gpt_claim=args.use_gpt_claim)
+    run_policy(args.policy, use_gpt_claim=args.use_gpt_claim, engine=args.engine, replications=args.replications,
+               batch_select=args.batch_select, milp_backend=args.milp_backend, epoch=args.epoch,
+               lookahead=args.lookahead, milp_bucket=args.milp_bucket, milp_method=args.milp_method,
+               time_limit=args.time_limit, mip_gap=args.mip_gap, threads=args.threads, milp_cache=milp_cache,
+               order_seed=args.order_seed, order_table=args.order_table, output_format=args.output_format,
+               timestep_log=args.timestep_log, telemetry=telemetry, telemetry_dump=args.telemetry_dump,
+               plot_dir=args.plot_dir, claim_pipeline=claim_pipeline)
+    if claim_pool is not None:
+        claim_pool.close()
+        print(f"Claim pool: {claim_pool.stats}")
+    if claim_cache is not None:
+        print(f"Claim response cache: {claim_cache.stats} ({len(claim_cache)} entries)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
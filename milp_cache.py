@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import time
+
+from config import MACHINE_CAPACITY, PENALTY, OUTSOURCE_FRACTION
+
+DEFAULT_CACHE_DIR = ".milp_cache"
+
+
+def make_cache_key(orders_data, horizon, solver=None):
+    """
+    주문 데이터(generate_orders 결과 행)와 결과에 영향을 주는 설정으로 sha256 key를 만듭니다.
+    solver: 풀이 방식/옵션 등 결과에 영향을 주는 값 dict (예: method, backend, bucket, time_limit)
+    """
+    payload = {
+        "orders": [list(row) for row in orders_data],
+        "config": {
+            "MACHINE_CAPACITY": MACHINE_CAPACITY,
+            "PENALTY": PENALTY,
+            "OUTSOURCE_FRACTION": OUTSOURCE_FRACTION,
+            "horizon": horizon,
+        },
+        "solver": solver or {},
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class MilpSolutionCache:
+    """
+    MILP 풀이 결과(주문별 액션/시작 시점)를 key별 JSON 파일로 저장하는 디스크 캐시.
+      - max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제, LRU)
+      - max_bytes  : 전체 파일 크기 상한 (초과 시 LRU 순으로 삭제)
+      - max_age    : 저장 후 이 시간(초)이 지난 항목은 만료
+    파일의 mtime을 마지막 사용 시각으로 사용합니다.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=256, max_bytes=None, max_age=None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key):
+        """
+        저장된 항목 dict를 반환합니다. (없거나 만료되었으면 None)
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age is not None and time.time() - entry.get("created", 0) > self.max_age:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, entry):
+        entry = dict(entry)
+        entry.setdefault("created", time.time())
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        # 여러 프로세스가 동시에 써도 깨진 파일이 보이지 않도록 rename으로 교체
+        os.replace(tmp_path, path)
+        self.evict()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """
+        만료 항목을 지우고, 항목 수/전체 크기 상한을 넘으면 오래 사용하지 않은 항목부터 삭제합니다.
+        return: 삭제한 항목 수
+        """
+        entries = self._entries()
+        removed = 0
+        if self.max_age is not None:
+            now = time.time()
+            kept = []
+            for mtime, size, path in entries:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        created = json.load(f).get("created", mtime)
+                except (OSError, ValueError):
+                    created = 0
+                if now - created > self.max_age:
+                    self._remove(path)
+                    removed += 1
+                else:
+                    kept.append((mtime, size, path))
+            entries = kept
+
+        total = sum(size for _, size, _ in entries)
+        while entries and ((self.max_entries is not None and len(entries) > self.max_entries) or
+                           (self.max_bytes is not None and total > self.max_bytes)):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def __len__(self):
+        return len(self._entries())
@@ -1,41 +1,155 @@
+import os
+import tempfile
+import time
 import pulp
-import pandas as pd
-import random
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import milp, LinearConstraint, Bounds
+from scipy.sparse import coo_matrix
 
 from data_generation import generate_orders
 from order_class import Order
-from config import NUM_TIMESTEPS, MACHINE_CAPACITY, PENALTY, OUTSOURCE_FRACTION, CLAIM_PROCESSING_COST, \
-    CLAIM_PROB_PER_MODEL
+from config import NUM_TIMESTEPS, MACHINE_CAPACITY, PENALTY, OUTSOURCE_FRACTION
 from reward import estimate_reward
-from plot_result import plot_gantt
+from plot_result import plot_gantt, plot_path
+from milp_cache import MilpSolutionCache, make_cache_key
+from result_export import export_orders, result_path
+from claim_engine import draw_order_claims
+from gpt_model.claim_prompts import attach_claim, fetch_claim
 
 
-def solve_milp(use_gpt_claim=True):
-    orders_data = generate_orders()
-    orders = [Order(*row) for row in orders_data]
+MILP_ACTIONS = ["Accept", "Outsource", "Reject", "Postpone"]
+MILP_BACKENDS = ["cbc", "highs"]
+MILP_METHODS = ["exact", "heuristic"]
+
+
+class SolveStats:
+    """
+    solve 1회의 통계 기록 (모델 생성/풀이 시간, 모델 크기, incumbent 목적함수 값, best bound, 상태)
+    best_bound는 최대화 문제의 상한입니다.
+    """
+
+    def __init__(self, backend, status, build_time, solve_time, num_variables, num_constraints,
+                 objective=None, best_bound=None):
+        self.backend = backend
+        self.status = status
+        self.build_time = build_time
+        self.solve_time = solve_time
+        self.num_variables = num_variables
+        self.num_constraints = num_constraints
+        self.objective = objective
+        self.best_bound = best_bound
+
+    @property
+    def gap(self):
+        """
+        (best_bound - objective) / |best_bound|
+        """
+        if self.objective is None or self.best_bound is None or self.best_bound == 0:
+            return None
+        return (self.best_bound - self.objective) / abs(self.best_bound)
+
+    def as_dict(self):
+        return {
+            "Backend": self.backend,
+            "Status": self.status,
+            "BuildTime": self.build_time,
+            "SolveTime": self.solve_time,
+            "NumVariables": self.num_variables,
+            "NumConstraints": self.num_constraints,
+            "Objective": self.objective,
+            "BestBound": self.best_bound,
+            "Gap": self.gap,
+        }
+
+    def __repr__(self):
+        return f"SolveStats({self.as_dict()})"
+
+
+def _summarize_stats(stats):
+    """
+    여러 번의 solve 통계를 합쳐 출력용 문자열로 만듭니다.
+    """
+    if not stats:
+        return "no solver calls"
+    last = stats[-1]
+    return (f"{len(stats)} solve(s), build {sum(st.build_time for st in stats):.3f}s, "
+            f"solve {sum(st.solve_time for st in stats):.3f}s, last: status={last.status}, "
+            f"vars={last.num_variables}, constraints={last.num_constraints}, objective={last.objective}, "
+            f"best bound={last.best_bound}, gap={last.gap}")
+
+
+def _feasible_times(orders, T):
+    """
+    주문별 Accept 시 가능한 시작 시점 목록 (order_date ~ T - processing_time)
+    """
+    feasible_times = {}
+    for i, o in enumerate(orders):
+        start_min = o.order_date
+        start_max = T - o.processing_time
+        feasible_times[i] = list(range(start_min, start_max + 1)) if start_max >= start_min else []
+    return feasible_times
+
+
+def _action_revenue(o, action, start=None):
+    # Revenue 파라미터 (risk 할인 없이)
+    if action == "Accept":
+        finish = start + o.processing_time
+        return o.revenue if finish <= o.due_date else o.revenue - PENALTY
+    if action == "Outsource":
+        return o.revenue * OUTSOURCE_FRACTION
+    if action == "Reject":
+        return -0.1 * o.revenue
+    if action == "Postpone":
+        return -0.05 * o.revenue
+    return 0
+
+
+def _revenue_params(orders, feasible_times):
+    r_accept = {}
+    for i, o in enumerate(orders):
+        for t in feasible_times[i]:
+            r_accept[(i, t)] = _action_revenue(o, "Accept", t)
+
+    r_outsource, r_reject, r_postpone = {}, {}, {}
+    for i, o in enumerate(orders):
+        r_outsource[i] = _action_revenue(o, "Outsource")
+        r_reject[i] = _action_revenue(o, "Reject")
+        r_postpone[i] = _action_revenue(o, "Postpone")
+    return {"Accept": r_accept, "Outsource": r_outsource, "Reject": r_reject, "Postpone": r_postpone}
+
+
+def _allow_postpone(orders, T):
+    # decision due date 내에 반드시 action 선택하도록 Postpone 비허용
+    return [o.decision_due_date > T for o in orders]
+
+
+def build_pulp_model(orders, T, feasible_times, revenue, allow_postpone=None, capacity=None):
+    """
+    PuLP 모델 생성 (CBC용 reference 경로)
+    capacity: timestep별 가용 머신 수 (None이면 모든 timestep에서 MACHINE_CAPACITY)
+    return: (prob, x, y)
+    """
+    if allow_postpone is None:
+        allow_postpone = _allow_postpone(orders, T)
+    if capacity is None:
+        capacity = [MACHINE_CAPACITY] * T
     num_orders = len(orders)
-    T = NUM_TIMESTEPS
-    ACTIONS = ["Accept", "Outsource", "Reject", "Postpone"]
 
     prob = pulp.LpProblem("Order_Scheduling", pulp.LpMaximize)
 
     # 주문별 액션 결정 변수 생성
     x = {}
     for i, o in enumerate(orders):
-        for a in ACTIONS:
+        for a in MILP_ACTIONS:
             x[(i, a)] = pulp.LpVariable(f"x_{i}_{a}", cat="Binary")
-        prob += pulp.lpSum([x[(i, a)] for a in ACTIONS]) == 1, f"OneAction_order_{i}"
-        # decision due date 내에 반드시 action 선택하도록 Postpone 비허용
-        if o.decision_due_date <= T:
+        prob += pulp.lpSum([x[(i, a)] for a in MILP_ACTIONS]) == 1, f"OneAction_order_{i}"
+        if not allow_postpone[i]:
             prob += x[(i, "Postpone")] == 0, f"DisallowPostpone_order_{i}"
 
     # Accept 선택 시 스케줄링 변수 생성
     y = {}
-    feasible_times = {}
     for i, o in enumerate(orders):
-        start_min = o.order_date
-        start_max = T - o.processing_time
-        feasible_times[i] = list(range(start_min, start_max + 1)) if start_max >= start_min else []
         for t in feasible_times[i]:
             y[(i, t)] = pulp.LpVariable(f"y_{i}_{t}", cat="Binary")
         if feasible_times[i]:
@@ -43,26 +157,14 @@ def solve_milp(use_gpt_claim=True):
         else:
             prob += x[(i, "Accept")] == 0, f"NoAccept_possible_{i}"
 
-    # Revenue 파라미터 (risk 할인 없이)
-    r_accept = {}
-    for i, o in enumerate(orders):
-        for t in feasible_times[i]:
-            finish = t + o.processing_time
-            r_accept[(i, t)] = o.revenue if finish <= o.due_date else o.revenue - PENALTY
-
-    r_outsource, r_reject, r_postpone = {}, {}, {}
-    for i, o in enumerate(orders):
-        r_outsource[i] = o.revenue * OUTSOURCE_FRACTION
-        r_reject[i] = -0.1 * o.revenue
-        r_postpone[i] = -0.05 * o.revenue
-
+    r_accept = revenue["Accept"]
     objective = []
     for i in range(num_orders):
         if feasible_times[i]:
             objective.append(pulp.lpSum([r_accept[(i, t)] * y[(i, t)] for t in feasible_times[i]]))
-        objective.append(r_outsource[i] * x[(i, "Outsource")])
-        objective.append(r_reject[i] * x[(i, "Reject")])
-        objective.append(r_postpone[i] * x[(i, "Postpone")])
+        objective.append(revenue["Outsource"][i] * x[(i, "Outsource")])
+        objective.append(revenue["Reject"][i] * x[(i, "Reject")])
+        objective.append(revenue["Postpone"][i] * x[(i, "Postpone")])
     prob += pulp.lpSum(objective), "Total_Revenue"
 
     for tau in range(T):
@@ -71,20 +173,74 @@ def solve_milp(use_gpt_claim=True):
             for t in feasible_times[i]:
                 if t <= tau < t + o.processing_time:
                     capacity_expr.append(y[(i, t)])
-        prob += pulp.lpSum(capacity_expr) <= MACHINE_CAPACITY, f"Capacity_time_{tau}"
+        prob += pulp.lpSum(capacity_expr) <= capacity[tau], f"Capacity_time_{tau}"
 
-    solver = pulp.PULP_CBC_CMD(msg=1)
-    prob.solve(solver)
+    return prob, x, y
+
+
+def _set_warm_start(orders, feasible_times, x, y, warm_start):
+    """
+    warm_start: 주문 index -> (액션, 시작 시점). 이전 계획을 CBC 초기해로 지정합니다.
+    """
+    for i in range(len(orders)):
+        action, start = warm_start.get(i, (None, None))
+        if action == "Accept" and start not in feasible_times[i]:
+            action = None
+        for a in MILP_ACTIONS:
+            x[(i, a)].setInitialValue(1 if a == action else 0)
+        for t in feasible_times[i]:
+            y[(i, t)].setInitialValue(1 if action == "Accept" and t == start else 0)
+
+
+def _parse_cbc_log(path):
+    """
+    CBC 로그에서 종료 사유(Result 줄)와 best bound를 읽습니다.
+    """
+    result, bound = None, None
+    with open(path) as f:
+        for line in f:
+            if line.startswith("Result - "):
+                result = line[len("Result - "):].strip()
+            elif line.startswith("Upper bound:") or line.startswith("Lower bound:"):
+                try:
+                    bound = float(line.split(":", 1)[1])
+                except ValueError:
+                    pass
+    return result, bound
 
-    print("MILP Status:", pulp.LpStatus[prob.status])
-    optimal_revenue = pulp.value(prob.objective)
-    print("Optimal Total Revenue (pre-claim adjustment):", optimal_revenue)
 
-    schedule_records = []
+def _solve_pulp(orders, T, feasible_times, revenue, allow_postpone=None, capacity=None, warm_start=None, msg=1,
+                options=None, stats=None):
+    """
+    options: dict(time_limit, mip_gap, threads) - None인 항목은 CBC 기본값 사용
+    stats  : 리스트를 넘기면 이번 solve의 SolveStats를 추가합니다.
+    """
+    options = options or {}
+    build_start = time.perf_counter()
+    prob, x, y = build_pulp_model(orders, T, feasible_times, revenue, allow_postpone=allow_postpone,
+                                  capacity=capacity)
+    if warm_start:
+        _set_warm_start(orders, feasible_times, x, y, warm_start)
+    build_time = time.perf_counter() - build_start
+
+    fd, log_path = tempfile.mkstemp(suffix=".log", prefix="cbc_")
+    os.close(fd)
+    solver = pulp.PULP_CBC_CMD(msg=msg, warmStart=bool(warm_start), timeLimit=options.get("time_limit"),
+                               gapRel=options.get("mip_gap"), threads=options.get("threads"), logPath=log_path)
+    solve_start = time.perf_counter()
+    prob.solve(solver)
+    solve_time = time.perf_counter() - solve_start
+    result, bound = _parse_cbc_log(log_path)
+    if msg:
+        with open(log_path) as f:
+            print(f.read())
+    os.remove(log_path)
+
+    chosen = []
     for i, o in enumerate(orders):
         chosen_action = None
         chosen_start = None
-        for a in ACTIONS:
+        for a in MILP_ACTIONS:
             if pulp.value(x[(i, a)]) is not None and pulp.value(x[(i, a)]) > 0.5:
                 chosen_action = a
                 break
@@ -93,106 +249,754 @@ def solve_milp(use_gpt_claim=True):
                 if pulp.value(y[(i, t)]) is not None and pulp.value(y[(i, t)]) > 0.5:
                     chosen_start = t
                     break
+        chosen.append((chosen_action, chosen_start))
+
+    status = pulp.LpStatus[prob.status]
+    objective = pulp.value(prob.objective)
+    # PuLP는 시간 제한으로 멈춘 경우에도 Optimal을 반환하므로 CBC 로그의 종료 사유로 보정
+    if result and result.startswith("Stopped on time"):
+        status = "Time Limit"
+    # 실행 가능해 없이 멈춘 경우 prob.objective는 LP 상한일 뿐이고 변수 값도 완성된 해가 아님
+    if prob.sol_status == pulp.LpSolutionNoSolutionFound:
+        objective = None
+        chosen = [(None, None)] * len(orders)
+    if bound is None and status == "Optimal":
+        bound = objective
+    if stats is not None:
+        stats.append(SolveStats("cbc", status, build_time, solve_time, prob.numVariables(), prob.numConstraints(),
+                                objective, bound))
+    return status, objective, chosen
+
+
+def build_sparse_model(orders, T, feasible_times, allow_postpone=None, capacity=None):
+    """
+    build_pulp_model과 같은 모델을 행렬 형태로 생성합니다.
+    변수 순서: x (주문 i x MILP_ACTIONS, 주문 순) 다음 y (주문 i의 시작 시점 t, feasible_times 순)
+    용량 제약은 y 변수마다 가공 구간 [t, t + processing_time)을 구간 연산으로 펼쳐 COO로 만든 뒤 CSR로 변환합니다.
+    return: dict(c, A, row_lb, row_ub, lb, ub, y_order, y_start, num_x)
+            c는 최대화 목적함수 계수
+    """
+    if allow_postpone is None:
+        allow_postpone = _allow_postpone(orders, T)
+    if capacity is None:
+        capacity = np.full(T, MACHINE_CAPACITY, dtype=np.float64)
+    n = len(orders)
+    na = len(MILP_ACTIONS)
+    num_x = n * na
+
+    counts = np.array([len(feasible_times[i]) for i in range(n)], dtype=np.int64)
+    y_order = np.repeat(np.arange(n), counts)
+    y_start = np.array([t for i in range(n) for t in feasible_times[i]], dtype=np.int64)
+    num_y = len(y_start)
+    num_vars = num_x + num_y
+
+    revenue = np.array([o.revenue for o in orders], dtype=np.float64)
+    proc = np.array([o.processing_time for o in orders], dtype=np.int64)
+    due = np.array([o.due_date for o in orders], dtype=np.int64)
+
+    # 목적함수
+    c = np.zeros(num_vars)
+    x_base = np.arange(n) * na
+    c[x_base + MILP_ACTIONS.index("Outsource")] = revenue * OUTSOURCE_FRACTION
+    c[x_base + MILP_ACTIONS.index("Reject")] = -0.1 * revenue
+    c[x_base + MILP_ACTIONS.index("Postpone")] = -0.05 * revenue
+    y_rev = revenue[y_order]
+    c[num_x:] = np.where(y_start + proc[y_order] <= due[y_order], y_rev, y_rev - PENALTY)
+
+    # 변수 bound (Postpone 비허용 / Accept 불가 주문은 ub=0)
+    lb = np.zeros(num_vars)
+    ub = np.ones(num_vars)
+    ub[x_base[~np.asarray(allow_postpone, dtype=bool)] + MILP_ACTIONS.index("Postpone")] = 0.0
+    ub[x_base[counts == 0] + MILP_ACTIONS.index("Accept")] = 0.0
+
+    rows, cols, vals, row_lb, row_ub = [], [], [], [], []
+
+    # OneAction: sum_a x[i, a] == 1
+    rows.append(np.repeat(np.arange(n), na))
+    cols.append(np.arange(num_x))
+    vals.append(np.ones(num_x))
+    row_lb.append(np.ones(n))
+    row_ub.append(np.ones(n))
+    next_row = n
+
+    # Link: sum_t y[i, t] - x[i, Accept] == 0
+    linked = np.flatnonzero(counts > 0)
+    link_row = np.full(n, -1, dtype=np.int64)
+    link_row[linked] = next_row + np.arange(len(linked))
+    rows.append(link_row[y_order])
+    cols.append(num_x + np.arange(num_y))
+    vals.append(np.ones(num_y))
+    rows.append(link_row[linked])
+    cols.append(x_base[linked] + MILP_ACTIONS.index("Accept"))
+    vals.append(-np.ones(len(linked)))
+    row_lb.append(np.zeros(len(linked)))
+    row_ub.append(np.zeros(len(linked)))
+    next_row += len(linked)
+
+    # Capacity: tau in [t, t + processing_time) 인 y의 합 <= capacity[tau]
+    begin = np.clip(y_start, 0, T)
+    end = np.clip(y_start + proc[y_order], 0, T)
+    lengths = np.maximum(end - begin, 0)
+    offsets = np.cumsum(lengths) - lengths
+    taus = np.repeat(begin - offsets, lengths) + np.arange(lengths.sum())
+    rows.append(next_row + taus)
+    cols.append(num_x + np.repeat(np.arange(num_y), lengths))
+    vals.append(np.ones(len(taus)))
+    row_lb.append(np.full(T, -np.inf))
+    row_ub.append(np.asarray(capacity, dtype=np.float64))
+    next_row += T
+
+    A = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                   shape=(next_row, num_vars)).tocsr()
+    return {
+        "c": c,
+        "A": A,
+        "row_lb": np.concatenate(row_lb),
+        "row_ub": np.concatenate(row_ub),
+        "lb": lb,
+        "ub": ub,
+        "y_order": y_order,
+        "y_start": y_start,
+        "num_x": num_x,
+    }
+
+
+# scipy.optimize.milp status -> PuLP 상태 문자열
+HIGHS_STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Undefined"}
+
+
+def _chosen_from_vector(model, n, values):
+    """
+    변수 값 벡터에서 주문별 (액션, 시작 시점)을 읽어냅니다.
+    """
+    na = len(MILP_ACTIONS)
+    chosen = []
+    x = values[:model["num_x"]].reshape(n, na)
+    y_on = np.flatnonzero(values[model["num_x"]:] > 0.5)
+    starts = {}
+    for j in y_on:
+        starts.setdefault(int(model["y_order"][j]), int(model["y_start"][j]))
+    for i in range(n):
+        picked = np.flatnonzero(x[i] > 0.5)
+        chosen_action = MILP_ACTIONS[picked[0]] if len(picked) else None
+        chosen.append((chosen_action, starts.get(i) if chosen_action == "Accept" else None))
+    return chosen
+
+
+def _highs_options(options):
+    # scipy.optimize.milp는 thread 수 옵션을 제공하지 않으므로 threads는 무시됩니다.
+    highs_options = {}
+    if options.get("time_limit") is not None:
+        highs_options["time_limit"] = options["time_limit"]
+    if options.get("mip_gap") is not None:
+        highs_options["mip_rel_gap"] = options["mip_gap"]
+    return highs_options
+
+
+def _solve_highs(orders, T, feasible_times, allow_postpone=None, capacity=None, options=None, stats=None):
+    """
+    options/stats는 _solve_pulp와 동일
+    """
+    options = options or {}
+    build_start = time.perf_counter()
+    model = build_sparse_model(orders, T, feasible_times, allow_postpone=allow_postpone, capacity=capacity)
+    build_time = time.perf_counter() - build_start
+
+    solve_start = time.perf_counter()
+    res = milp(c=-model["c"],
+               constraints=LinearConstraint(model["A"], model["row_lb"], model["row_ub"]),
+               integrality=np.ones(len(model["c"])),
+               bounds=Bounds(model["lb"], model["ub"]),
+               options=_highs_options(options))
+    solve_time = time.perf_counter() - solve_start
+
+    status = HIGHS_STATUS.get(res.status, "Undefined")
+    if res.status == 1 and "time" in res.message.lower():
+        status = "Time Limit"
+    objective = None
+    chosen = [(None, None)] * len(orders)
+    if res.x is not None:
+        values = np.round(res.x)
+        objective = float(model["c"] @ values)
+        chosen = _chosen_from_vector(model, len(orders), values)
+    bound = getattr(res, "mip_dual_bound", None)
+    if stats is not None:
+        stats.append(SolveStats("highs", status, build_time, solve_time, model["A"].shape[1], model["A"].shape[0],
+                                objective, -bound if bound is not None else None))
+    return status, objective, chosen
+
+
+def _solve_model(orders, T, feasible_times, backend, warm_start=None, msg=1, options=None, stats=None):
+    if backend == "cbc":
+        revenue = _revenue_params(orders, feasible_times)
+        return _solve_pulp(orders, T, feasible_times, revenue, warm_start=warm_start, msg=msg, options=options,
+                           stats=stats)
+    if backend == "highs":
+        return _solve_highs(orders, T, feasible_times, options=options, stats=stats)
+    raise ValueError("Unknown MILP backend: " + backend)
+
+
+def _solve_bucketed(orders, T, feasible_times, bucket, backend, refine_rounds=2, refine_width=None, options=None,
+                    stats=None):
+    """
+    시작 시점을 bucket 간격의 coarse grid로 제한해 먼저 풀고, Accept된 작업이 있는 bucket만 세분화해 다시 풉니다.
+      - coarse 단계: 시작 시점 후보 = bucket 배수 시점 + 주문별 가장 이른 시작 시점
+        (용량 제약은 timestep 단위 그대로이므로 coarse 해도 원래 문제의 실행 가능해입니다.)
+      - refine 단계: Accept된 주문마다 현재 시작 시점 앞뒤 refine_width(기본 bucket - 1) 범위의 모든 timestep을
+        그 주문의 후보에 추가하고 이전 해를 warm start로 다시 풉니다.
+        기본값이면 선택된 grid 시점 양쪽 bucket 전체가 열리므로, 그 주문의 실제 최적 시작 시점이
+        인접 bucket 안에 있으면 refine 후보에 포함됩니다. (refine_width를 줄이면 변수는 줄지만 그 범위 밖의
+        시작 시점은 다시 고려하지 않으므로 coarse 해에 더 가깝게 남을 수 있습니다.)
+        후보가 더 늘지 않거나 refine_rounds에 도달하면 종료합니다.
+        (Accept되지 않은 주문은 coarse 후보를 그대로 유지)
+    return: (status, objective, chosen, info)
+            info: coarse_revenue, refine_gap(=(refined - coarse) / |refined|), rounds, num_start_vars, full_start_vars
+    """
+    candidates = {}
+    for i, times in feasible_times.items():
+        candidates[i] = [t for t in times if t % bucket == 0 or t == times[0]]
+
+    status, objective, chosen = _solve_model(orders, T, candidates, backend, msg=0, options=options, stats=stats)
+    coarse_revenue = objective
+    width = refine_width or max(1, bucket - 1)
+    rounds = 0
+    while rounds < refine_rounds and objective is not None:
+        grown = False
+        refined = {}
+        for i, times in feasible_times.items():
+            action, start = chosen[i]
+            if action == "Accept" and start is not None:
+                extra = [t for t in times if start - width <= t <= start + width]
+                refined[i] = sorted(set(candidates[i]) | set(extra))
+            else:
+                refined[i] = candidates[i]
+            grown = grown or len(refined[i]) > len(candidates[i])
+        if not grown:
+            break
+        candidates = refined
+        warm_start = {i: chosen[i] for i in range(len(orders))}
+        status, objective, chosen = _solve_model(orders, T, candidates, backend, warm_start=warm_start, msg=0,
+                                                 options=options, stats=stats)
+        rounds += 1
+
+    refine_gap = None
+    if objective is not None and coarse_revenue is not None and objective != 0:
+        refine_gap = (objective - coarse_revenue) / abs(objective)
+    info = {
+        "coarse_revenue": coarse_revenue,
+        "refine_gap": refine_gap,
+        "rounds": rounds,
+        "num_start_vars": sum(len(times) for times in candidates.values()),
+        "full_start_vars": sum(len(times) for times in feasible_times.values()),
+    }
+    return status, objective, chosen, info
+
+
+def lp_relaxation_bound(orders, T, feasible_times, model=None):
+    """
+    정수 조건을 푼 LP relaxation의 최적값 (최대 revenue의 상한)
+    """
+    if model is None:
+        model = build_sparse_model(orders, T, feasible_times)
+    res = milp(c=-model["c"],
+               constraints=LinearConstraint(model["A"], model["row_lb"], model["row_ub"]),
+               integrality=np.zeros(len(model["c"])),
+               bounds=Bounds(model["lb"], model["ub"]))
+    return -res.fun if res.x is not None else None
+
+
+def _best_start(o, times, occupancy, capacity):
+    """
+    현재 머신 점유(occupancy)에서 주문 o를 가공할 수 있는 시작 시점 중
+    납기 내 완료되는 가장 이른 시점, 없으면 가장 이른 시점을 반환합니다. (불가능하면 None)
+    times는 연속된 시작 시점 구간(_feasible_times)이라고 가정합니다.
+    """
+    if not times:
+        return None
+    p = o.processing_time
+    t0, t1 = times[0], times[-1]
+    slack = capacity[t0:t1 + p] - occupancy[t0:t1 + p]
+    starts = t0 + np.flatnonzero(sliding_window_view(slack, p).min(axis=1) >= 1)
+    if not len(starts):
+        return None
+    on_time = starts[starts + p <= o.due_date]
+    return int(on_time[0]) if len(on_time) else int(starts[0])
+
+
+def _non_accept_choice(o, allow_postpone):
+    actions = ["Outsource", "Reject"] + (["Postpone"] if allow_postpone else [])
+    return max(actions, key=lambda a: _action_revenue(o, a))
+
+
+def heuristic_schedule(orders, T, feasible_times, allow_postpone=None, capacity=None, max_rounds=20, priority="gain"):
+    """
+    greedy list scheduling + local search로 실행 가능한 스케줄을 만듭니다.
+      1) 주문을 priority 순서로 정렬해 용량이 남는 가장 좋은 시작 시점에 차례로 배치
+         (배치 불가 시 Accept 외 최선 액션)
+           "gain"     : (Accept 이득 - Accept 외 최선 액션 revenue) / processing_time 내림차순
+           "due_date" : 납기 오름차순
+           "arrival"  : 도착 시점 오름차순
+      2) local search (개선이 없을 때까지 반복)
+         - shift : Accept 주문을 빼고 더 좋은 시작 시점(납기 내 완료)으로 옮기기
+         - insert: Accept되지 않은 주문을 남는 용량에 배치
+         - swap  : Accept 주문 i를 빼고 그 자리에 j를 넣은 뒤 i를 다른 시점에 다시 배치 (총 revenue가 늘 때만)
+    return: (objective, chosen)
+    """
+    if allow_postpone is None:
+        allow_postpone = _allow_postpone(orders, T)
+    if capacity is None:
+        capacity = np.full(T, MACHINE_CAPACITY, dtype=np.int64)
+    capacity = np.asarray(capacity)
+    n = len(orders)
+    occupancy = np.zeros(T, dtype=np.int64)
+    fallback = [_non_accept_choice(o, allow_postpone[i]) for i, o in enumerate(orders)]
+    start = [None] * n
+
+    def value(i, s):
+        o = orders[i]
+        return _action_revenue(o, "Accept", s) if s is not None else _action_revenue(o, fallback[i])
+
+    def place(i, s):
+        start[i] = s
+        if s is not None:
+            occupancy[s:s + orders[i].processing_time] += 1
+
+    def remove(i):
+        s = start[i]
+        if s is not None:
+            occupancy[s:s + orders[i].processing_time] -= 1
+        start[i] = None
+        return s
+
+    def gain(i):
+        o = orders[i]
+        return (_action_revenue(o, "Accept", o.due_date - o.processing_time) - value(i, None)) / o.processing_time
+
+    if priority == "gain":
+        greedy_order = sorted(range(n), key=gain, reverse=True)
+    elif priority == "due_date":
+        greedy_order = sorted(range(n), key=lambda i: orders[i].due_date)
+    elif priority == "arrival":
+        greedy_order = sorted(range(n), key=lambda i: orders[i].order_date)
+    else:
+        raise ValueError("Unknown priority: " + priority)
+
+    for i in greedy_order:
+        s = _best_start(orders[i], feasible_times[i], occupancy, capacity)
+        if s is not None and value(i, s) > value(i, None):
+            place(i, s)
+
+    for _ in range(max_rounds):
+        improved = False
+
+        # shift
+        for i in range(n):
+            if start[i] is None:
+                continue
+            old = remove(i)
+            s = _best_start(orders[i], feasible_times[i], occupancy, capacity)
+            if s is not None and value(i, s) > value(i, old):
+                place(i, s)
+                improved = True
+            else:
+                place(i, old)
+
+        # insert
+        for i in range(n):
+            if start[i] is None:
+                s = _best_start(orders[i], feasible_times[i], occupancy, capacity)
+                if s is not None and value(i, s) > value(i, None):
+                    place(i, s)
+                    improved = True
+
+        # swap
+        for j in sorted((j for j in range(n) if start[j] is None and feasible_times[j]), key=gain, reverse=True):
+            lo, hi = feasible_times[j][0], feasible_times[j][-1] + orders[j].processing_time
+            for i in range(n):
+                si = start[i]
+                if si is None or si >= hi or si + orders[i].processing_time <= lo:
+                    continue
+                remove(i)
+                sj = _best_start(orders[j], feasible_times[j], occupancy, capacity)
+                if sj is None:
+                    place(i, si)
+                    continue
+                place(j, sj)
+                si_new = _best_start(orders[i], feasible_times[i], occupancy, capacity)
+                if si_new is not None and value(i, si_new) <= value(i, None):
+                    si_new = None
+                delta = (value(j, sj) - value(j, None)) + (value(i, si_new) - value(i, si))
+                if delta > 1e-9:
+                    place(i, si_new)
+                    improved = True
+                    break
+                remove(j)
+                place(i, si)
+
+        if not improved:
+            break
+
+    chosen = [("Accept", start[i]) if start[i] is not None else (fallback[i], None) for i in range(n)]
+    objective = sum(value(i, start[i]) for i in range(n))
+    return objective, chosen
+
+
+def _solve_heuristic(orders, T, feasible_times, priorities=("gain", "due_date", "arrival"), stats=None):
+    """
+    LP relaxation 상한 + heuristic 스케줄 (priority별로 한 번씩 실행해 가장 좋은 스케줄 사용)
+    return: (status, objective, chosen, info)  info: lp_bound, gap(=(lp_bound - objective) / |lp_bound|)
+    """
+    build_start = time.perf_counter()
+    model = build_sparse_model(orders, T, feasible_times)
+    build_time = time.perf_counter() - build_start
+
+    solve_start = time.perf_counter()
+    lp_bound = lp_relaxation_bound(orders, T, feasible_times, model=model)
+    objective, chosen = max((heuristic_schedule(orders, T, feasible_times, priority=priority)
+                             for priority in priorities), key=lambda item: item[0])
+    solve_time = time.perf_counter() - solve_start
+
+    gap = None
+    if lp_bound:
+        gap = (lp_bound - objective) / abs(lp_bound)
+    if stats is not None:
+        stats.append(SolveStats("heuristic", "Heuristic", build_time, solve_time, model["A"].shape[1],
+                                model["A"].shape[0], objective, lp_bound))
+    return "Heuristic", objective, chosen, {"lp_bound": lp_bound, "gap": gap}
+
+
+def _apply_schedule(orders, chosen):
+    """
+    solver가 고른 (액션, 시작 시점)을 주문에 반영합니다.
+    return: (주문별 FinalAction 표시값, 주문별 CalculatedRevenue) 리스트
+    """
+    final_actions = []
+    calculated_revenue = []
+    for i, o in enumerate(orders):
+        chosen_action, chosen_start = chosen[i]
         o.final_action = chosen_action
         if chosen_action == "Accept" and chosen_start is not None:
             o.start_time = chosen_start
             o.finish_time = chosen_start + o.processing_time
-            calc_revenue = r_accept[(i, chosen_start)]
+            calc_revenue = _action_revenue(o, chosen_action, chosen_start)
         elif chosen_action in ["Outsource", "Reject", "Postpone"]:
             # 최소 1 타임스텝 표시
             o.start_time = o.order_date
             o.finish_time = o.order_date + 1
-            if chosen_action == "Outsource":
-                calc_revenue = r_outsource[i]
-            elif chosen_action == "Reject":
-                calc_revenue = r_reject[i]
-            elif chosen_action == "Postpone":
-                calc_revenue = r_postpone[i]
+            calc_revenue = _action_revenue(o, chosen_action)
         else:
             chosen_action = "NotScheduled"
             o.start_time = None
             o.finish_time = None
             calc_revenue = 0
-        record = {
-            "OrderNo": o.order_no,
-            "OrderDate": o.order_date,
-            "DecisionDueDate": o.decision_due_date,
-            "ModelName": o.model_name,
-            "ProcessingTime": o.processing_time,
-            "DueDate": o.due_date,
-            "Revenue": o.revenue,
-            "FinalAction": chosen_action,
-            "StartTime": o.start_time,
-            "FinishTime": o.finish_time,
-            "CalculatedRevenue": calc_revenue,
-            "ClaimOccurred": "N/A",
-            "Claim": "N/A",
-            "Cause": "N/A",
-            "Position": "N/A"
-        }
-        schedule_records.append(record)
+        final_actions.append(chosen_action)
+        calculated_revenue.append(calc_revenue)
+    return final_actions, calculated_revenue
+
 
+def _apply_claims(orders, use_gpt_claim, claim_pipeline=None):
+    """
+    MILP 결과의 Accept/Outsource 주문에 대한 claim 처리
+    claim_pipeline: 지정하면 claim 텍스트를 주문마다 순차 호출하지 않고 마지막에 한 번에 동시 요청합니다.
+    return: total_claim_cost
+    """
     total_claim_cost = 0.0
+    for o in orders:
+        o.claim_occurred = False
+        o.claim = "N/A"
+        o.cause = "N/A"
+        o.position = "N/A"
+    # GPT claim 처리를 사용하지 않을 경우 claim 추첨 없음
     if use_gpt_claim:
-        from gpt_model.models import generate_claim, analysis_claim
-        for o in orders:
-            if o.final_action in ["Accept", "Outsource"]:
-                claim_prob = CLAIM_PROB_PER_MODEL.get(o.model_name, 0.0)
-                if random.random() < claim_prob:
-                    total_claim_cost += CLAIM_PROCESSING_COST
-                    CLAIM_PROB_PER_MODEL[o.model_name] = min(1.0, claim_prob + 0.01)
-                    o.claim_occurred = True
-                    prompt_gen = [{"role": "user",
-                                   "content": "A claim Occurs. Generate a claim randomly. You must answer only about the claim. Exclude everything else from your response."}]
-                    claim_text = generate_claim(prompt_gen)
-                    prompt_analysis = [{"role": "user",
-                                        'content': f'You must respond strictly in the following format. Exclude everything else from your response:{{"Position": "your answer about defect position", "Cause": "your answer about defect cause"}}\nClaim: {claim_text}'}]
-                    analysis_text = analysis_claim(prompt_analysis)
-                    if ";" in analysis_text:
-                        parts = analysis_text.split(";")
-                        cause = parts[0].replace("Cause:", "").strip() if "Cause:" in parts[0] else parts[0].strip()
-                        position = parts[1].replace("Position:", "").strip() if len(parts) > 1 and "Position:" in parts[1] else parts[1].strip()
-                    else:
-                        cause = analysis_text
-                        position = ""
-                    o.claim = claim_text
-                    o.cause = cause
-                    o.position = position
-                else:
-                    CLAIM_PROB_PER_MODEL[o.model_name] = max(0.0, claim_prob - 0.005)
-                    o.claim_occurred = False
-                    o.claim = "N/A"
-                    o.cause = "N/A"
-                    o.position = "N/A"
-            else:
-                o.claim_occurred = False
-                o.claim = "N/A"
-                o.cause = "N/A"
-                o.position = "N/A"
+        fulfilled = [o for o in orders if o.final_action in ["Accept", "Outsource"]]
+        flags, total_claim_cost = draw_order_claims(fulfilled)
+        claimed = [o for o, flag in zip(fulfilled, flags) if flag]
+        for o in claimed:
+            o.claim_occurred = True
+        if claim_pipeline is not None:
+            if claimed:
+                from gpt_model.claim_pipeline import fill_claims
+                fill_claims(claimed, claim_pipeline)
+        else:
+            for o in claimed:
+                claim_text, analysis_text = fetch_claim()
+                attach_claim(o, claim_text, analysis_text)
+
+    return total_claim_cost
+
+
+def _resolve_cache(cache):
+    # cache: None(사용 안 함) / 캐시 디렉터리 경로 / MilpSolutionCache
+    if cache is None or isinstance(cache, MilpSolutionCache):
+        return cache
+    return MilpSolutionCache(cache)
+
+
+def evaluate_milp(use_gpt_claim=True, backend="cbc", bucket=None, refine_rounds=2, method="exact", time_limit=None,
+                  mip_gap=None, threads=None, cache=None, claim_pipeline=None):
+    """
+    MILP 모델을 풀고 스케줄/claim 결과를 계산합니다. (출력/그래프/파일 저장 없음)
+    backend: "cbc"   - PuLP로 모델을 만들어 CBC로 푸는 reference 경로
+             "highs" - 제약 행렬을 sparse(COO/CSR)로 직접 만들어 scipy.optimize.milp(HiGHS)로 풉니다.
+    bucket : 지정하면 시작 시점을 bucket 간격으로 묶어 풀고 필요한 구간만 세분화합니다. (_solve_bucketed 참고)
+    method : "exact" - MILP를 풉니다.
+             "heuristic" - LP relaxation 상한과 greedy + local search 스케줄만 계산합니다. (_solve_heuristic 참고)
+    time_limit, mip_gap, threads: solver 옵션 (solve 1회 기준 초 / 상대 gap / thread 수, None이면 solver 기본값)
+    cache  : 캐시 디렉터리 경로 또는 MilpSolutionCache. 같은 주문 데이터/설정/풀이 옵션의 결과가 있으면
+             다시 풀지 않고 저장된 주문별 액션/시작 시점을 사용합니다.
+    claim_pipeline: GPT claim 텍스트를 한 번에 동시 요청할 ClaimPipeline (_apply_claims 참고)
+    return: dict(orders, final_actions, calculated_revenue, status, optimal_revenue, total_claim_cost, adjusted_revenue,
+                 solve_stats: SolveStats 리스트, cache_hit)
+            bucket 사용 시 bucket_info(coarse_revenue, refine_gap, ...),
+            heuristic 사용 시 heuristic_info(lp_bound, gap) 추가
+            solver가 실행 가능해를 찾지 못하면 (예: time_limit 안에 해 없음) optimal_revenue/adjusted_revenue는 None이고
+            스케줄/claim 처리와 캐시 저장을 하지 않습니다. (final_actions, calculated_revenue는 빈 리스트)
+    """
+    orders_data = generate_orders()
+    orders = [Order(*row) for row in orders_data]
+    T = NUM_TIMESTEPS
+
+    feasible_times = _feasible_times(orders, T)
+
+    if method not in MILP_METHODS:
+        raise ValueError("Unknown MILP method: " + method)
+
+    options = {"time_limit": time_limit, "mip_gap": mip_gap, "threads": threads}
+    solve_stats = []
+    bucket_info = None
+    heuristic_info = None
+
+    cache = _resolve_cache(cache)
+    cache_key = None
+    cached = None
+    if cache is not None:
+        solver = {"method": method, "time_limit": time_limit, "mip_gap": mip_gap}
+        if method == "exact":
+            solver.update({"backend": backend, "bucket": bucket if bucket and bucket > 1 else None,
+                           "refine_rounds": refine_rounds if bucket and bucket > 1 else None})
+        cache_key = make_cache_key(orders_data, T, solver=solver)
+        cached = cache.get(cache_key)
+
+    if cached is not None:
+        plan = {entry["order_no"]: (entry["action"], entry["start"]) for entry in cached["plan"]}
+        chosen = [plan.get(o.order_no, (None, None)) for o in orders]
+        status = cached["status"]
+        optimal_revenue = cached["objective"]
+        bucket_info = cached.get("bucket_info")
+        heuristic_info = cached.get("heuristic_info")
+    elif method == "heuristic":
+        status, optimal_revenue, chosen, heuristic_info = _solve_heuristic(orders, T, feasible_times,
+                                                                           stats=solve_stats)
+    elif bucket and bucket > 1:
+        status, optimal_revenue, chosen, bucket_info = _solve_bucketed(orders, T, feasible_times, bucket, backend,
+                                                                       refine_rounds=refine_rounds, options=options,
+                                                                       stats=solve_stats)
     else:
-        # GPT claim 처리를 사용하지 않을 경우
-        for o in orders:
-            o.claim = "N/A"
-            o.cause = "N/A"
-            o.position = "N/A"
+        status, optimal_revenue, chosen = _solve_model(orders, T, feasible_times, backend, options=options,
+                                                       stats=solve_stats)
+
+    if optimal_revenue is None:
+        result = {
+            "orders": orders,
+            "final_actions": [],
+            "calculated_revenue": [],
+            "status": status,
+            "optimal_revenue": None,
+            "total_claim_cost": None,
+            "adjusted_revenue": None,
+            "solve_stats": solve_stats,
+            "cache_hit": False,
+        }
+        if bucket_info is not None:
+            result["bucket_info"] = bucket_info
+        return result
+
+    if cache is not None and cached is None:
+        cache.put(cache_key, {
+            "plan": [{"order_no": o.order_no, "action": action, "start": start}
+                     for o, (action, start) in zip(orders, chosen)],
+            "status": status,
+            "objective": optimal_revenue,
+            "bucket_info": bucket_info,
+            "heuristic_info": heuristic_info,
+        })
+
+    final_actions, calculated_revenue = _apply_schedule(orders, chosen)
+    total_claim_cost = _apply_claims(orders, use_gpt_claim, claim_pipeline)
 
-    print("Total Claim Cost (MILP):", total_claim_cost)
     adjusted_revenue = optimal_revenue - total_claim_cost
-    print("Optimal Total Revenue (after claim adjustment) [MILP]:", adjusted_revenue)
 
-    for record, o in zip(schedule_records, orders):
-        if o.final_action in ["Accept", "Outsource"]:
-            record["ClaimOccurred"] = "Yes" if o.claim_occurred else "No"
+    result = {
+        "orders": orders,
+        "final_actions": final_actions,
+        "calculated_revenue": calculated_revenue,
+        "status": status,
+        "optimal_revenue": optimal_revenue,
+        "total_claim_cost": total_claim_cost,
+        "adjusted_revenue": adjusted_revenue,
+        "solve_stats": solve_stats,
+        "cache_hit": cached is not None,
+    }
+    if bucket_info is not None:
+        result["bucket_info"] = bucket_info
+    if heuristic_info is not None:
+        result["heuristic_info"] = heuristic_info
+    return result
+
+
+def evaluate_milp_rolling(use_gpt_claim=True, epoch=10, lookahead=40, backend="cbc", time_limit=None, mip_gap=None,
+                          threads=None, claim_pipeline=None):
+    """
+    Rolling-horizon MILP: 전체 horizon을 한 번에 푸는 대신 epoch 간격으로 재계획합니다.
+      - 각 재계획 시점 e에서는 이미 도착했고 아직 확정되지 않은 주문만 대상으로,
+        시작 시점이 [e, e + lookahead] 안에 있는 스케줄만 고려해 모델을 풉니다.
+      - 확정된 Accept 주문의 머신 점유는 이후 timestep의 가용 용량에서 차감됩니다.
+      - 다음 재계획 시점(e + epoch) 전에 시작하는 Accept와 결정 마감일이 그 전인 주문의 결정만 확정하고,
+        나머지는 다음 epoch에서 다시 계획합니다. (Postpone은 결정 마감일이 다음 epoch 이후인 주문만 허용)
+      - CBC backend에서는 이전 계획을 warm start 초기해로 사용합니다.
+    time_limit, mip_gap, threads: 재계획 1회(solve 1회) 기준 solver 옵션
+    return: evaluate_milp와 동일한 dict (+ epochs: 재계획 횟수)
+    """
+    if backend not in MILP_BACKENDS:
+        raise ValueError("Unknown MILP backend: " + backend)
+    orders_data = generate_orders()
+    orders = [Order(*row) for row in orders_data]
+    T = NUM_TIMESTEPS
+
+    epochs = list(range(0, T + 1, epoch))
+    if epochs[-1] != T:
+        epochs.append(T)
+
+    occupancy = np.zeros(T, dtype=np.int64)
+    committed = {}
+    plan = {}
+    statuses = []
+    options = {"time_limit": time_limit, "mip_gap": mip_gap, "threads": threads}
+    solve_stats = []
+
+    for k, e in enumerate(epochs):
+        next_epoch = epochs[k + 1] if k + 1 < len(epochs) else T + 1
+        candidates = [j for j, o in enumerate(orders) if j not in committed and o.order_date <= e]
+        if not candidates:
+            continue
+        sub_orders = [orders[j] for j in candidates]
+
+        # 재계획 구간: 시작 시점은 [max(order_date, e), min(e + lookahead, T - processing_time)]
+        feasible_times = {}
+        for i, o in enumerate(sub_orders):
+            start_min = max(o.order_date, e)
+            start_max = min(e + lookahead, T - o.processing_time)
+            feasible_times[i] = list(range(start_min, start_max + 1)) if start_max >= start_min else []
+        allow_postpone = [o.decision_due_date >= next_epoch for o in sub_orders]
+        capacity = MACHINE_CAPACITY - occupancy
+
+        if backend == "cbc":
+            warm_start = {i: plan[j] for i, j in enumerate(candidates) if j in plan}
+            revenue = _revenue_params(sub_orders, feasible_times)
+            status, _, chosen = _solve_pulp(sub_orders, T, feasible_times, revenue, allow_postpone=allow_postpone,
+                                            capacity=capacity, warm_start=warm_start, msg=0, options=options,
+                                            stats=solve_stats)
         else:
-            record["ClaimOccurred"] = "N/A"
-        record["Claim"] = o.claim
-        record["Cause"] = o.cause
-        record["Position"] = o.position
-
-    df = pd.DataFrame(schedule_records)
-    df.to_csv("order_data_milp.csv", index=False)
-    print("order_data_milp.csv 파일이 저장되었습니다.")
-    plot_gantt(orders, NUM_TIMESTEPS, title="MILP Policy - Gantt")
-
-def run_milp(use_gpt_claim=True):
-    solve_milp(use_gpt_claim=use_gpt_claim)
\ No newline at end of file
+            status, _, chosen = _solve_highs(sub_orders, T, feasible_times, allow_postpone=allow_postpone,
+                                             capacity=capacity, options=options, stats=solve_stats)
+        statuses.append(status)
+
+        for i, j in enumerate(candidates):
+            action, start = chosen[i]
+            plan[j] = (action, start)
+            o = orders[j]
+            if next_epoch > T or o.decision_due_date < next_epoch or (action == "Accept" and start < next_epoch):
+                committed[j] = (action, start)
+                if action == "Accept" and start is not None:
+                    occupancy[start:start + o.processing_time] += 1
+
+    chosen = [committed.get(j, plan.get(j, (None, None))) for j in range(len(orders))]
+    final_actions, calculated_revenue = _apply_schedule(orders, chosen)
+    optimal_revenue = sum(calculated_revenue)
+    total_claim_cost = _apply_claims(orders, use_gpt_claim, claim_pipeline)
+
+    adjusted_revenue = optimal_revenue - total_claim_cost
+
+    non_optimal = [st for st in statuses if st != "Optimal"]
+    return {
+        "orders": orders,
+        "final_actions": final_actions,
+        "calculated_revenue": calculated_revenue,
+        "status": non_optimal[-1] if non_optimal else "Optimal",
+        "optimal_revenue": optimal_revenue,
+        "total_claim_cost": total_claim_cost,
+        "adjusted_revenue": adjusted_revenue,
+        "epochs": len(statuses),
+        "solve_stats": solve_stats,
+    }
+
+
+def _export_schedule(result, stem, output_format):
+    path = result_path(stem, output_format)
+    export_orders(result["orders"], path, fmt=output_format, calculated_revenue=result["calculated_revenue"],
+                  final_actions=result["final_actions"])
+    print(f"{path} 파일이 저장되었습니다.")
+
+
+def solve_milp_rolling(use_gpt_claim=True, epoch=10, lookahead=40, backend="cbc", output_format="csv",
+                       plot_dir=None, **solver_options):
+    result = evaluate_milp_rolling(use_gpt_claim=use_gpt_claim, epoch=epoch, lookahead=lookahead, backend=backend,
+                                   **solver_options)
+    orders = result["orders"]
+
+    print("Rolling-horizon MILP Status:", result["status"], f"({result['epochs']} epochs)")
+    print("Solver stats:", _summarize_stats(result["solve_stats"]))
+    print("Total Revenue (pre-claim adjustment):", result["optimal_revenue"])
+    print("Total Claim Cost (MILP rolling):", result["total_claim_cost"])
+    print("Total Revenue (after claim adjustment) [MILP rolling]:", result["adjusted_revenue"])
+
+    _export_schedule(result, "order_data_milp_rolling", output_format)
+    plot_gantt(orders, NUM_TIMESTEPS, title="Rolling-horizon MILP Policy - Gantt",
+               output_path=plot_path(plot_dir, "gantt_milp_rolling"))
+
+
+def solve_milp(use_gpt_claim=True, backend="cbc", bucket=None, method="exact", output_format="csv", plot_dir=None,
+               **solver_options):
+    result = evaluate_milp(use_gpt_claim=use_gpt_claim, backend=backend, bucket=bucket, method=method,
+                           **solver_options)
+    orders = result["orders"]
+
+    print("MILP Status:", result["status"])
+    if result["cache_hit"]:
+        print("Solver stats: cached solution reused")
+    else:
+        print("Solver stats:", _summarize_stats(result["solve_stats"]))
+    if result["optimal_revenue"] is None:
+        print("MILP solver가 실행 가능해를 찾지 못했습니다. (time_limit을 늘려 보세요) 스케줄 저장/그래프를 생략합니다.")
+        return
+    if "bucket_info" in result:
+        info = result["bucket_info"]
+        print(f"Time bucket {bucket}: coarse revenue = {info['coarse_revenue']}, "
+              f"refined revenue = {result['optimal_revenue']}, gap = {info['refine_gap']}, "
+              f"refine rounds = {info['rounds']}, start variables = {info['num_start_vars']} / {info['full_start_vars']}")
+    if "heuristic_info" in result:
+        info = result["heuristic_info"]
+        print(f"LP relaxation bound = {info['lp_bound']}, heuristic revenue = {result['optimal_revenue']}, "
+              f"gap = {info['gap']}")
+    print("Optimal Total Revenue (pre-claim adjustment):", result["optimal_revenue"])
+    print("Total Claim Cost (MILP):", result["total_claim_cost"])
+    print("Optimal Total Revenue (after claim adjustment) [MILP]:", result["adjusted_revenue"])
+
+    _export_schedule(result, "order_data_milp", output_format)
+    plot_gantt(orders, NUM_TIMESTEPS, title="MILP Policy - Gantt", output_path=plot_path(plot_dir, "gantt_milp"))
+
+def run_milp(use_gpt_claim=True, backend="cbc", bucket=None, method="exact", output_format="csv", plot_dir=None,
+             **solver_options):
+    """
+    solver_options: time_limit, mip_gap, threads, cache (evaluate_milp 참고)
+    output_format : 결과 파일 형식 csv / parquet / arrow (result_export 참고)
+    plot_dir      : 지정하면 Gantt 차트를 화면에 띄우지 않고 이 디렉터리에 PNG로 저장
+    """
+    solve_milp(use_gpt_claim=use_gpt_claim, backend=backend, bucket=bucket, method=method,
+               output_format=output_format, plot_dir=plot_dir, **solver_options)
+
+
+def run_milp_rolling(use_gpt_claim=True, epoch=10, lookahead=40, backend="cbc", output_format="csv",
+                     plot_dir=None, **solver_options):
+    solve_milp_rolling(use_gpt_claim=use_gpt_claim, epoch=epoch, lookahead=lookahead, backend=backend,
+                       output_format=output_format, plot_dir=plot_dir, **solver_options)
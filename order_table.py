@@ -0,0 +1,302 @@
+import numpy as np
+
+from data_generation import MODEL_NAMES
+
+# decision_history / final_action 코드 (int8)
+HISTORY_ACTIONS = ["Arrived", "Accept", "Reject", "Postpone", "Outsource"]
+ACTION_CODE = {a: i for i, a in enumerate(HISTORY_ACTIONS)}
+NONE = -1
+
+ORDER_DTYPE = np.dtype([
+    ("order_no", np.int64),
+    ("order_date", np.int64),
+    ("decision_due_date", np.int64),
+    ("model", np.int16),
+    ("processing_time", np.int64),
+    ("due_date", np.int64),
+    ("revenue", np.int64),
+    ("risk", np.float64),
+    ("final_action", np.int8),       # HISTORY_ACTIONS 인덱스, 미결정 -1
+    ("start_time", np.int64),        # 없음 -1
+    ("finish_time", np.int64),       # 없음 -1
+    ("is_completed", np.bool_),
+    ("claim_occurred", np.int8),     # 미처리 -1, 0/1
+    ("history_head", np.int32),      # decision history linked list (없음 -1)
+    ("history_tail", np.int32),
+    ("history_len", np.int32),       # decision history 항목 수
+])
+
+
+class OrderTable:
+    """
+    주문 정보를 고정 dtype의 structured array 한 개로 보관하는 columnar 테이블.
+      - data      : ORDER_DTYPE structured array (필드별 column은 data["order_date"] 등)
+      - history   : decision history를 (t, action code, row, next) int 배열의 주문별 linked list로 저장
+      - claim 텍스트(claim/cause/position)는 claim이 처리된 주문만 dict에 보관
+    view(i) / orders()로 Order와 같은 속성 API를 가진 OrderView를 얻을 수 있어
+    simulate, solve_milp, exporter 등을 단계적으로 옮길 수 있습니다.
+    """
+
+    def __init__(self, num_orders, model_names=None):
+        self.data = np.zeros(num_orders, dtype=ORDER_DTYPE)
+        for name in ["final_action", "start_time", "finish_time", "claim_occurred", "history_head",
+                     "history_tail"]:
+            self.data[name] = NONE
+        self.model_names = list(model_names if model_names is not None else MODEL_NAMES)
+        self._model_ids = {name: i for i, name in enumerate(self.model_names)}
+        # 필드별 column view (속성 접근 시 매번 data[name]을 만들지 않도록 보관)
+        self.columns = {name: self.data[name] for name in ORDER_DTYPE.names}
+
+        self._history_size = 0
+        self._history_t = np.zeros(16, dtype=np.int32)
+        self._history_code = np.zeros(16, dtype=np.int8)
+        self._history_next = np.zeros(16, dtype=np.int32)
+        self._history_row = np.zeros(16, dtype=np.int32)
+
+        self._claim_text = {}
+        self._views = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        generate_orders() 형식의 row 리스트로 테이블을 만듭니다.
+        """
+        table = cls(len(rows))
+        if rows:
+            cols = list(zip(*rows))
+            for j, name in enumerate(["order_no", "order_date", "decision_due_date"]):
+                table.data[name] = cols[j]
+            table.data["model"] = [table.model_code(m) for m in cols[3]]
+            for j, name in enumerate(["processing_time", "due_date", "revenue", "risk"], start=4):
+                table.data[name] = cols[j]
+        return table
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        data_generation.iter_order_chunks / generate_orders_fast(as_rows=False)의 배열 dict로 테이블을 만듭니다.
+        """
+        table = cls(len(arrays["order_no"]))
+        for name in ["order_no", "order_date", "decision_due_date", "model", "processing_time", "due_date",
+                     "revenue", "risk"]:
+            table.data[name] = arrays[name]
+        return table
+
+    def __len__(self):
+        return len(self.data)
+
+    def model_code(self, name):
+        code = self._model_ids.get(name)
+        if code is None:
+            code = self._model_ids[name] = len(self.model_names)
+            self.model_names.append(name)
+        return code
+
+    # ------------------------------------------------------------------
+    # view API
+    # ------------------------------------------------------------------
+    def view(self, row):
+        if self._views is not None:
+            return self._views[row]
+        return OrderView(self, row)
+
+    def orders(self):
+        """
+        행마다 하나씩 만든 OrderView 리스트 (같은 행은 항상 같은 객체 → id() 기반 자료구조와 호환)
+        """
+        if self._views is None:
+            self._views = [OrderView(self, i) for i in range(len(self.data))]
+        return self._views
+
+    def __iter__(self):
+        return iter(self.orders())
+
+    def __getitem__(self, row):
+        return self.view(row)
+
+    # ------------------------------------------------------------------
+    # decision history
+    # ------------------------------------------------------------------
+    def append_history(self, row, t, action):
+        idx = self._history_size
+        if idx == len(self._history_t):
+            capacity = 2 * idx
+            self._history_t = np.resize(self._history_t, capacity)
+            self._history_code = np.resize(self._history_code, capacity)
+            self._history_next = np.resize(self._history_next, capacity)
+            self._history_row = np.resize(self._history_row, capacity)
+        self._history_t[idx] = t
+        self._history_code[idx] = ACTION_CODE[action]
+        self._history_next[idx] = NONE
+        self._history_row[idx] = row
+        tail = self.columns["history_tail"][row]
+        if tail == NONE:
+            self.columns["history_head"][row] = idx
+        else:
+            self._history_next[tail] = idx
+        self.columns["history_tail"][row] = idx
+        self.columns["history_len"][row] += 1
+        self._history_size = idx + 1
+
+    def history_length(self, row):
+        return int(self.columns["history_len"][row])
+
+    def iter_history(self, row):
+        idx = int(self.columns["history_head"][row])
+        while idx != NONE:
+            yield int(self._history_t[idx]), HISTORY_ACTIONS[self._history_code[idx]]
+            idx = int(self._history_next[idx])
+
+    def history_arrays(self):
+        """
+        전체 decision history를 (row, t, action code) int 배열로 반환합니다. (row, 기록 순서로 정렬)
+        """
+        n = self._history_size
+        rows = self._history_row[:n]
+        order = np.argsort(rows, kind="stable")
+        return rows[order], self._history_t[:n][order], self._history_code[:n][order]
+
+    def nbytes(self):
+        return (self.data.nbytes + self._history_t.nbytes + self._history_code.nbytes
+                + self._history_next.nbytes + self._history_row.nbytes)
+
+
+def _int_field(name):
+    def fget(self):
+        return int(self._table.columns[name][self._row])
+
+    def fset(self, value):
+        self._table.columns[name][self._row] = value
+
+    return property(fget, fset)
+
+
+def _float_field(name):
+    def fget(self):
+        return float(self._table.columns[name][self._row])
+
+    def fset(self, value):
+        self._table.columns[name][self._row] = value
+
+    return property(fget, fset)
+
+
+def _optional_time_field(name):
+    def fget(self):
+        value = int(self._table.columns[name][self._row])
+        return None if value == NONE else value
+
+    def fset(self, value):
+        self._table.columns[name][self._row] = NONE if value is None else value
+
+    return property(fget, fset)
+
+
+def _claim_text_field(name):
+    # 값이 설정되지 않았으면 AttributeError (Order의 hasattr(o, "claim") 검사와 동일하게 동작)
+    def fget(self):
+        try:
+            return self._table._claim_text[self._row][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def fset(self, value):
+        self._table._claim_text.setdefault(self._row, {})[name] = value
+
+    return property(fget, fset)
+
+
+class _HistoryView:
+    """
+    OrderView.decision_history: 기존 list[(t, action)]처럼 append / 순회할 수 있는 view
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def append(self, item):
+        t, action = item
+        self._table.append_history(self._row, t, action)
+
+    def __iter__(self):
+        return self._table.iter_history(self._row)
+
+    def __len__(self):
+        return self._table.history_length(self._row)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class OrderView:
+    """
+    OrderTable 한 행에 대한 view. order_class.Order와 같은 속성 이름으로 읽고 씁니다.
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    order_no = _int_field("order_no")
+    order_date = _int_field("order_date")
+    decision_due_date = _int_field("decision_due_date")
+    processing_time = _int_field("processing_time")
+    due_date = _int_field("due_date")
+    revenue = _int_field("revenue")
+    risk = _float_field("risk")
+    start_time = _optional_time_field("start_time")
+    finish_time = _optional_time_field("finish_time")
+    claim = _claim_text_field("claim")
+    cause = _claim_text_field("cause")
+    position = _claim_text_field("position")
+
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def model_name(self):
+        return self._table.model_names[self._table.columns["model"][self._row]]
+
+    @model_name.setter
+    def model_name(self, value):
+        self._table.columns["model"][self._row] = self._table.model_code(value)
+
+    @property
+    def final_action(self):
+        code = self._table.columns["final_action"][self._row]
+        return None if code == NONE else HISTORY_ACTIONS[code]
+
+    @final_action.setter
+    def final_action(self, value):
+        self._table.columns["final_action"][self._row] = NONE if value is None else ACTION_CODE[value]
+
+    @property
+    def is_completed(self):
+        return bool(self._table.columns["is_completed"][self._row])
+
+    @is_completed.setter
+    def is_completed(self, value):
+        self._table.columns["is_completed"][self._row] = value
+
+    @property
+    def claim_occurred(self):
+        value = self._table.columns["claim_occurred"][self._row]
+        if value == NONE:
+            raise AttributeError("claim_occurred")
+        return bool(value)
+
+    @claim_occurred.setter
+    def claim_occurred(self, value):
+        self._table.columns["claim_occurred"][self._row] = 1 if value else 0
+
+    @property
+    def decision_history(self):
+        return _HistoryView(self._table, self._row)
+
+    def __repr__(self):
+        return (f"Order#{self.order_no}(OD={self.order_date},"
+                f" DDD={self.decision_due_date}, model={self.model_name})")
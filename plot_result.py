@@ -1,114 +1,183 @@
+import math
+import os
+
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+import matplotlib.lines as mlines
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+GANTT_COLORS = {
+    "Postpone":   "orange",
+    "Accepted":   "green",
+    "Outsourced": "purple",
+    "Rejected":   "red",
+}
+# 행이 이보다 많으면 인접한 주문 여러 개를 한 행으로 묶어 그립니다.
+GANTT_MAX_ROWS = 1000
+# y축 눈금 라벨 최대 개수
+GANTT_MAX_TICKS = 60
+# 막대/마커가 이보다 많으면 SVG 등 vector 출력에서도 raster로 저장
+GANTT_RASTERIZE_BARS = 5000
+
+
+def plot_path(plot_dir, name, fmt="png"):
+    """
+    plot_dir가 None이면 None(화면 표시), 아니면 plot_dir/name.fmt 경로를 반환합니다. (디렉터리는 생성)
+    """
+    if plot_dir is None:
+        return None
+    os.makedirs(plot_dir, exist_ok=True)
+    return os.path.join(plot_dir, f"{name}.{fmt}")
+
 
-def plot_thompson_mean(th_history):
+def _new_figure(figsize, output_path):
+    """
+    output_path가 있으면 pyplot/디스플레이 없이 Agg canvas의 Figure를, 없으면 pyplot figure를 만듭니다.
+    """
+    if output_path:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig
+    return plt.figure(figsize=figsize)
+
+
+def _finish_figure(fig, output_path):
+    if output_path:
+        fig.savefig(output_path)
+        print(f"{output_path} 파일이 저장되었습니다.")
+    else:
+        plt.show()
+
+
+def plot_thompson_mean(th_history, output_path=None):
     """
     시뮬레이션에서 리턴받은 th_history (각 액션별 timesteps, mean)를 사용
+    output_path를 지정하면 화면에 띄우지 않고 파일(PNG/SVG 등, 확장자 기준)로 저장합니다.
     """
-    plt.figure(figsize=(12, 8))
+    fig = _new_figure((12, 8), output_path)
+    ax = fig.add_subplot()
     for a, hist in th_history.items():
-        plt.plot(hist["timesteps"], hist["mean"], label=f"{a} mean")
-    plt.xlabel("Timestep")
-    plt.ylabel("Thompson Sampling Mean")
-    plt.title("Thompson Sampling Mean Across Timesteps")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-
-def plot_gantt(orders, num_timesteps=100, title="Gantt Chart"):
-    color_map = {
-        "Postpone":   "orange",
-        "Accepted":   "green",
-        "Outsourced": "purple",
-        "Rejected":   "red",
-    }
-
-    fig, ax = plt.subplots(figsize=(15, 7))
+        ax.plot(hist["timesteps"], hist["mean"], label=f"{a} mean")
+    ax.set_xlabel("Timestep")
+    ax.set_ylabel("Thompson Sampling Mean")
+    ax.set_title("Thompson Sampling Mean Across Timesteps")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    _finish_figure(fig, output_path)
+
+
+def gantt_segments(orders, num_timesteps=100):
+    """
+    주문별 decision_history를 한 번씩만 훑어 Gantt 막대 구간을 계산합니다.
+    return: {"Accepted"/"Rejected"/"Outsourced"/"Postpone": (row, left, width) 리스트}
+            row는 order_no 오름차순 순위
+    Postpone 구간은 각 시점의 마지막 기록 액션이 Postpone인 구간 (최종 결정 시점 또는 horizon까지)입니다.
+    """
     all_no = sorted(o.order_no for o in orders)
     y_dict = {n: i for i, n in enumerate(all_no)}
+    horizon = num_timesteps + 1
+    segments = {name: [] for name in GANTT_COLORS}
 
     for o in orders:
         y_pos = y_dict[o.order_no]
+        history = list(o.decision_history)
         if o.final_action == "Accept" and o.start_time is not None and o.finish_time is not None:
-            st, fn = o.start_time, o.finish_time
-            ax.barh(y_pos, fn - st, left=st, height=0.6,
-                    color=color_map["Accepted"], edgecolor='black')
-        elif o.final_action == "Reject":
-            # Reject 시점
-            rej_t = None
-            for (tt, ac) in o.decision_history:
-                if ac == "Reject":
-                    rej_t = tt
-                    break
-            if rej_t is not None and rej_t <= num_timesteps:
-                ax.barh(y_pos, 1, left=rej_t, height=0.6,
-                        color=color_map["Rejected"], edgecolor='black')
-        elif o.final_action == "Outsource":
-            out_t = None
-            for (tt, ac) in o.decision_history:
-                if ac == "Outsource":
-                    out_t = tt
-                    break
-            if out_t is not None and out_t <= num_timesteps:
-                ax.barh(y_pos, 1, left=out_t, height=0.6,
-                        color=color_map["Outsourced"], edgecolor='black')
-
-        # Postpone 표시
-        if o.final_action in ["Accept","Reject","Outsource"]:
-            final_t = None
-            for (tt, ac) in sorted(o.decision_history, key=lambda x:x[0]):
-                if ac == o.final_action:
-                    final_t = tt
-                    break
-            if final_t is None:
-                final_t = num_timesteps+1
-        else:
-            final_t = num_timesteps+1
+            segments["Accepted"].append((y_pos, o.start_time, o.finish_time - o.start_time))
+        elif o.final_action in ["Reject", "Outsource"]:
+            act_t = next((tt for tt, ac in history if ac == o.final_action), None)
+            if act_t is not None and act_t <= num_timesteps:
+                name = "Rejected" if o.final_action == "Reject" else "Outsourced"
+                segments[name].append((y_pos, act_t, 1))
+
+        final_t = horizon
+        if o.final_action in ["Accept", "Reject", "Outsource"]:
+            final_t = next((tt for tt, ac in sorted(history, key=lambda x: x[0]) if ac == o.final_action),
+                           horizon)
+        end = min(final_t, horizon)
+
+        # 시점별 마지막 기록 액션 (history는 시간 순으로 기록됨, 같은 시점이면 나중 기록이 우선)
+        changes = []
+        for tt, ac in history:
+            if changes and changes[-1][0] == tt:
+                changes[-1] = (tt, ac)
+            else:
+                changes.append((tt, ac))
 
-        in_postpone = False
         seg_start = None
-        for ts in range(o.order_date, min(final_t, num_timesteps+1)):
-            last_a = None
-            for (tt,ac) in o.decision_history:
-                if tt <= ts:
-                    last_a = ac
-                else:
+        for tt, ac in changes:
+            if ac == "Postpone":
+                if seg_start is None and max(tt, o.order_date) < end:
+                    seg_start = max(tt, o.order_date)
+            elif seg_start is not None:
+                if tt >= end:
                     break
-            if last_a == "Postpone":
-                if not in_postpone:
-                    in_postpone = True
-                    seg_start = ts
-            else:
-                if in_postpone:
-                    ax.barh(y_pos, ts-seg_start, left=seg_start, height=0.6,
-                            color=color_map["Postpone"], edgecolor='black')
-                    in_postpone = False
-
-        # if in_postpone ...
-        if in_postpone and seg_start is not None:
-            ax.barh(y_pos, final_t-seg_start, left=seg_start, height=0.6,
-                    color=color_map["Postpone"], edgecolor='black')
-
-        # 마커
-        ax.plot(o.order_date, y_pos, marker='o', color='black', markersize=5)
-        ax.plot(o.decision_due_date, y_pos, marker='D', color='blue', markersize=5)
-        ax.plot(o.due_date, y_pos, marker='|', color='red', markersize=10)
-
-    ax.set_xlim(0, num_timesteps+1)
+                segments["Postpone"].append((y_pos, seg_start, tt - seg_start))
+                seg_start = None
+        if seg_start is not None:
+            segments["Postpone"].append((y_pos, seg_start, final_t - seg_start))
+    return segments
+
+
+def _bar_vertices(bars, height, row_scale):
+    """
+    (row, left, width) 리스트를 PolyCollection용 (n, 4, 2) 사각형 꼭짓점 배열로 변환합니다.
+    """
+    arr = np.asarray(bars, dtype=float).reshape(-1, 3)
+    y = np.floor(arr[:, 0] / row_scale)
+    left, right = arr[:, 1], arr[:, 1] + arr[:, 2]
+    bottom, top = y - height / 2, y + height / 2
+    return np.stack([np.stack([left, bottom], axis=1), np.stack([left, top], axis=1),
+                     np.stack([right, top], axis=1), np.stack([right, bottom], axis=1)], axis=1)
+
+
+def plot_gantt(orders, num_timesteps=100, title="Gantt Chart", output_path=None, max_rows=GANTT_MAX_ROWS):
+    """
+    주문별 Accept/Reject/Outsource/Postpone 구간을 Gantt 차트로 그립니다.
+      - 막대는 액션 종류별로 PolyCollection 한 개씩 그립니다.
+      - 주문이 max_rows개를 넘으면 order_no 순으로 인접한 주문 ceil(N / max_rows)개를 한 행으로 묶습니다.
+      - output_path를 지정하면 화면에 띄우지 않고 파일(PNG/SVG 등, 확장자 기준)로 저장합니다.
+    """
+    all_no = sorted(o.order_no for o in orders)
+    row_scale = max(1, math.ceil(len(all_no) / max_rows)) if max_rows else 1
+    num_rows = math.ceil(len(all_no) / row_scale)
+    segments = gantt_segments(orders, num_timesteps)
+
+    fig = _new_figure((15, 7), output_path)
+    ax = fig.add_subplot()
+    num_bars = sum(len(bars) for bars in segments.values())
+    for name in ["Accepted", "Rejected", "Outsourced", "Postpone"]:
+        if segments[name]:
+            ax.add_collection(PolyCollection(_bar_vertices(segments[name], 0.6, row_scale),
+                                             facecolors=GANTT_COLORS[name], edgecolors="black",
+                                             linewidths=0.5 if row_scale == 1 else 0.0,
+                                             rasterized=num_bars > GANTT_RASTERIZE_BARS))
+
+    # 마커
+    y_dict = {n: i // row_scale for i, n in enumerate(all_no)}
+    ys = [y_dict[o.order_no] for o in orders]
+    raster_markers = len(ys) > GANTT_RASTERIZE_BARS
+    ax.plot([o.order_date for o in orders], ys, linestyle="None", marker='o', color='black', markersize=5,
+            rasterized=raster_markers)
+    ax.plot([o.decision_due_date for o in orders], ys, linestyle="None", marker='D', color='blue', markersize=5,
+            rasterized=raster_markers)
+    ax.plot([o.due_date for o in orders], ys, linestyle="None", marker='|', color='red', markersize=10,
+            rasterized=raster_markers)
+
+    ax.set_xlim(0, num_timesteps + 1)
+    ax.set_ylim(-1, max(num_rows, 1))
     ax.set_xlabel("Timestep")
-    ax.set_ylabel("Order No.")
-    ax.set_yticks(range(len(all_no)))
-    ax.set_yticklabels(all_no)
+    ax.set_ylabel("Order No." if row_scale == 1 else f"Order No. ({row_scale} orders / row)")
+    tick_step = max(1, math.ceil(num_rows / GANTT_MAX_TICKS))
+    ticks = list(range(0, num_rows, tick_step))
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([all_no[row * row_scale] for row in ticks])
     ax.set_title(title)
 
-    import matplotlib.lines as mlines
-    legend_patches = [
-        mpatches.Patch(color=color_map["Postpone"], label="Postpone"),
-        mpatches.Patch(color=color_map["Accepted"], label="Accepted"),
-        mpatches.Patch(color=color_map["Outsourced"], label="Outsourced"),
-        mpatches.Patch(color=color_map["Rejected"], label="Rejected"),
-    ]
+    legend_patches = [mpatches.Patch(color=GANTT_COLORS[name], label=name) for name in GANTT_COLORS]
     od_marker = mlines.Line2D([], [], marker='o', color='black', linestyle='None',
                               markersize=5, label='OrderDate')
     ddd_marker = mlines.Line2D([], [], marker='D', color='blue', linestyle='None',
@@ -119,5 +188,5 @@ def plot_gantt(orders, num_timesteps=100, title="Gantt Chart"):
     ax.legend(handles=legend_patches + [od_marker, ddd_marker, due_marker],
               bbox_to_anchor=(1.05, 1), loc='upper left')
 
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    fig.tight_layout()
+    _finish_figure(fig, output_path)
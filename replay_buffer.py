@@ -0,0 +1,145 @@
+import os
+import tempfile
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    (context, reward) 관측치를 저장하는 배열 기반 replay buffer.
+      - X (n x dim), y (n,)를 미리 할당한 float64 배열에 저장하고, 가득 차면 두 배로 늘립니다.
+      - max_size에 도달하면 eviction 방식에 따라 오래된 관측치를 버립니다.
+          "window"    : 가장 오래된 관측치를 덮어쓰는 sliding window (ring buffer)
+          "reservoir" : 지금까지 본 관측치 전체에서 균등 표본을 유지하는 reservoir sampling
+      - mmap_dir를 지정하면 배열을 해당 디렉터리의 memory-mapped 파일에 둡니다.
+      - weight_dim > 0이면 관측치마다 가중치 벡터 w (n x weight_dim)를 함께 저장합니다.
+    X, y, w 속성은 유효 구간의 view를 반환하므로 복사 없이 읽을 수 있습니다.
+    (window 모드에서 가득 찬 이후에는 행 순서가 시간 순서와 다를 수 있습니다.)
+    """
+
+    def __init__(self, dim, max_size=None, eviction="window", initial_capacity=64, mmap_dir=None, weight_dim=0):
+        if eviction not in ["window", "reservoir"]:
+            raise ValueError("Unknown eviction policy: " + eviction)
+        self.dim = dim
+        self.max_size = max_size
+        self.eviction = eviction
+        self.initial_capacity = initial_capacity
+        self.mmap_dir = mmap_dir
+        self.weight_dim = weight_dim
+        self._files = []
+        self._allocate(self._initial_capacity())
+
+    def _initial_capacity(self):
+        if self.max_size is None:
+            return self.initial_capacity
+        return max(1, min(self.initial_capacity, self.max_size))
+
+    def _new_array(self, shape):
+        if self.mmap_dir is None:
+            return np.zeros(shape, dtype=np.float64)
+        os.makedirs(self.mmap_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".npy", prefix="replay_", dir=self.mmap_dir)
+        os.close(fd)
+        self._files.append(path)
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+
+    def _release_files(self, keep=0):
+        while len(self._files) > keep:
+            path = self._files.pop(0)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _allocate(self, capacity):
+        self._release_files()
+        self._X = self._new_array((capacity, self.dim))
+        self._y = self._new_array((capacity,))
+        self._w = self._new_array((capacity, self.weight_dim)) if self.weight_dim else None
+        self._size = 0
+        self._next = 0
+        self._seen = 0
+        self._y_sum = 0.0
+
+    def _grow(self):
+        capacity = len(self._y) * 2
+        if self.max_size is not None:
+            capacity = min(capacity, self.max_size)
+        old_files = len(self._files)
+        X, y = self._new_array((capacity, self.dim)), self._new_array((capacity,))
+        X[:self._size] = self._X[:self._size]
+        y[:self._size] = self._y[:self._size]
+        if self._w is not None:
+            w = self._new_array((capacity, self.weight_dim))
+            w[:self._size] = self._w[:self._size]
+            self._w = w
+        self._X, self._y = X, y
+        # 이전 memory-mapped 파일 정리 (새로 만든 파일만 유지)
+        self._release_files(keep=len(self._files) - old_files)
+
+    def _write(self, i, x, y, w):
+        self._X[i] = x
+        self._y[i] = y
+        if self._w is not None:
+            self._w[i] = 0.0 if w is None else w
+
+    def append(self, x, y, w=None):
+        """
+        관측치 하나를 추가합니다.
+        return: 저장된 행 index (reservoir 모드에서 버려진 경우 None)
+        """
+        self._seen += 1
+        if self._size == len(self._y) and (self.max_size is None or self._size < self.max_size):
+            self._grow()
+
+        if self._size < len(self._y):
+            i = self._size
+            self._size += 1
+        elif self.eviction == "window":
+            i = self._next
+            self._next = (self._next + 1) % self._size
+            self._y_sum -= self._y[i]
+        else:
+            j = np.random.randint(0, self._seen)
+            if j >= self._size:
+                return None
+            i = j
+            self._y_sum -= self._y[i]
+
+        self._write(i, x, y, w)
+        self._y_sum += y
+        return i
+
+    def clear(self):
+        self._allocate(self._initial_capacity())
+
+    def close(self):
+        self._X = self._y = self._w = None
+        self._release_files()
+
+    def __del__(self):
+        # memory-mapped 임시 파일이 남지 않도록 정리
+        if getattr(self, "_files", None):
+            self.close()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def seen(self):
+        return self._seen
+
+    @property
+    def X(self):
+        return self._X[:self._size]
+
+    @property
+    def y(self):
+        return self._y[:self._size]
+
+    @property
+    def w(self):
+        return None if self._w is None else self._w[:self._size]
+
+    def mean(self, default=0.5):
+        """
+        저장된 reward의 평균 (O(1))
+        """
+        return self._y_sum / self._size if self._size else default
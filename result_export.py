@@ -0,0 +1,186 @@
+import os
+
+import pandas as pd
+
+from config import PENALTY, OUTSOURCE_FRACTION
+
+ORDER_COLUMNS = ["OrderNo", "OrderDate", "DecisionDueDate", "ModelName", "ProcessingTime", "DueDate", "Revenue",
+                 "FinalAction", "StartTime", "FinishTime", "CalculatedRevenue", "ClaimOccurred", "Claim", "Cause",
+                 "Position"]
+TIMESTEP_COLUMNS = ["Timestep", "NumActiveOrders", "ActiveOrders", "NumRunningOrders", "MachineStatus"]
+
+EXPORT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+DEFAULT_BATCH_SIZE = 65536
+
+
+def result_path(stem, fmt="csv"):
+    """
+    예: result_path("order_data_random", "parquet") -> "order_data_random.parquet"
+    """
+    return f"{stem}.{fmt}"
+
+
+def _calculated_revenue(o):
+    if o.final_action == "Accept":
+        if o.finish_time is not None and o.finish_time <= o.due_date:
+            return o.revenue
+        return o.revenue - PENALTY
+    if o.final_action == "Outsource":
+        return o.revenue * OUTSOURCE_FRACTION
+    return "N/A"
+
+
+def _claim_occurred(o):
+    if o.final_action in ["Accept", "Outsource"]:
+        return "Yes" if getattr(o, "claim_occurred", False) else "No"
+    return "N/A"
+
+
+def order_columns(orders, calculated_revenue=None, final_actions=None):
+    """
+    주문 목록을 ORDER_COLUMNS 순서의 {컬럼 이름: 값 리스트} dict로 만듭니다. (주문별 dict를 만들지 않음)
+    calculated_revenue: 주문별 CalculatedRevenue (None이면 final_action/finish_time 기준으로 계산)
+    final_actions     : 주문별 FinalAction 표시값 (None이면 o.final_action)
+    """
+    return {
+        "OrderNo": [o.order_no for o in orders],
+        "OrderDate": [o.order_date for o in orders],
+        "DecisionDueDate": [o.decision_due_date for o in orders],
+        "ModelName": [o.model_name for o in orders],
+        "ProcessingTime": [o.processing_time for o in orders],
+        "DueDate": [o.due_date for o in orders],
+        "Revenue": [o.revenue for o in orders],
+        "FinalAction": list(final_actions) if final_actions is not None else [o.final_action for o in orders],
+        "StartTime": [o.start_time for o in orders],
+        "FinishTime": [o.finish_time for o in orders],
+        "CalculatedRevenue": (list(calculated_revenue) if calculated_revenue is not None
+                              else [_calculated_revenue(o) for o in orders]),
+        "ClaimOccurred": [_claim_occurred(o) for o in orders],
+        "Claim": [getattr(o, "claim", "N/A") for o in orders],
+        "Cause": [getattr(o, "cause", "N/A") for o in orders],
+        "Position": [getattr(o, "position", "N/A") for o in orders],
+    }
+
+
+def timestep_columns(timestep_logs):
+    """
+    simulate()의 timestep_logs를 TIMESTEP_COLUMNS 순서의 컬럼 dict로 만듭니다.
+    ActiveOrders는 공백 구분 OrderNo, MachineStatus는 "OrderNo:남은시간" 공백 구분 문자열입니다.
+    """
+    return {
+        "Timestep": [log["timestep"] for log in timestep_logs],
+        "NumActiveOrders": [len(log["active_orders"]) for log in timestep_logs],
+        "ActiveOrders": [" ".join(map(str, log["active_orders"])) for log in timestep_logs],
+        "NumRunningOrders": [len(log["machine_status"]) for log in timestep_logs],
+        "MachineStatus": [" ".join(f"{no}:{rem}" for no, rem in log["machine_status"].items())
+                          for log in timestep_logs],
+    }
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow 저장에는 pyarrow가 필요합니다: pip install pyarrow") from e
+    return pyarrow
+
+
+class ResultWriter:
+    """
+    컬럼 batch 단위로 결과 파일을 씁니다.
+      - csv    : pandas로 batch마다 이어쓰기 (첫 batch만 header)
+      - parquet: batch마다 row group 1개 (pyarrow.parquet.ParquetWriter)
+      - arrow  : Arrow IPC file format (pyarrow.ipc.new_file)
+    fmt가 None이면 파일 확장자로 정합니다. 스키마는 첫 batch 기준입니다.
+    """
+
+    def __init__(self, path, fmt=None):
+        if fmt is None:
+            fmt = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+        if fmt not in ["csv", "parquet", "arrow"]:
+            raise ValueError("Unknown export format: " + fmt)
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._writer = None
+        self._sink = None
+        self._schema = None
+        self._string_columns = []
+        if fmt == "csv":
+            # 같은 이름의 이전 결과 파일을 덮어씀
+            open(path, "w").close()
+        else:
+            self._pa = _import_pyarrow()
+
+    def write_batch(self, columns):
+        df = pd.DataFrame(columns)
+        if self.fmt == "csv":
+            df.to_csv(self.path, mode="a", header=self.rows == 0, index=False)
+        else:
+            pa = self._pa
+            if self._schema is None:
+                # 숫자/문자열이 섞인 컬럼(CalculatedRevenue의 "N/A" 등)은 문자열로 저장
+                self._schema = pa.Table.from_pandas(self._normalize(df), preserve_index=False).schema
+                self._string_columns = [f.name for f in self._schema
+                                        if pa.types.is_string(f.type) or pa.types.is_large_string(f.type)]
+            df = self._normalize(df, self._string_columns)
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                if self.fmt == "parquet":
+                    self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+                else:
+                    self._sink = pa.OSFile(self.path, "wb")
+                    self._writer = pa.ipc.new_file(self._sink, self._schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    @staticmethod
+    def _normalize(df, string_columns=()):
+        for name in df.columns:
+            if name in string_columns or df[name].dtype == object and len(
+                    {type(v) for v in df[name] if v is not None}) > 1:
+                df[name] = df[name].map(lambda v: None if v is None or v != v else str(v)).astype(object)
+        return df
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_orders(orders, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE, calculated_revenue=None,
+                  final_actions=None):
+    """
+    주문 결과를 batch_size개씩 컬럼 batch로 나누어 저장합니다. (order_columns 참고)
+    return: 저장한 행 수
+    """
+    with ResultWriter(path, fmt) as writer:
+        for start in range(0, max(len(orders), 1), batch_size):
+            end = start + batch_size
+            writer.write_batch(order_columns(
+                orders[start:end],
+                calculated_revenue=calculated_revenue[start:end] if calculated_revenue is not None else None,
+                final_actions=final_actions[start:end] if final_actions is not None else None))
+        return writer.rows
+
+
+def export_timestep_logs(timestep_logs, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    timestep 로그를 batch_size개씩 컬럼 batch로 나누어 저장합니다. (timestep_columns 참고)
+    return: 저장한 행 수
+    """
+    with ResultWriter(path, fmt) as writer:
+        for start in range(0, max(len(timestep_logs), 1), batch_size):
+            writer.write_batch(timestep_columns(timestep_logs[start:start + batch_size]))
+        return writer.rows
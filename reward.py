@@ -1,32 +1,71 @@
 import statistics
 from config import CLAIM_PROCESSING_COST, OUTSOURCE_FRACTION, PENALTY
 from data_generation import model_info
+from streaming_stats import RunningStats, KeyedCounter
 
-# 전역 변수: 지금까지의 주문 reward를 기록 (기존)
-order_reward_history = []
+# 전역 변수: 지금까지의 주문 reward 통계 (값 목록 대신 O(1) 스트리밍 통계로 유지)
+order_reward_stats = RunningStats()
 
-# 새로운 전역 변수: 실제 주문의 revenue를 기록 (평균 revenue 계산용)
-order_revenue_list = []
+# 실제 주문의 revenue 통계 (평균 revenue 계산용)
+order_revenue_stats = RunningStats()
 
-# 모델별 주문 수와 claim 발생 건수를 기록하는 전역 딕셔너리
-model_order_count = {}  # key: model_name, value: 주문 건수
-model_claim_count = {}  # key: model_name, value: claim 발생 건수
+# 평균 revenue 계산 방식: "cumulative"(전체 평균), "ewma"(지수이동평균), "window"(최근 window개 평균)
+AVERAGE_REVENUE_MODES = ["cumulative", "ewma", "window"]
+AVERAGE_REVENUE_MODE = {"mode": "cumulative"}
+
+# 모델별 주문 수와 claim 발생 건수를 기록하는 전역 카운터
+model_order_count = KeyedCounter()  # key: model_name, value: 주문 건수
+model_claim_count = KeyedCounter()  # key: model_name, value: claim 발생 건수
 
 # data_generation.py의 model_info를 기반으로 초기 평균 revenue 계산
 initial_revenues = [info[1] for info in model_info.values()]
 baseline_average_revenue = sum(initial_revenues) / len(initial_revenues)
 
 
+def configure_reward_stats(mode="cumulative", ewma_alpha=0.1, window=50):
+    """
+    평균 revenue 계산 방식을 설정하고 통계를 초기화합니다.
+    mode: "cumulative" | "ewma" | "window"
+    """
+    if mode not in AVERAGE_REVENUE_MODES:
+        raise ValueError("Unknown average revenue mode: " + mode)
+    AVERAGE_REVENUE_MODE["mode"] = mode
+    # 다른 모듈이 이름으로 참조할 수 있으므로 객체를 새로 만들지 않고 설정만 바꿉니다.
+    order_revenue_stats.configure(ewma_alpha=ewma_alpha if mode == "ewma" else None,
+                                  window=window if mode == "window" else None)
+    reset_reward_state()
+
+
+def reset_reward_state():
+    """
+    reward / revenue 통계와 모델별 카운터를 비웁니다. (실행 단위 초기화용)
+    """
+    order_reward_stats.reset()
+    order_revenue_stats.reset()
+    model_order_count.reset()
+    model_claim_count.reset()
+
+
+def reward_stats_snapshot():
+    """
+    보고용으로 현재 reward / revenue 통계와 모델별 카운터를 dict로 반환합니다.
+    """
+    return {
+        "reward": order_reward_stats.snapshot(),
+        "revenue": order_revenue_stats.snapshot(),
+        "average_revenue_mode": AVERAGE_REVENUE_MODE["mode"],
+        "model_order_count": model_order_count.snapshot(),
+        "model_claim_count": model_claim_count.snapshot(),
+    }
+
+
 def update_order_reward_history(reward, model_name):
     """
     최종적으로 결정된 주문의 reward를 전역 history에 추가하고,
     해당 주문의 model_name에 대해 주문 건수를 업데이트합니다.
     """
-    order_reward_history.append(reward)
-    if model_name in model_order_count:
-        model_order_count[model_name] += 1
-    else:
-        model_order_count[model_name] = 1
+    order_reward_stats.push(reward)
+    model_order_count.increment(model_name)
 
 
 def update_order_revenue_history(o):
@@ -34,28 +73,28 @@ def update_order_revenue_history(o):
     주문 o의 revenue를 기록합니다.
     Accept, Outsource, Reject 등에서 처리된 주문의 revenue를 저장합니다.
     """
-    order_revenue_list.append(o.revenue)
+    order_revenue_stats.push(o.revenue)
 
 
 def update_model_claim_count(model_name):
     """
     해당 모델에 대해 claim 발생 건수를 업데이트합니다.
     """
-    if model_name in model_claim_count:
-        model_claim_count[model_name] += 1
-    else:
-        model_claim_count[model_name] = 1
+    model_claim_count.increment(model_name)
 
 
 def get_average_revenue():
     """
     지금까지의 한 order당 평균 revenue를 계산합니다.
     만약 기록이 없다면 data_generation.py의 model_info 기반 초기값(baseline_average_revenue)을 반환합니다.
+    AVERAGE_REVENUE_MODE에 따라 전체 평균 / EWMA / 최근 window 평균 중 하나를 O(1)로 반환합니다.
     """
-    if order_revenue_list:
-        return sum(order_revenue_list) / len(order_revenue_list)
-    else:
-        return baseline_average_revenue
+    mode = AVERAGE_REVENUE_MODE["mode"]
+    if mode == "ewma":
+        return order_revenue_stats.ewma(default=baseline_average_revenue)
+    if mode == "window":
+        return order_revenue_stats.window_mean(default=baseline_average_revenue)
+    return order_revenue_stats.mean(default=baseline_average_revenue)
 
 
 def estimate_reward(o, act, t, available_ratio,
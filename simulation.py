@@ -1,18 +1,192 @@
+import heapq
 import random
-from config import NUM_TIMESTEPS, MACHINE_CAPACITY, CLAIM_PROCESSING_COST, CLAIM_PROB_PER_MODEL
+from config import NUM_TIMESTEPS, MACHINE_CAPACITY
 from thompson_sampling import ACTIONS, action_params, thompson_sampling_select_action, update_thompson_params, \
-    treebootstrap_select_action, update_treebootstrap_params, tree_data
+    treebootstrap_select_action, update_treebootstrap_params, tree_data, online_tree_bootstrap, \
+    online_treebootstrap_select_action, update_online_treebootstrap_params, thompson_sampling_select_actions, \
+    treebootstrap_select_actions, online_treebootstrap_select_actions, linear_thompson, lints_select_action, \
+    lints_select_actions, update_lints_params
 from reward import estimate_reward
+from claim_engine import draw_order_claims
 
 
 # (기타 필요한 모듈 임포트)
 
-def simulate(orders, num_timesteps=NUM_TIMESTEPS, random_policy=False, policy="contextual", claim_callback=None):
+def _order_context(o, t, available_ratio):
+    return [t, available_ratio, o.order_date, o.decision_due_date, o.processing_time, o.due_date,
+            o.revenue, o.risk]
+
+
+def _propose_actions(decision_needed, t, available_ratio, random_policy, policy):
+    """
+    batch 선택 모드: timestep t에 결정이 필요한 모든 주문의 액션을 정책에서 한 번에 뽑습니다.
+    context 행렬을 만들어 액션마다 한 번만 학습/샘플링하고 전체를 예측합니다.
+    return: 주문별 제안 액션 리스트 (batch 선택을 지원하지 않는 정책이면 None)
+    """
+    if random_policy or not decision_needed:
+        return None
+    if policy == "contextual":
+        return thompson_sampling_select_actions(len(decision_needed))
+    contexts = [_order_context(o, t, available_ratio) for o in decision_needed]
+    if policy == "treebootstrap":
+        return treebootstrap_select_actions(contexts)
+    if policy == "online_treebootstrap":
+        return online_treebootstrap_select_actions(contexts)
+    if policy == "lints":
+        return lints_select_actions(contexts)
+    return None
+
+
+def _decide_order(o, t, available_ratio, machine_busy, overdue, random_policy, policy,
+                  max_new_order_revenue, last_reject_revenue, proposed_action=None):
+    """
+    주문 o 하나에 대한 액션을 선택하고 reward 추정 및 정책 파라미터 업데이트까지 수행합니다.
+    scan/event 두 엔진이 동일한 의사결정 로직을 공유하도록 분리한 함수입니다.
+    machine_busy   : 현재 가동 중인 머신 수
+    overdue        : 결정 마감일(t >= decision_due_date)이 지났는지 여부
+    proposed_action: batch 선택 모드에서 미리 뽑아 둔 액션 (None이면 주문마다 정책 호출)
+    return: 최종 선택된 액션
+    """
+    # 결정 마감일 이전에는 모든 액션이 가능, 그 이후에는 일부 제한
+    if overdue:
+        possible_acts = ["Accept", "Reject", "Outsource"]
+    else:
+        possible_acts = ACTIONS[:]
+
+    # 정책에 따른 액션 선택
+    if random_policy:
+        act = random.choice(possible_acts)
+    else:
+        if proposed_action is not None:
+            act = proposed_action
+            if act not in possible_acts:
+                act = random.choice(possible_acts)
+        elif policy == "contextual":
+            act = thompson_sampling_select_action()
+            if act not in possible_acts:
+                act = random.choice(possible_acts)
+        elif policy == "treebootstrap":
+            act = treebootstrap_select_action(_order_context(o, t, available_ratio))
+            if act not in possible_acts:
+                act = random.choice(possible_acts)
+        elif policy == "online_treebootstrap":
+            act = online_treebootstrap_select_action(_order_context(o, t, available_ratio))
+            if act not in possible_acts:
+                act = random.choice(possible_acts)
+        elif policy == "lints":
+            act = lints_select_action(_order_context(o, t, available_ratio))
+            if act not in possible_acts:
+                act = random.choice(possible_acts)
+        else:
+            act = random.choice(possible_acts)
+
+    # 머신 용량 초과시 Accept 대신 다른 액션 선택
+    if act == "Accept" and machine_busy >= MACHINE_CAPACITY:
+        if overdue:
+            act = "Reject"
+        else:
+            act = "Postpone"
+
+    o.decision_history.append((t, act))
+
+    # estimate_reward 호출 시, 새로 도착한 주문의 최대 revenue와 최근 reject 주문의 revenue를 전달
+    reward_est = estimate_reward(o, act, t, available_ratio, max_new_order_revenue, last_reject_revenue)
+
+    # 정책별 파라미터 업데이트
+    if not random_policy:
+        if policy == "contextual":
+            update_thompson_params(act, reward_est)
+        elif policy == "treebootstrap":
+            update_treebootstrap_params(act, _order_context(o, t, available_ratio), reward_est)
+        elif policy == "online_treebootstrap":
+            update_online_treebootstrap_params(act, _order_context(o, t, available_ratio), reward_est)
+        elif policy == "lints":
+            update_lints_params(act, _order_context(o, t, available_ratio), reward_est)
+
+    return act
+
+
+def _thompson_means(random_policy, policy):
+    """
+    현재 시점의 액션별 Thompson Sampling 평균값을 반환합니다.
+    """
+    means = {}
+    for a in ACTIONS:
+        if not random_policy:
+            if policy == "contextual":
+                means[a] = action_params[a]["mean"]
+            elif policy == "treebootstrap":
+                means[a] = tree_data[a].mean()
+            elif policy == "online_treebootstrap":
+                means[a] = online_tree_bootstrap.mean(a)
+            elif policy == "lints":
+                means[a] = linear_thompson.mean(a)
+            else:
+                means[a] = None
+        else:
+            means[a] = 0.5
+    return means
+
+
+def _append_thompson_history(history, t, means):
+    for a in ACTIONS:
+        history[a]["timesteps"].append(t)
+        if means[a] is not None:
+            history[a]["mean"].append(means[a])
+
+
+def _max_revenue_by_ts(orders_by_ts, t):
+    # t 시점에 도착하는 주문들 중 최대 revenue 계산 (없으면 None)
+    future_orders = orders_by_ts.get(t)
+    if future_orders:
+        return max(o_tmp.revenue for o_tmp in future_orders)
+    return None
+
+
+def _finalize_orders(orders, num_timesteps, claim_callback):
+    """
+    시뮬레이션 종료 후 처리: 생산 중인 Accept 주문의 finish_time 처리 및 claim 후처리.
+    return: total_claim_cost
+    """
+    # 생산 중인 Accept 주문에 대해 시뮬레이션 종료 후 finish_time 처리
+    for o in orders:
+        if o.final_action == "Accept" and not o.is_completed:
+            o.finish_time = num_timesteps
+            o.is_completed = True
+
+    # Claim 후처리: Accept 주문에 대해 확률적으로 claim 처리
+    fulfilled = [o for o in orders if o.final_action == "Accept" and o.finish_time is not None]
+    flags, total_claim_cost = draw_order_claims(fulfilled)
+    # claim 처리 관련 추가 로직이 있을 경우 호출
+    if claim_callback:
+        for o, flag in zip(fulfilled, flags):
+            if flag:
+                claim_callback(o)
+
+    return total_claim_cost
+
+
+def simulate(orders, num_timesteps=NUM_TIMESTEPS, random_policy=False, policy="contextual", claim_callback=None,
+             engine="scan", batch_select=False, telemetry=None):
     """
     시뮬레이션 실행
+    engine: "scan"  - 매 timestep마다 전체 주문을 순회하는 기존 방식
+            "event" - 이벤트 기반 방식 (simulate_event_driven 참고). 동일한 결과를 반환합니다.
+    batch_select: True이면 timestep마다 결정이 필요한 주문 전체의 액션을 정책에서 한 번에 선택합니다.
+                  (같은 timestep 안의 주문들은 timestep 시작 시점의 정책 파라미터로 선택되고,
+                   파라미터 업데이트는 기존과 같이 주문별로 수행됩니다.)
+    telemetry: TelemetryRecorder를 지정하면 timestep 로그 / Thompson mean을 recorder에 sample 간격으로 기록하고,
+               반환하는 timestep_logs / th_history는 recorder에 남아 있는 sample로 복원합니다.
     return: (timestep_logs, th_history, total_claim_cost)
            total_claim_cost: 모든 주문에서 실제 claim 발생 시 차감된 총 비용
     """
+    if engine == "event":
+        return simulate_event_driven(orders, num_timesteps=num_timesteps, random_policy=random_policy,
+                                     policy=policy, claim_callback=claim_callback, batch_select=batch_select,
+                                     telemetry=telemetry)
+    if engine != "scan":
+        raise ValueError("Unknown simulation engine: " + engine)
+
     local_thompson_history = {a: {"timesteps": [], "mean": []} for a in ACTIONS}
 
     machine_status = {}
@@ -59,60 +233,16 @@ def simulate(orders, num_timesteps=NUM_TIMESTEPS, random_policy=False, policy="c
         available_ratio = (MACHINE_CAPACITY - len(machine_status)) / MACHINE_CAPACITY
 
         # t+1 시점에 도착하는 주문들 중 최대 revenue 계산 (없으면 None)
-        if (t + 1) in orders_by_ts:
-            future_orders = orders_by_ts[t + 1]
-            if future_orders:
-                max_new_order_revenue = max(o_tmp.revenue for o_tmp in future_orders)
-            else:
-                max_new_order_revenue = None
-        else:
-            max_new_order_revenue = None
+        max_new_order_revenue = _max_revenue_by_ts(orders_by_ts, t + 1)
 
-        for o in decision_needed:
-            # 결정 마감일 이전에는 모든 액션이 가능, 그 이후에는 일부 제한
-            if t >= o.decision_due_date:
-                possible_acts = ["Accept", "Reject", "Outsource"]
-            else:
-                possible_acts = ACTIONS[:]
-
-            # 정책에 따른 액션 선택
-            if random_policy:
-                act = random.choice(possible_acts)
-            else:
-                if policy == "contextual":
-                    act = thompson_sampling_select_action()
-                    if act not in possible_acts:
-                        act = random.choice(possible_acts)
-                elif policy == "treebootstrap":
-                    context = [t, available_ratio, o.order_date, o.decision_due_date, o.processing_time, o.due_date,
-                               o.revenue, o.risk]
-                    act = treebootstrap_select_action(context)
-                    if act not in possible_acts:
-                        act = random.choice(possible_acts)
-                else:
-                    act = random.choice(possible_acts)
+        proposed = None
+        if batch_select:
+            proposed = _propose_actions(decision_needed, t, available_ratio, random_policy, policy)
 
-            # 머신 용량 초과시 Accept 대신 다른 액션 선택
-            if act == "Accept" and len(machine_status) >= MACHINE_CAPACITY:
-                if t >= o.decision_due_date:
-                    act = "Reject"
-                else:
-                    act = "Postpone"
-
-            o.decision_history.append((t, act))
-
-            # estimate_reward 호출 시, 새로 도착한 주문의 최대 revenue와 최근 reject 주문의 revenue를 전달
-            reward_est = estimate_reward(o, act, t, available_ratio, max_new_order_revenue, last_reject_revenue)
-
-            # 정책별 파라미터 업데이트
-            if not random_policy:
-                if policy == "contextual":
-                    update_thompson_params(act, reward_est)
-                elif policy == "treebootstrap":
-                    # context가 필요한 경우
-                    context = [t, available_ratio, o.order_date, o.decision_due_date, o.processing_time, o.due_date,
-                               o.revenue, o.risk]
-                    update_treebootstrap_params(act, context, reward_est)
+        for i, o in enumerate(decision_needed):
+            act = _decide_order(o, t, available_ratio, len(machine_status), t >= o.decision_due_date,
+                                random_policy, policy, max_new_order_revenue, last_reject_revenue,
+                                proposed[i] if proposed else None)
 
             # Reject 액션의 경우, 최근 reject 주문의 revenue 업데이트
             if act == "Reject":
@@ -128,45 +258,161 @@ def simulate(orders, num_timesteps=NUM_TIMESTEPS, random_policy=False, policy="c
                     o.is_completed = True
 
         # 각 timestep마다 Thompson Sampling 관련 정보 업데이트
-        for a in ACTIONS:
-            local_thompson_history[a]["timesteps"].append(t)
-            if not random_policy:
-                if policy == "contextual":
-                    local_thompson_history[a]["mean"].append(action_params[a]["mean"])
-                elif policy == "treebootstrap":
-                    data = tree_data[a]
-                    if len(data["y"]) > 0:
-                        avg = sum(data["y"]) / len(data["y"])
-                        local_thompson_history[a]["mean"].append(avg)
-                    else:
-                        local_thompson_history[a]["mean"].append(0.5)
-            else:
-                local_thompson_history[a]["mean"].append(0.5)
+        if telemetry is None:
+            _append_thompson_history(local_thompson_history, t, _thompson_means(random_policy, policy))
 
-        timestep_logs.append({
-            "timestep": t,
-            "active_orders": [od.order_no for od in decision_needed],
-            "machine_status": dict(machine_status)
-        })
+            timestep_logs.append({
+                "timestep": t,
+                "active_orders": [od.order_no for od in decision_needed],
+                "machine_status": dict(machine_status)
+            })
+        elif telemetry.step(t, len(decision_needed), len(machine_status)):
+            telemetry.record(t, [od.order_no for od in decision_needed], machine_status,
+                             _thompson_means(random_policy, policy))
 
-    # 생산 중인 Accept 주문에 대해 시뮬레이션 종료 후 finish_time 처리
-    for o in orders:
-        if o.final_action == "Accept" and not o.is_completed:
-            o.finish_time = num_timesteps
-            o.is_completed = True
+    if telemetry is not None:
+        timestep_logs = telemetry.timestep_logs()
+        local_thompson_history = telemetry.thompson_history()
 
-    # Claim 후처리: Accept 주문에 대해 확률적으로 claim 처리
-    total_claim_cost = 0.0
-    for o in orders:
-        if o.final_action == "Accept" and o.finish_time is not None:
-            claim_prob = CLAIM_PROB_PER_MODEL.get(o.model_name, 0.0)
-            if random.random() < claim_prob:
-                total_claim_cost += CLAIM_PROCESSING_COST
-                CLAIM_PROB_PER_MODEL[o.model_name] = min(1.0, claim_prob + 0.01)
-                # claim 처리 관련 추가 로직이 있을 경우 호출
-                if claim_callback:
-                    claim_callback(o)
+    total_claim_cost = _finalize_orders(orders, num_timesteps, claim_callback)
+
+    return timestep_logs, local_thompson_history, total_claim_cost
+
+
+def simulate_event_driven(orders, num_timesteps=NUM_TIMESTEPS, random_policy=False, policy="contextual",
+                          claim_callback=None, batch_select=False, telemetry=None):
+    """
+    이벤트 기반 시뮬레이션 엔진.
+    매 timestep마다 전체 주문을 훑는 대신 아래 자료구조만 갱신합니다.
+      - pending     : 도착했지만 아직 최종 결정되지 않은 주문 (orders 리스트 순서 유지)
+      - completion  : 생산 완료 시점 기준 min-heap
+      - deadline    : decision_due_date 기준 min-heap (마감이 지난 주문 집합 관리)
+      - order_index : order_no -> Order
+    대기 주문도, 도착/완료 이벤트도 없는 idle 구간은 건너뛰고 로그만 채웁니다.
+    같은 seed에서 simulate(engine="scan")과 동일한 결정과 timestep_logs를 만듭니다.
+    """
+    local_thompson_history = {a: {"timesteps": [], "mean": []} for a in ACTIONS}
+
+    orders_by_ts = {}
+    order_index = {}
+    position = {}
+    for idx, o in enumerate(orders):
+        orders_by_ts.setdefault(o.order_date, []).append(o)
+        order_index.setdefault(o.order_no, o)
+        position[id(o)] = idx
+    arrival_times = sorted(ts for ts in orders_by_ts if 0 <= ts <= num_timesteps)
+    next_arrival = 0
+
+    # 가동 중인 주문: order_no -> 가공 종료 예정 시점 (남은 처리시간 = end - t)
+    running = {}
+    completion = []
+    deadline = []
+    overdue = set()
+    pending = []
+
+    timestep_logs = []
+    last_reject_revenue = None
+
+    t = 0
+    while t <= num_timesteps:
+        # 신규 주문 도착 처리
+        if next_arrival < len(arrival_times) and arrival_times[next_arrival] == t:
+            next_arrival += 1
+            arrived = [(position[id(o)], o) for o in orders_by_ts[t]
+                       if not o.is_completed and o.final_action not in ["Accept", "Reject", "Outsource"]]
+            for o in orders_by_ts[t]:
+                o.decision_history.append((t, "Arrived"))
+            for _, o in arrived:
+                heapq.heappush(deadline, (o.decision_due_date, position[id(o)], o))
+            pending = sorted(pending + arrived, key=lambda item: item[0])
+
+        # 완료 주문 처리
+        while completion and completion[0][0] <= t:
+            _, _, onum = heapq.heappop(completion)
+            del running[onum]
+            fo_obj = order_index.get(onum)
+            if fo_obj:
+                fo_obj.finish_time = t
+                fo_obj.is_completed = True
+
+        # 결정 마감이 지난 주문 갱신
+        while deadline and deadline[0][0] <= t:
+            o = heapq.heappop(deadline)[2]
+            if o.final_action is None:
+                overdue.add(id(o))
+
+        decision_needed = [o for _, o in pending]
+        available_ratio = (MACHINE_CAPACITY - len(running)) / MACHINE_CAPACITY
+        max_new_order_revenue = _max_revenue_by_ts(orders_by_ts, t + 1)
+
+        proposed = None
+        if batch_select:
+            proposed = _propose_actions(decision_needed, t, available_ratio, random_policy, policy)
+
+        still_pending = []
+        for i, item in enumerate(pending):
+            o = item[1]
+            act = _decide_order(o, t, available_ratio, len(running), id(o) in overdue, random_policy, policy,
+                                max_new_order_revenue, last_reject_revenue, proposed[i] if proposed else None)
+
+            if act == "Reject":
+                last_reject_revenue = o.revenue
+
+            if act != "Postpone":
+                o.final_action = act
+                overdue.discard(id(o))
+                if act == "Accept":
+                    o.start_time = t
+                    end = t + o.processing_time
+                    running[o.order_no] = end
+                    # 기존 루프는 다음 timestep부터 남은 처리시간을 차감하므로 최소 1 timestep 이후 완료
+                    heapq.heappush(completion, (max(end, t + 1), position[id(o)], o.order_no))
+                else:
+                    o.is_completed = True
             else:
-                CLAIM_PROB_PER_MODEL[o.model_name] = max(0.0, claim_prob - 0.005)
+                still_pending.append(item)
+        pending = still_pending
+
+        means = _thompson_means(random_policy, policy)
+        if telemetry is None:
+            _append_thompson_history(local_thompson_history, t, means)
+            timestep_logs.append({
+                "timestep": t,
+                "active_orders": [od.order_no for od in decision_needed],
+                "machine_status": {onum: end - t for onum, end in running.items()}
+            })
+        elif telemetry.step(t, len(decision_needed), len(running)):
+            telemetry.record(t, [od.order_no for od in decision_needed],
+                             {onum: end - t for onum, end in running.items()}, means)
+
+        # 다음 이벤트 시점 계산: 대기 주문이 있으면 바로 다음 timestep, 없으면 도착/완료 중 빠른 시점
+        if pending:
+            next_t = t + 1
+        else:
+            candidates = [num_timesteps + 1]
+            if next_arrival < len(arrival_times):
+                candidates.append(arrival_times[next_arrival])
+            if completion:
+                candidates.append(completion[0][0])
+            next_t = max(t + 1, min(candidates))
+
+        # idle 구간: 결정도 상태 변화도 없으므로 로그만 채움
+        for idle_t in range(t + 1, min(next_t, num_timesteps + 1)):
+            if telemetry is None:
+                _append_thompson_history(local_thompson_history, idle_t, means)
+                timestep_logs.append({
+                    "timestep": idle_t,
+                    "active_orders": [],
+                    "machine_status": {onum: end - idle_t for onum, end in running.items()}
+                })
+            elif telemetry.step(idle_t, 0, len(running)):
+                telemetry.record(idle_t, [], {onum: end - idle_t for onum, end in running.items()}, means)
+        t = next_t
+
+    if telemetry is not None:
+        timestep_logs = telemetry.timestep_logs()
+        local_thompson_history = telemetry.thompson_history()
+
+    total_claim_cost = _finalize_orders(orders, num_timesteps, claim_callback)
 
     return timestep_logs, local_thompson_history, total_claim_cost
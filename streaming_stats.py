@@ -0,0 +1,151 @@
+from collections import deque
+import math
+
+
+class RunningStats:
+    """
+    값을 저장하지 않고 O(1)로 갱신되는 스트리밍 통계.
+      - count, mean, variance/std (Welford), min, max
+      - ewma_alpha를 지정하면 지수이동평균(EWMA)
+      - window를 지정하면 최근 window개 값의 이동평균 (window 크기만큼만 보관)
+    mean은 누적합 / count로 계산하므로 정수 값에 대해서는 sum(list) / len(list)와 같은 값을 반환합니다.
+    """
+
+    def __init__(self, ewma_alpha=None, window=None):
+        self.configure(ewma_alpha=ewma_alpha, window=window)
+
+    def configure(self, ewma_alpha=None, window=None):
+        """
+        EWMA / 이동평균 설정을 바꾸고 통계를 비웁니다. (다른 모듈이 참조하는 객체를 그대로 재설정할 때 사용)
+        """
+        if ewma_alpha is not None and not 0.0 < ewma_alpha <= 1.0:
+            raise ValueError("ewma_alpha must be in (0, 1]")
+        if window is not None and window < 1:
+            raise ValueError("window must be >= 1")
+        self.ewma_alpha = ewma_alpha
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self._ewma = None
+        self._window_values = deque(maxlen=self.window) if self.window else None
+        self._window_sum = 0.0
+
+    def push(self, x):
+        self.count += 1
+        self.total += x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+        if self.ewma_alpha is not None:
+            self._ewma = x if self._ewma is None else self._ewma + self.ewma_alpha * (x - self._ewma)
+
+        if self._window_values is not None:
+            if len(self._window_values) == self.window:
+                self._window_sum -= self._window_values[0]
+            self._window_values.append(x)
+            self._window_sum += x
+
+    def mean(self, default=None):
+        return self.total / self.count if self.count else default
+
+    def variance(self, default=None):
+        """
+        표본 분산 (count < 2이면 default)
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else default
+
+    def std(self, default=None):
+        var = self.variance()
+        return math.sqrt(var) if var is not None else default
+
+    def ewma(self, default=None):
+        return self._ewma if self._ewma is not None else default
+
+    def window_mean(self, default=None):
+        if not self._window_values:
+            return default
+        return self._window_sum / len(self._window_values)
+
+    def __len__(self):
+        return self.count
+
+    def get_state(self):
+        """
+        저장용 누적 상태 (count, total, mean, m2, min, max) — min/max가 없으면 nan
+        ewma / window 이동평균은 포함하지 않습니다.
+        """
+        return (self.count, self.total, self._mean, self._m2,
+                math.nan if self.min is None else self.min, math.nan if self.max is None else self.max)
+
+    def set_state(self, state):
+        """
+        get_state()로 저장한 누적 상태를 복원합니다.
+        """
+        count, total, mean, m2, min_value, max_value = state
+        self.reset()
+        self.count = int(count)
+        self.total = total
+        self._mean = mean
+        self._m2 = m2
+        self.min = None if math.isnan(min_value) else min_value
+        self.max = None if math.isnan(max_value) else max_value
+
+    def snapshot(self):
+        """
+        보고용 현재 통계값 dict
+        """
+        snap = {
+            "count": self.count,
+            "mean": self.mean(),
+            "std": self.std(),
+            "min": self.min,
+            "max": self.max,
+        }
+        if self.ewma_alpha is not None:
+            snap["ewma"] = self.ewma()
+        if self.window is not None:
+            snap["window_mean"] = self.window_mean()
+        return snap
+
+
+class KeyedCounter:
+    """
+    key(예: model_name)별 건수를 세는 카운터.
+    """
+
+    def __init__(self):
+        self._counts = {}
+
+    def increment(self, key, n=1):
+        self._counts[key] = self._counts.get(key, 0) + n
+
+    def get(self, key, default=0):
+        return self._counts.get(key, default)
+
+    def __getitem__(self, key):
+        return self._counts[key]
+
+    def __contains__(self, key):
+        return key in self._counts
+
+    def __len__(self):
+        return len(self._counts)
+
+    def items(self):
+        return self._counts.items()
+
+    def reset(self):
+        self._counts.clear()
+
+    def snapshot(self):
+        return dict(self._counts)
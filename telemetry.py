@@ -0,0 +1,180 @@
+from collections import deque
+
+import numpy as np
+
+from streaming_stats import RunningStats
+from thompson_sampling import ACTIONS
+
+REMOVED = -1
+
+
+class TelemetryRecorder:
+    """
+    simulate()의 timestep 로그 / Thompson mean 기록을 가볍게 보관하는 recorder.
+      - sample_interval: 이 간격(timestep)마다 한 번만 sample을 기록 (1이면 매 timestep)
+      - max_samples    : 최근 max_samples개 sample만 보관하는 ring buffer (None이면 전부 보관)
+    machine status는 sample마다 전체 dict를 복사하지 않고, 직전 sample 대비 바뀐 주문만
+    (order_no, 가공 종료 시점) 쌍으로 저장합니다. (종료 시점 = t + 남은 처리시간, 제거는 -1)
+    ring buffer에서 밀려난 sample의 변경분은 base 상태에 합쳐 두므로 남은 sample은 그대로 복원됩니다.
+    진행 중 대기 주문 수 / 가동 주문 수의 running mean은 sample 여부와 관계없이 매 timestep 갱신합니다.
+    """
+
+    def __init__(self, sample_interval=1, max_samples=None):
+        if sample_interval < 1:
+            raise ValueError("sample_interval must be >= 1")
+        if max_samples is not None and max_samples < 1:
+            raise ValueError("max_samples must be >= 1")
+        self.sample_interval = sample_interval
+        self.max_samples = max_samples
+        self.reset()
+
+    def reset(self):
+        # sample: (t, active order_no 배열, machine status 변경분 (k x 2) 배열, action별 mean 배열)
+        self._samples = deque()
+        self._base_status = {}
+        self._last_status = {}
+        self.active_stats = RunningStats()
+        self.running_stats = RunningStats()
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._samples)
+
+    def step(self, t, num_active, num_running):
+        """
+        매 timestep 호출: running mean을 갱신하고 이 timestep을 sample로 기록할지 반환합니다.
+        """
+        self.active_stats.push(num_active)
+        self.running_stats.push(num_running)
+        return t % self.sample_interval == 0
+
+    def record(self, t, active_orders, machine_status, means):
+        """
+        active_orders : 결정 대기 중인 order_no 목록
+        machine_status: order_no -> 남은 처리시간
+        means         : action -> Thompson mean (None 가능)
+        """
+        ends = {onum: t + remaining for onum, remaining in machine_status.items()}
+        last = self._last_status
+        delta = [(onum, end) for onum, end in ends.items() if last.get(onum) != end]
+        delta.extend((onum, REMOVED) for onum in last if onum not in ends)
+        self._last_status = ends
+
+        self._samples.append((
+            t,
+            np.asarray(active_orders, dtype=np.int32),
+            np.asarray(delta, dtype=np.int32).reshape(-1, 2),
+            np.array([np.nan if means[a] is None else means[a] for a in ACTIONS], dtype=np.float64),
+        ))
+        if self.max_samples is not None and len(self._samples) > self.max_samples:
+            self._apply_delta(self._base_status, self._samples.popleft()[2])
+            self.dropped += 1
+
+    @staticmethod
+    def _apply_delta(status, delta):
+        for onum, end in delta.tolist():
+            if end == REMOVED:
+                status.pop(onum, None)
+            else:
+                status[onum] = end
+
+    # ------------------------------------------------------------------
+    # 기존 형식으로 복원
+    # ------------------------------------------------------------------
+    def timestep_logs(self):
+        """
+        보관 중인 sample을 simulate()의 timestep_logs 형식(dict 리스트)으로 복원합니다.
+        """
+        status = dict(self._base_status)
+        logs = []
+        for t, active, delta, _ in self._samples:
+            self._apply_delta(status, delta)
+            logs.append({
+                "timestep": t,
+                "active_orders": active.tolist(),
+                "machine_status": {onum: end - t for onum, end in status.items()},
+            })
+        return logs
+
+    def thompson_history(self):
+        """
+        보관 중인 sample을 simulate()의 th_history 형식으로 복원합니다. (mean이 None인 시점은 mean만 생략)
+        """
+        history = {a: {"timesteps": [], "mean": []} for a in ACTIONS}
+        for t, _, _, means in self._samples:
+            for i, a in enumerate(ACTIONS):
+                history[a]["timesteps"].append(t)
+                if not np.isnan(means[i]):
+                    history[a]["mean"].append(float(means[i]))
+        return history
+
+    def summary(self):
+        return {
+            "samples": len(self._samples),
+            "dropped": self.dropped,
+            "mean_active_orders": self.active_stats.mean(),
+            "mean_running_orders": self.running_stats.mean(),
+            "max_active_orders": self.active_stats.max,
+        }
+
+    # ------------------------------------------------------------------
+    # binary dump / load
+    # ------------------------------------------------------------------
+    def dump(self, path):
+        """
+        보관 중인 sample을 압축된 npz 한 파일로 저장합니다.
+        가변 길이 배열(active order / machine status 변경분)은 flat 배열 + offset으로 저장합니다.
+        """
+        samples = list(self._samples)
+        active = [s[1] for s in samples]
+        deltas = [s[2] for s in samples]
+        base = np.array(sorted(self._base_status.items()), dtype=np.int32).reshape(-1, 2)
+        np.savez_compressed(
+            path,
+            sample_interval=self.sample_interval,
+            max_samples=-1 if self.max_samples is None else self.max_samples,
+            dropped=self.dropped,
+            timesteps=np.array([s[0] for s in samples], dtype=np.int32),
+            active_offsets=np.cumsum([0] + [a.size for a in active]).astype(np.int64),
+            active=np.concatenate(active) if active else np.zeros(0, dtype=np.int32),
+            delta_offsets=np.cumsum([0] + [d.shape[0] for d in deltas]).astype(np.int64),
+            delta=np.concatenate(deltas) if deltas else np.zeros((0, 2), dtype=np.int32),
+            means=np.array([s[3] for s in samples], dtype=np.float64).reshape(-1, len(ACTIONS)),
+            base_status=base,
+            actions=np.array(ACTIONS),
+            running_stats=np.array([self.active_stats.get_state(), self.running_stats.get_state()],
+                                   dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        dump()로 저장한 파일에서 recorder를 복원합니다. (대기/가동 주문 수 통계는 count / mean / max까지 복원)
+        """
+        with np.load(path) as data:
+            max_samples = int(data["max_samples"])
+            recorder = cls(sample_interval=int(data["sample_interval"]),
+                           max_samples=None if max_samples < 0 else max_samples)
+            recorder.dropped = int(data["dropped"])
+            recorder._base_status = {int(k): int(v) for k, v in data["base_status"]}
+            a_off, d_off = data["active_offsets"], data["delta_offsets"]
+            active, delta, means = data["active"], data["delta"], data["means"]
+            for i, t in enumerate(data["timesteps"].tolist()):
+                recorder._samples.append((t, active[a_off[i]:a_off[i + 1]], delta[d_off[i]:d_off[i + 1]],
+                                          means[i]))
+            if "running_stats" in data:
+                running_stats = data["running_stats"].tolist()
+            else:
+                # running_stats 이전 형식: mean만 저장되어 있으므로 count / min / max는 복원하지 않음
+                running_stats = [(0, 0.0, 0.0, 0.0, np.nan, np.nan) if mean != mean else
+                                 (1, mean, mean, 0.0, np.nan, np.nan) for mean in data["running_means"].tolist()]
+        status = dict(recorder._base_status)
+        for _, _, delta, _ in recorder._samples:
+            cls._apply_delta(status, delta)
+        recorder._last_status = status
+        for stats, state in zip([recorder.active_stats, recorder.running_stats], running_stats):
+            stats.set_state(state)
+            # 주문 수는 정수이므로 min / max도 정수로 복원
+            if stats.max is not None:
+                stats.min, stats.max = int(stats.min), int(stats.max)
+        return recorder
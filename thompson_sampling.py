@@ -1,7 +1,12 @@
 import numpy as np
 import random
+from scipy.linalg import solve_triangular
 from sklearn.tree import DecisionTreeRegressor
 
+from config import NUM_TIMESTEPS
+
+from replay_buffer import ReplayBuffer
+
 ACTIONS = ["Accept", "Reject", "Postpone", "Outsource"]
 
 # 기존 Thompson Sampling 파라미터 (컨텍스트 밴딧용)
@@ -19,6 +24,16 @@ def thompson_sampling_select_action():
         samples[a] = s
     return max(samples, key=samples.get)
 
+def thompson_sampling_select_actions(n):
+    """
+    n개 주문에 대한 액션을 한 번에 선택합니다.
+    (n x 액션 수) 정규분포 샘플 행렬을 한 번에 뽑아 행마다 최댓값 액션을 고릅니다.
+    """
+    mu = np.array([action_params[a]["mean"] for a in ACTIONS])
+    sd = np.sqrt([action_params[a]["var"] for a in ACTIONS])
+    samples = np.random.normal(mu, sd, size=(n, len(ACTIONS)))
+    return [ACTIONS[i] for i in np.argmax(samples, axis=1)]
+
 def update_thompson_params(action, reward):
     c = action_params[action]["count"]
     old_mean = action_params[action]["mean"]
@@ -29,18 +44,38 @@ def update_thompson_params(action, reward):
     action_params[action]["var"] = max(1e-9, new_var)
     action_params[action]["count"] = c + 1
 
-# tree_data: 각 액션별로 context와 reward 쌍을 저장하는 딕셔너리.
+# tree_data: 각 액션별로 context와 reward 쌍을 저장하는 ReplayBuffer 딕셔너리.
 # 초기에는 fabricated prior 데이터를 추가합니다.
 # Fabricated prior: 임의의 context (예, 모든 feature가 0인 벡터)와 함께 1 성공, 1 실패를 추가.
 # 이때 context 차원은 실제 사용 context와 동일하게 설정해야 합니다. (예제에서는 8차원으로 가정)
 INITIAL_CONTEXT = [0.0] * 8  # 필요에 따라 context 차원을 조정하세요.
 
-tree_data = {a: {"X": [], "y": []} for a in ACTIONS}
+# tree_data 저장 설정 (configure_tree_data로 변경)
+TREE_DATA_OPTIONS = {"max_size": None, "eviction": "window", "mmap_dir": None}
+
+
+def _add_fabricated_prior(buffer):
+    buffer.append(INITIAL_CONTEXT, 1.0)  # fabricated success
+    buffer.append(INITIAL_CONTEXT, 0.0)  # fabricated failure
+
+
+tree_data = {a: ReplayBuffer(len(INITIAL_CONTEXT), **TREE_DATA_OPTIONS) for a in ACTIONS}
 for a in ACTIONS:
-    tree_data[a]["X"].append(INITIAL_CONTEXT)
-    tree_data[a]["y"].append(1.0)  # fabricated success
-    tree_data[a]["X"].append(INITIAL_CONTEXT)
-    tree_data[a]["y"].append(0.0)  # fabricated failure
+    _add_fabricated_prior(tree_data[a])
+
+
+def configure_tree_data(max_size=None, eviction="window", mmap_dir=None):
+    """
+    tree_data의 최대 크기, eviction 방식(window / reservoir), memory-mapped 저장 위치를 설정하고
+    fabricated prior만 남긴 상태로 초기화합니다.
+    다른 모듈이 tree_data를 이름으로 import해 참조하므로 딕셔너리는 제자리에서 갱신합니다.
+    """
+    TREE_DATA_OPTIONS.update({"max_size": max_size, "eviction": eviction, "mmap_dir": mmap_dir})
+    for a in ACTIONS:
+        tree_data[a].close()
+        tree_data[a] = ReplayBuffer(len(INITIAL_CONTEXT), **TREE_DATA_OPTIONS)
+        _add_fabricated_prior(tree_data[a])
+    online_tree_bootstrap.configure(**TREE_DATA_OPTIONS)
 
 
 def treebootstrap_select_action(context):
@@ -52,24 +87,31 @@ def treebootstrap_select_action(context):
     이 방식은 논문에서 제시한 TreeBootstrap 알고리즘의 기본 아이디어를 반영하며,
     fabricated prior를 추가하여 초반 관측 부족으로 인한 액션 조기 배제를 완화합니다.
     """
-    predicted_rewards = {}
-    for a in ACTIONS:
+    return treebootstrap_select_actions([context])[0]
+
+
+def treebootstrap_select_actions(contexts):
+    """
+    treebootstrap_select_action의 batch 버전.
+    contexts: 같은 timestep에 결정이 필요한 주문들의 context 행렬 (n x dim)
+    액션마다 부트스트랩 샘플링과 트리 학습은 한 번만 수행하고, context 행렬 전체를 한 번에 예측합니다.
+    return: 주문별 선택 액션 리스트
+    """
+    contexts = np.asarray(contexts, dtype=np.float64)
+    predicted_rewards = np.full((len(contexts), len(ACTIONS)), 0.5)
+    for j, a in enumerate(ACTIONS):
         data = tree_data[a]
-        n = len(data["X"])
+        n = len(data)
         # 데이터가 극히 부족하면 기본값 0.5를 사용
         if n < 5:
-            predicted_rewards[a] = 0.5
-        else:
-            # n개의 관측치에서 복원 추출
-            indices = [np.random.randint(0, n) for _ in range(n)]
-            X_sample = [data["X"][i] for i in indices]
-            y_sample = [data["y"][i] for i in indices]
-            model = DecisionTreeRegressor(random_state=42)
-            model.fit(X_sample, y_sample)
-            pred = model.predict([context])[0]
-            predicted_rewards[a] = pred
+            continue
+        # n개의 관측치에서 복원 추출
+        indices = np.random.randint(0, n, size=n)
+        model = DecisionTreeRegressor(random_state=42)
+        model.fit(data.X[indices], data.y[indices])
+        predicted_rewards[:, j] = model.predict(contexts)
     # 예측 보상이 가장 높은 액션 선택
-    return max(predicted_rewards, key=predicted_rewards.get)
+    return [ACTIONS[i] for i in np.argmax(predicted_rewards, axis=1)]
 
 
 def update_treebootstrap_params(action, context, reward):
@@ -78,5 +120,285 @@ def update_treebootstrap_params(action, context, reward):
     이렇게 축적된 데이터는 이후 부트스트랩 샘플 생성에 사용되어,
     액션 선택 시 점진적으로 더 정확한 예측을 할 수 있게 합니다.
     """
-    tree_data[action]["X"].append(context)
-    tree_data[action]["y"].append(reward)
\ No newline at end of file
+    tree_data[action].append(context, reward)
+
+
+class OnlineTreeBootstrap:
+    """
+    매 의사결정마다 전체 history로 트리를 다시 학습하지 않는 TreeBootstrap 변형.
+      - 액션별로 고정 크기(n_estimators)의 트리 앙상블을 유지하고, 관측치마다 멤버별 Poisson(1) 가중치를
+        부여하는 online bootstrap으로 각 멤버의 학습 데이터를 구성합니다.
+      - 트리 재학습은 refit_every개 관측마다 한 번만 수행합니다.
+      - 재학습에 쓰는 관측치는 액션별로 최대 fit_size개만 보관합니다. (history 크기 제한이 없어도 eviction 방식
+        window면 최근 fit_size개, reservoir면 균등 표본) 그래서 재학습 1회 비용이 상수이고,
+        관측치 1개당 평균 비용도 history 길이와 무관합니다.
+      - leaf_updates=True이면 재학습 사이의 관측치를 각 멤버 트리의 leaf 통계(가중합/가중치)에 바로 반영합니다.
+    액션 선택 시 액션마다 앙상블 멤버 하나를 무작위로 골라(부트스트랩 posterior 샘플) 예측하므로
+    Thompson-style 탐색은 유지되고, 선택 비용은 history 크기와 무관하게 O(액션 수 x 트리 깊이)입니다.
+    """
+
+    def __init__(self, n_estimators=10, refit_every=32, leaf_updates=True, max_depth=8, min_samples=5,
+                 max_size=None, eviction="window", mmap_dir=None, fit_size=2048):
+        self.n_estimators = n_estimators
+        self.fit_size = fit_size
+        self.refit_every = refit_every
+        self.leaf_updates = leaf_updates
+        self.max_depth = max_depth
+        self.min_samples = min_samples
+        self.data = {}
+        self.configure(max_size=max_size, eviction=eviction, mmap_dir=mmap_dir)
+
+    def configure(self, max_size=None, eviction="window", mmap_dir=None):
+        """
+        관측치 저장소(ReplayBuffer) 설정을 바꾸고 초기화합니다. (max_size는 fit_size 이하로 제한)
+        """
+        max_size = self.fit_size if max_size is None else min(max_size, self.fit_size)
+        self.buffer_options = {"max_size": max_size, "eviction": eviction, "mmap_dir": mmap_dir}
+        self.reset()
+
+    def reset(self):
+        for buffer in self.data.values():
+            buffer.close()
+        self.data = {a: ReplayBuffer(len(INITIAL_CONTEXT), weight_dim=self.n_estimators, **self.buffer_options)
+                     for a in ACTIONS}
+        self.models = {a: [] for a in ACTIONS}
+        self.pending_updates = {a: 2 for a in ACTIONS}
+        for a in ACTIONS:
+            # TreeBootstrap과 동일한 fabricated prior (1 성공, 1 실패)
+            # 모든 멤버에 가중치 1로 넣어 seed 설정 전(import / reset 시점)에 난수를 쓰지 않도록 함
+            self.data[a].append(INITIAL_CONTEXT, 1.0, np.ones(self.n_estimators))
+            self.data[a].append(INITIAL_CONTEXT, 0.0, np.ones(self.n_estimators))
+
+    def _fit(self, action):
+        data = self.data[action]
+        X, y, W = data.X, data.y, data.w
+        members = []
+        for b in range(self.n_estimators):
+            used = W[:, b] > 0
+            if not used.any():
+                used = np.ones(len(y), dtype=bool)
+                weights = np.ones(len(y))
+            else:
+                weights = W[used, b]
+            model = DecisionTreeRegressor(max_depth=self.max_depth, random_state=42)
+            model.fit(X[used], y[used], sample_weight=weights)
+            tree = model.tree_
+            leaf_weight = tree.weighted_n_node_samples.astype(np.float64)
+            leaf_sum = tree.value[:, 0, 0] * leaf_weight
+            members.append((tree, leaf_sum, leaf_weight))
+        self.models[action] = members
+        self.pending_updates[action] = 0
+
+    @staticmethod
+    def _leaf(tree, context):
+        return tree.apply(np.asarray([context], dtype=np.float32))[0]
+
+    def predict(self, action, context):
+        members = self.models[action]
+        if not members:
+            return 0.5
+        tree, leaf_sum, leaf_weight = members[np.random.randint(0, len(members))]
+        leaf = self._leaf(tree, context)
+        return leaf_sum[leaf] / leaf_weight[leaf]
+
+    def select_action(self, context):
+        predicted_rewards = {a: self.predict(a, context) for a in ACTIONS}
+        return max(predicted_rewards, key=predicted_rewards.get)
+
+    def predict_many(self, action, contexts):
+        """
+        앙상블 멤버 하나를 샘플링해 context 행렬 전체의 예측값을 한 번에 계산합니다.
+        """
+        members = self.models[action]
+        if not members:
+            return np.full(len(contexts), 0.5)
+        tree, leaf_sum, leaf_weight = members[np.random.randint(0, len(members))]
+        leaves = tree.apply(np.asarray(contexts, dtype=np.float32))
+        return leaf_sum[leaves] / leaf_weight[leaves]
+
+    def select_actions(self, contexts):
+        predicted_rewards = np.column_stack([self.predict_many(a, contexts) for a in ACTIONS])
+        return [ACTIONS[i] for i in np.argmax(predicted_rewards, axis=1)]
+
+    def update(self, action, context, reward):
+        weights = np.random.poisson(1.0, self.n_estimators)
+        data = self.data[action]
+        data.append(context, reward, weights)
+
+        members = self.models[action]
+        if members and self.leaf_updates:
+            for b in np.flatnonzero(weights):
+                tree, leaf_sum, leaf_weight = members[b]
+                leaf = self._leaf(tree, context)
+                leaf_sum[leaf] += weights[b] * reward
+                leaf_weight[leaf] += weights[b]
+
+        self.pending_updates[action] += 1
+        n = len(data)
+        if n >= self.min_samples and (not members or self.pending_updates[action] >= self.refit_every):
+            self._fit(action)
+
+    def mean(self, action):
+        """
+        보관 중인 (최대 fit_size개) 관측치의 평균 reward
+        """
+        return self.data[action].mean()
+
+
+online_tree_bootstrap = OnlineTreeBootstrap()
+
+
+def online_treebootstrap_select_action(context):
+    """
+    OnlineTreeBootstrap 기반 액션 선택 (treebootstrap_select_action의 incremental 버전)
+    """
+    return online_tree_bootstrap.select_action(context)
+
+
+def online_treebootstrap_select_actions(contexts):
+    """
+    online_treebootstrap_select_action의 batch 버전
+    """
+    return online_tree_bootstrap.select_actions(contexts)
+
+
+def update_online_treebootstrap_params(action, context, reward):
+    online_tree_bootstrap.update(action, context, reward)
+
+
+# context feature별 스케일 (simulation._order_context 순서)
+# [t, available_ratio, order_date, decision_due_date, processing_time, due_date, revenue, risk]
+CONTEXT_SCALE = [NUM_TIMESTEPS, 1.0, NUM_TIMESTEPS, NUM_TIMESTEPS, 15.0, NUM_TIMESTEPS, 300.0, 100.0]
+
+
+class LinearThompsonSampling:
+    """
+    context를 사용하는 Bayesian linear Thompson Sampling.
+    액션 a마다 reward ~ N(x^T theta_a, sigma_a^2), theta_a ~ N(mu_a, sigma_a^2 B_a^-1) 모델을 유지합니다.
+      - x: CONTEXT_SCALE로 나눈 context + bias 항
+      - B_a = prior_precision * I + sum x x^T
+      - B_a^-1 은 Sherman-Morrison, B_a의 Cholesky factor L_a는 rank-one cholupdate로 갱신 (관측당 O(d^2))
+      - 샘플링은 theta = mu + sigma * L^-T z (삼각 solve, O(d^2))
+      - sigma_a^2 은 예측 잔차의 running 분산으로 추정
+    트리 학습이 없으므로 treebootstrap보다 훨씬 가볍게 context 기반 결정을 할 수 있습니다.
+    """
+
+    def __init__(self, scale=None, prior_precision=1.0, initial_noise_var=1.0):
+        self.scale = np.asarray(CONTEXT_SCALE if scale is None else scale, dtype=np.float64)
+        self.dim = len(self.scale) + 1
+        self.prior_precision = prior_precision
+        self.initial_noise_var = initial_noise_var
+        self.reset()
+
+    def reset(self):
+        d = self.dim
+        self.params = {}
+        for a in ACTIONS:
+            self.params[a] = {
+                "B_inv": np.eye(d) / self.prior_precision,
+                "L": np.eye(d) * np.sqrt(self.prior_precision),
+                "f": np.zeros(d),
+                "mu": np.zeros(d),
+                "count": 0,
+                "reward_mean": 0.0,
+                "resid_mean": 0.0,
+                "resid_m2": 0.0,
+            }
+
+    def _features(self, context):
+        x = np.empty(self.dim)
+        x[:-1] = np.asarray(context, dtype=np.float64) / self.scale
+        x[-1] = 1.0
+        return x
+
+    def _noise_std(self, p):
+        if p["count"] < 2:
+            return np.sqrt(self.initial_noise_var)
+        return np.sqrt(max(1e-9, p["resid_m2"] / (p["count"] - 1)))
+
+    def _sample_theta(self, action):
+        p = self.params[action]
+        z = np.random.standard_normal(self.dim)
+        # B = L L^T 이므로 L^-T z ~ N(0, B^-1)
+        return p["mu"] + self._noise_std(p) * solve_triangular(p["L"], z, lower=True, trans="T")
+
+    def select_action(self, context):
+        x = self._features(context)
+        samples = {a: x @ self._sample_theta(a) for a in ACTIONS}
+        return max(samples, key=samples.get)
+
+    def select_actions(self, contexts):
+        """
+        select_action의 batch 버전: 액션마다 theta를 한 번 샘플링하고 context 행렬 전체를 한 번에 계산합니다.
+        """
+        X = np.column_stack([np.asarray(contexts, dtype=np.float64) / self.scale, np.ones(len(contexts))])
+        thetas = np.column_stack([self._sample_theta(a) for a in ACTIONS])
+        return [ACTIONS[i] for i in np.argmax(X @ thetas, axis=1)]
+
+    @staticmethod
+    def _cholupdate(L, x):
+        """
+        L L^T + x x^T 의 Cholesky factor로 L을 제자리에서 갱신합니다. (rank-one update, O(d^2))
+        """
+        x = x.copy()
+        for k in range(len(x)):
+            r = np.hypot(L[k, k], x[k])
+            c = r / L[k, k]
+            s = x[k] / L[k, k]
+            L[k, k] = r
+            if k + 1 < len(x):
+                L[k + 1:, k] = (L[k + 1:, k] + s * x[k + 1:]) / c
+                x[k + 1:] = c * x[k + 1:] - s * L[k + 1:, k]
+
+    def update(self, action, context, reward):
+        p = self.params[action]
+        x = self._features(context)
+
+        # 잔차 분산 (Welford)
+        resid = reward - x @ p["mu"]
+        p["count"] += 1
+        delta = resid - p["resid_mean"]
+        p["resid_mean"] += delta / p["count"]
+        p["resid_m2"] += delta * (resid - p["resid_mean"])
+        p["reward_mean"] += (reward - p["reward_mean"]) / p["count"]
+
+        # Sherman-Morrison: (B + x x^T)^-1 = B^-1 - (B^-1 x)(B^-1 x)^T / (1 + x^T B^-1 x)
+        Bx = p["B_inv"] @ x
+        p["B_inv"] -= np.outer(Bx, Bx) / (1.0 + x @ Bx)
+        self._cholupdate(p["L"], x)
+        p["f"] += reward * x
+        p["mu"] = p["B_inv"] @ p["f"]
+
+    def mean(self, action):
+        return self.params[action]["reward_mean"]
+
+
+linear_thompson = LinearThompsonSampling()
+
+
+def lints_select_action(context):
+    """
+    LinearThompsonSampling 기반 액션 선택 (context 사용)
+    """
+    return linear_thompson.select_action(context)
+
+
+def lints_select_actions(contexts):
+    return linear_thompson.select_actions(contexts)
+
+
+def update_lints_params(action, context, reward):
+    linear_thompson.update(action, context, reward)
+
+
+def reset_thompson_state():
+    """
+    action_params와 tree_data를 초기 상태(fabricated prior 포함)로 되돌립니다.
+    다른 모듈이 이름으로 import해 참조하고 있으므로 객체를 새로 만들지 않고 제자리에서 갱신합니다.
+    """
+    for a in ACTIONS:
+        action_params[a].update({"mean": 0.0, "var": 1000.0, "count": 1})
+        tree_data[a].clear()
+        _add_fabricated_prior(tree_data[a])
+    online_tree_bootstrap.reset()
+    linear_thompson.reset()